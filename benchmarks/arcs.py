@@ -0,0 +1,78 @@
+"""
+Benchmark of batched arc-like PathElements.
+
+Runs the same stage of bullets orbiting on circles, roses and ellipses
+headless, once per bullet and once in ECS mode, where the elements are
+advanced together by their batches (see dml.components.paths.batch), and
+prints the average simulation time per frame of each.
+
+Run with ``python benchmarks/arcs.py``.
+"""
+import random
+import time
+import sys
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import dml
+from dml.components import *
+
+WIDTH, HEIGHT = 600, 800
+FRAMES = 60
+COUNTS = (1000, 2500, 5000, 10000)
+
+
+class Orbiter(dml.Bullet):
+
+	def initialize(self, **config):
+		path = Path()
+		self.addComponent(path)
+		kind = random.randrange(3)
+		if kind == 0:
+			element = ArcPathElement(radius=random.uniform(20, 80), speed=random.uniform(1, 3))
+		elif kind == 1:
+			element = RosePathElement(radius=random.uniform(20, 80), petals=random.choice((3, 4, 5)),
+				speed=random.uniform(1, 3))
+		else:
+			element = EllipsePathElement(hradius=random.uniform(20, 80), vradius=random.uniform(20, 80),
+				speed=random.uniform(1, 3))
+		path.addPathElement(element)
+
+	def update(self):
+		self.move()
+
+
+def frameTime(system, count, mode):
+	"""Return the average simulation time per frame of a stage of count bullets."""
+	for name in list(system._bullets):
+		system.deleteBullet(name)
+	system.setExecutionMode(mode)
+	random.seed(count)
+	for i in range(count):
+		Orbiter((random.uniform(0, WIDTH), random.uniform(0, HEIGHT)))
+
+	# The first frame starts every element, which is not batched.
+	system._stepFrame()
+	start = time.perf_counter()
+	for i in range(FRAMES):
+		system._stepFrame()
+	return (time.perf_counter() - start)/FRAMES
+
+
+def main():
+	system = dml.globalSystem
+	system.setFPS(60)
+	system.setDimensions((WIDTH, HEIGHT))
+	system.setRenderBackend(dml.NullBackend())
+
+	print("%8s %18s %12s" % ("bullets", "per bullet (ms)", "batched (ms)"))
+	for count in COUNTS:
+		serial = frameTime(system, count, system.ExecutionMode.PER_BULLET)
+		batched = frameTime(system, count, system.ExecutionMode.ECS)
+		print("%8d %18.3f %12.3f" % (count, serial*1000, batched*1000))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,69 @@
+"""
+Benchmark of playing back a baked stage against simulating it live.
+
+Bakes a pattern of straight and arcing rings, which simulates it live
+while writing its draw commands, and then plays the baked stage back.
+Prints the time per frame of each, and the size of the baked file.
+
+Run with ``python benchmarks/baking.py [MODE]``, where MODE is the
+ExecutionMode to simulate the stage in (defaults to PER_BULLET).
+"""
+import tempfile
+import time
+import sys
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pygame
+
+import dml
+from dml.baking import bakeStage, BakedStage, BakedStagePlayer
+
+FRAMES = 600
+
+PATTERN = """
+bullet red colour=(255, 0, 0) radius=4 speed=2
+bullet orbit colour=(0, 128, 255) radius=3 glow=2 path=arc path.radius=80 path.speed=1.5
+
+emitter boss at (300, 200)
+	from 0 every 0.1 times 80 ring 24 red turn=5
+	from 0 every 0.2 times 40 ring 12 orbit turn=-7
+"""
+
+
+def main():
+	mode = sys.argv[1] if len(sys.argv) > 1 else "PER_BULLET"
+	system = dml.globalSystem
+	system.setFPS(60)
+	system.setDimensions((600, 800))
+	system.setExecutionMode(system.ExecutionMode[mode])
+	system.setRenderBackend(dml.NullBackend())
+
+	path = os.path.join(tempfile.mkdtemp(), "stage.bake")
+	dml.language.compilePattern(PATTERN).start()
+	start = time.perf_counter()
+	bakeStage(path, FRAMES)
+	live = (time.perf_counter() - start)/FRAMES
+
+	for name in list(system._bullets):
+		system.deleteBullet(name)
+	system.screen = pygame.Surface(system.getDimensions())
+	stage = BakedStage(path)
+	commands = sum(len(stage.frame(i)) for i in range(len(stage)))
+	BakedStagePlayer((0, 0), stage=stage)
+	start = time.perf_counter()
+	for i in range(FRAMES):
+		system._stepFrame()
+	baked = (time.perf_counter() - start)/FRAMES
+
+	print("%d frames, %.0f circles per frame, %d bytes baked" % (
+		FRAMES, commands/FRAMES, os.path.getsize(path)))
+	print("live and baking: %8.3f ms per frame" % (1000*live))
+	print("baked playback:  %8.3f ms per frame" % (1000*baked))
+	os.remove(path)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,108 @@
+"""
+Benchmark of keyframe behaviours against scripted ``update`` methods.
+
+Simulates the bullets of test1.py, which slow down, stop and then speed
+up again in a new direction, written once as an ``update`` method checking
+the time every frame and once as a Behaviour, and prints the time per
+frame of each in both execution modes.
+
+Run with ``python benchmarks/behaviour.py``.
+"""
+import subprocess
+import random
+import time
+import math
+import sys
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pygame
+
+import dml
+from dml.components import *
+
+FRAMES = 300
+
+
+class Shot(dml.Bullet):
+
+	def initialize(self, **config):
+		self.addComponent(Circle(radius=5, colour=(0x00, 0x00, 0x84)))
+		self.addComponent(DieIfOffscreen(leeway=10))
+		self.accelerator = LinearAccelerator(initialSpeed=8, direction=config["direction"])
+		self.addComponent(self.accelerator)
+
+
+class ScriptedShot(Shot):
+
+	def initialize(self, **config):
+		super().initialize(**config)
+		self.final_speed = (random.random() + 1)*4
+
+	def update(self):
+		self.render()
+		self.move()
+
+		if self.At(0.25):
+			self.accelerator.transitionToSpeed(0, 0.5)
+
+		if self.At(1.5):
+			self.accelerator.transitionToSpeed(self.final_speed, 0.5)
+			self.accelerator.rotate(random.random()*0.3)
+
+
+class KeyframedShot(Shot):
+
+	BEHAVIOUR = (dml.Behaviour()
+		.at(0.25).transitionToSpeed(0, 0.5)
+		.at(1.5).transitionToSpeed(dml.maths.Uniform(4, 8), 0.5).rotate(dml.maths.Uniform(0, 0.3)))
+
+
+class Generator(dml.Bullet):
+
+	def initialize(self, **config):
+		self.shooter = LinearShooter(direction=config["direction"], bulletType=config["bulletType"])
+		self.addComponent(self.shooter)
+
+	def update(self):
+		self.shooter.fireVolley([self.shooter.direction]*3)
+		self.shooter.rotate(0.1*math.sin(self.local_time/2))
+
+
+def run(mode, bulletType):
+	"""Return the time per frame of simulating the given bullets."""
+	random.seed(0)
+	system = dml.globalSystem
+	system.setFPS(30)
+	system.setDimensions((600, 800))
+	system.setExecutionMode(system.ExecutionMode[mode])
+	system.setRenderBackend(dml.NullBackend())
+	system.screen = pygame.Surface(system.getDimensions())
+
+	for direction in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+		Generator((300, 400), direction=direction, bulletType=bulletType)
+	start = time.perf_counter()
+	for i in range(FRAMES):
+		system._stepFrame()
+	return (time.perf_counter() - start)/FRAMES, len(system._bullets)
+
+
+def main():
+	if len(sys.argv) > 2:
+		# The system is a singleton, so each run has a process to itself.
+		bulletType = {"scripted" : ScriptedShot, "keyframed" : KeyframedShot}[sys.argv[2]]
+		print("%f %d" % run(sys.argv[1], bulletType))
+		return
+
+	print("%12s %10s %14s %8s" % ("mode", "bullets", "script", "ms/frame"))
+	for mode in ("PER_BULLET", "ECS"):
+		for script in ("scripted", "keyframed"):
+			output = subprocess.check_output([sys.executable, __file__, mode, script], text=True)
+			seconds, bullets = output.split()[-2:]
+			print("%12s %10s %14s %8.3f" % (mode, bullets, script, 1000*float(seconds)))
+
+
+if __name__ == "__main__":
+	main()
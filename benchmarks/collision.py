@@ -0,0 +1,104 @@
+"""
+Benchmark of the collision pass.
+
+Spawns a growing number of enemy bullets with circle colliders and tests
+them against the player's shots through the spatial hash, printing the
+time the collision pass takes per frame. The pass stays roughly linear
+in the number of bullets, where a brute-force test of every pair grows
+with the product of both layers.
+
+Run with ``python benchmarks/collision.py``.
+"""
+import random
+import math
+import time
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy
+
+import dml
+from dml.maths import Vector2D
+from dml.components import *
+
+WIDTH, HEIGHT = 600, 800
+SHOTS = 200
+FRAMES = 30
+COUNTS = (1000, 2500, 5000, 10000, 20000, 40000)
+
+
+class Mover(dml.Bullet):
+
+	def initialize(self, **config):
+		self.addComponent(CircleCollider(layer=config["layer"], radius=config["radius"]))
+		self.addComponent(LinearAccelerator(
+			initialSpeed=random.uniform(1, 3),
+			direction=Vector2D.fromAngle(random.uniform(0, 2*math.pi))))
+
+	def update(self):
+		self.move()
+
+
+def spawn(count, layer, radius):
+	for i in range(count):
+		Mover((random.uniform(0, WIDTH), random.uniform(0, HEIGHT)), layer=layer, radius=radius)
+
+
+def gather(colliders):
+	"""Gather the positions of the given colliders' bullets into an array."""
+	positions = [collider.bullet.position for collider in colliders]
+	points = numpy.empty((len(positions), 2))
+	points[:, 0] = numpy.fromiter([position.x for position in positions], float, len(positions))
+	points[:, 1] = numpy.fromiter([position.y for position in positions], float, len(positions))
+	return points
+
+
+def bruteForce(shots, bullets):
+	"""Test every pair of shot and bullet."""
+	offsets = gather(shots)[:, None, :] - gather(bullets)[None, :, :]
+	return numpy.count_nonzero((offsets**2).sum(axis=2) <= (4 + 3)**2)
+
+
+def main():
+	system = dml.globalSystem
+	system.setFPS(60)
+	system.setDimensions((WIDTH, HEIGHT))
+
+	hits = [0]
+	system.addCollisionCheck("shot", "enemy", lambda a, b : hits.__setitem__(0, hits[0] + 1))
+
+	print("%8s %14s %14s %12s" % ("bullets", "grid (ms)", "brute (ms)", "hits/frame"))
+	for count in COUNTS:
+		for name in list(system._bullets):
+			system.deleteBullet(name)
+		random.seed(count)
+		spawn(SHOTS, "shot", 4)
+		spawn(count, "enemy", 3)
+
+		colliders = system.getComponents(Collider)
+		shots = [collider for collider in colliders if collider.layer == "shot"]
+		bullets = [collider for collider in colliders if collider.layer == "enemy"]
+
+		hits[0] = 0
+		grid_time = brute_time = 0
+		for frame in range(FRAMES):
+			# Stepping the frame runs the collision pass once, and it is then run
+			# again on its own to time it.
+			system._stepFrame()
+
+			start = time.perf_counter()
+			system._runCollisions()
+			grid_time += time.perf_counter() - start
+
+			start = time.perf_counter()
+			bruteForce(shots, bullets)
+			brute_time += time.perf_counter() - start
+
+		print("%8d %14.3f %14.3f %12.1f" % (
+			count, grid_time/FRAMES*1000, brute_time/FRAMES*1000, hits[0]/(2*FRAMES)))
+
+
+if __name__ == "__main__":
+	main()
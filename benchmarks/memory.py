@@ -0,0 +1,64 @@
+"""
+Benchmark of the memory used by live bullets.
+
+Creates a batch of bullets of each class in dml.extras.bullets, both
+directly and stamped from a Prefab, and prints the number of bytes
+allocated per live bullet as measured by tracemalloc. This includes the
+bullet, its components and vectors, and its entries in the system.
+
+Run with ``python benchmarks/memory.py``.
+"""
+import tracemalloc
+import gc
+import sys
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import dml
+from dml.extras.bullets import *
+
+COUNT = 2000
+
+CONFIGURATIONS = (
+	(CircleShot, dict(radius=4, colour=(255, 0, 0))),
+	(DirectionalShot, dict(direction=(0, 1))),
+	(DirectionalCircleShot, dict(radius=4, colour=(255, 0, 0), direction=(0, 1))),
+	(VelocityShot, dict(direction=(0, 1), speed=2)),
+	(GatlingShot, dict(radius=4, colour=(255, 0, 0), direction=(0, 1), speed=2)),
+	(Gatling, dict(bulletType=CircleShot, direction=(0, 1), minAngle=-1, maxAngle=1)),
+	(AimedGatling, dict(bulletType=CircleShot, direction=(0, 1), minAngle=-1, maxAngle=1)),
+)
+
+
+def bytesPerBullet(system, create):
+	"""Return the bytes allocated per live bullet created by create()."""
+	for name in list(system._bullets):
+		system.deleteBullet(name)
+	gc.collect()
+
+	tracemalloc.start()
+	start = tracemalloc.get_traced_memory()[0]
+	bullets = [create() for i in range(COUNT)]
+	gc.collect()
+	size = tracemalloc.get_traced_memory()[0] - start
+	tracemalloc.stop()
+	return size/len(bullets)
+
+
+def main():
+	system = dml.globalSystem
+	system.setFPS(60)
+	system.setDimensions((600, 800))
+
+	print("%22s %12s %12s" % ("class", "direct (B)", "prefab (B)"))
+	for bulletType, config in CONFIGURATIONS:
+		direct = bytesPerBullet(system, lambda : bulletType((0, 0), **config))
+		prefab = dml.Prefab(bulletType, **config)
+		stamped = bytesPerBullet(system, lambda : prefab((0, 0)))
+		print("%22s %12.0f %12.0f" % (bulletType.__name__, direct, stamped))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,76 @@
+"""
+Benchmark of pipelined simulation and rendering.
+
+Runs the same stage of moving glowing bullets headless, first serially and
+then pipelined (simulating each frame on a worker thread while the main
+thread draws the previous one), and prints the average frame time of each
+for both the immediate and the batched render backends.
+
+The pipelined frame time approaches the larger of the simulation and
+drawing times rather than their sum, to the extent that both release the
+GIL, so the gain depends on the Python build and the pygame version.
+
+Run with ``python benchmarks/pipeline.py``.
+"""
+import random
+import math
+import time
+import sys
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import dml
+from dml.maths import Vector2D
+from dml.components import *
+
+WIDTH, HEIGHT = 600, 800
+FRAMES = 60
+COUNTS = (1000, 2500, 5000, 10000)
+
+
+class Glow(dml.Bullet):
+
+	def initialize(self, **config):
+		self.addComponent(GlowingCircle(radius=4, colour=(255, 0, 0), glowRadius=3))
+		self.addComponent(LinearAccelerator(
+			initialSpeed=random.uniform(0.5, 2),
+			direction=Vector2D.fromAngle(random.uniform(0, 2*math.pi))))
+
+	def update(self):
+		self.move()
+		self.render()
+
+
+def frameTime(system, count, pipelined):
+	"""Return the average time per frame of a stage of count bullets."""
+	for name in list(system._bullets):
+		system.deleteBullet(name)
+	random.seed(count)
+	for i in range(count):
+		Glow((random.uniform(0, WIDTH), random.uniform(0, HEIGHT)))
+
+	system.setPipelining(pipelined)
+	start = time.perf_counter()
+	system.runOffline(FRAMES)
+	return (time.perf_counter() - start)/FRAMES
+
+
+def main():
+	system = dml.globalSystem
+	system.setFPS(60)
+	system.setDimensions((WIDTH, HEIGHT))
+	system.setExecutionMode(system.ExecutionMode.ECS)
+
+	print("%8s %10s %14s %16s" % ("bullets", "backend", "serial (ms)", "pipelined (ms)"))
+	for count in COUNTS:
+		for name, backend in (("immediate", dml.ImmediateBackend()), ("batched", dml.BatchedBackend())):
+			system.setRenderBackend(backend)
+			serial = frameTime(system, count, False)
+			pipelined = frameTime(system, count, True)
+			print("%8d %10s %14.3f %16.3f" % (count, name, serial*1000, pipelined*1000))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,59 @@
+"""
+Benchmark of interpolation tables of special functions.
+
+Tabulates Airy and Bessel functions over fixed domains, checks that every
+table agrees with the exact function at random points of its domain, and
+prints the time per evaluation of a batch with the exact function and
+with the table.
+
+Run with ``python benchmarks/special.py``.
+"""
+import time
+import sys
+import os
+
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from dml.maths.functions import *
+
+COUNT = 100000
+REPEATS = 20
+TOLERANCE = 1e-5
+
+FUNCTIONS = (
+	("airyAi", airyAi, -10, 2),
+	("airyBi", airyBi, -10, 2),
+	("besselJ(0)", lambda t : besselJ(0, t), 0, 20),
+	("besselI(1)", lambda t : besselI(1, t), 0, 5),
+)
+
+
+def timePerCall(function, inputs):
+	"""
+	Return the average seconds taken to evaluate the function on each of the
+	inputs, which differ so that the Airy functions' cache is never hit.
+	"""
+	start = time.perf_counter()
+	for t in inputs:
+		function(t)
+	return (time.perf_counter() - start)/len(inputs)
+
+
+def main():
+	generator = numpy.random.default_rng(0)
+	print("%12s %12s %12s %12s" % ("function", "error", "exact (ms)", "table (ms)"))
+	for name, function, t_min, t_max in FUNCTIONS:
+		table = tabulate(function, t_min, t_max, samples=4096, tolerance=TOLERANCE)
+		inputs = [generator.uniform(t_min, t_max, COUNT) for i in range(REPEATS)]
+		t = inputs[0]
+		error = numpy.max(numpy.abs(table(t) - function(t)))
+		if error > TOLERANCE:
+			raise AssertionError("%s table is off by %g." % (name, error))
+		print("%12s %12.2e %12.3f %12.3f" % (
+			name, error, 1000*timePerCall(function, inputs), 1000*timePerCall(table, inputs)))
+
+
+if __name__ == "__main__":
+	main()
@@ -1,8 +1,15 @@
 from .bullet   import *
 from .core     import *
+from .prefab   import *
+from .rendering import *
 from .timeline import *
+from .behaviour import *
 
 from . import utils
 from . import maths
 from . import components
-from . import extras
\ No newline at end of file
+from . import extras
+from . import systems
+from . import capture
+from . import baking
+from . import language
\ No newline at end of file
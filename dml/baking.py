@@ -0,0 +1,237 @@
+"""
+Baking deterministic stages to files, and playing them back.
+
+A stage that does not depend on the player (no aiming, no randomness)
+draws the same circles every time it is run. ``bakeStage`` runs such a
+stage headless and writes the draw commands of every frame to a file, and
+a BakedStagePlayer draws them again, frame by frame, without simulating a
+single bullet. Baked stages are drawn alongside any live bullets.
+
+The file holds a header, the draw commands of every frame one after the
+other as fixed-size records, an index of the first record of each frame,
+and the palette of colours the records refer to. The records are read
+through a ``numpy.memmap``, so only the frames being played are ever read
+from the disk.
+"""
+import json
+import struct
+
+import numpy
+
+from .core      import globalSystem, DMLSystemError
+from .bullet    import Bullet
+from .rendering import CircleCommand, RecordingBackend
+from .components.core import ConfigurationError
+
+_MAGIC = b"DMLBAKE1"
+# The magic number, FPS, width, height, number of frames, and the offsets of
+# the index and the palette. The records start after the header.
+_HEADER = struct.Struct("<8sIIIQQQ")
+_HEADER_SIZE = 64
+
+# Positions and radii are stored as the integers they are drawn at, and
+# colours as indices into the palette.
+_RECORD = numpy.dtype([
+	("x", "<i4"), ("y", "<i4"), ("layer", "<i2"), ("radius", "<i2"),
+	("glow_radius", "<i2"), ("colour", "<u2"), ("glow_colour", "<u2")])
+
+
+class BakeWriter(object):
+
+	"""
+	Writes the draw commands of a stage to a baked stage file, one frame at
+	a time.
+	"""
+
+	def __init__(self, path, fps, dimensions):
+		self.path = path
+		self.fps = fps
+		self.dimensions = dimensions
+		self._file = None
+		# The index of the first record of every frame, and of the record after
+		# the last frame.
+		self._offsets = [0]
+		# The index of every colour, in order of first use.
+		self._palette = {}
+
+	def open(self):
+		"""Create the file."""
+		self._file = open(self.path, "wb")
+		self._file.write(bytes(_HEADER_SIZE))
+
+	def _colourIndex(self, colour):
+		"""Return the index of a colour in the palette, adding it if new (Internal)."""
+		key = None if colour is None else tuple(colour)
+		index = self._palette.get(key)
+		if index is None:
+			if len(self._palette) > numpy.iinfo(_RECORD["colour"]).max:
+				raise ValueError("Too many distinct colours to bake.")
+			index = self._palette[key] = len(self._palette)
+		return index
+
+	def write(self, commands):
+		"""Write the draw commands of the next frame."""
+		records = numpy.empty(len(commands), _RECORD)
+		if commands:
+			layer, x, y, radius, colour, glow_radius, glow_colour = zip(*commands)
+			records["x"] = x
+			records["y"] = y
+			records["layer"] = layer
+			records["radius"] = radius
+			records["glow_radius"] = glow_radius
+			records["colour"] = [self._colourIndex(c) for c in colour]
+			records["glow_colour"] = [self._colourIndex(c) for c in glow_colour]
+		self._file.write(records.tobytes())
+		self._offsets.append(self._offsets[-1] + len(records))
+
+	def close(self):
+		"""Write the index, the palette and the header, and close the file."""
+		index_offset = self._file.tell()
+		self._file.write(numpy.array(self._offsets, dtype="<i8").tobytes())
+		palette_offset = self._file.tell()
+		self._file.write(json.dumps(list(self._palette)).encode())
+
+		width, height = self.dimensions
+		self._file.seek(0)
+		self._file.write(_HEADER.pack(_MAGIC, self.fps, width, height,
+			len(self._offsets) - 1, index_offset, palette_offset))
+		self._file.close()
+
+
+class BakingBackend(RecordingBackend):
+
+	"""
+	A RecordingBackend that writes the commands of every frame with a
+	BakeWriter instead of keeping them.
+	"""
+
+	def __init__(self, writer, backend=None):
+		super().__init__(backend)
+		self.writer = writer
+
+	def record(self, commands):
+		self.writer.write(commands)
+
+
+class BakedStage(object):
+
+	"""
+	A baked stage file, opened for playback.
+
+	``frame`` returns the records of a frame as a structured array, which
+	also gives the positions and radii of the baked bullets for custom
+	collision checks.
+	"""
+
+	def __init__(self, path):
+		self.path = path
+		with open(path, "rb") as file:
+			header = file.read(_HEADER.size)
+			if len(header) < _HEADER.size or header[:len(_MAGIC)] != _MAGIC:
+				raise ValueError("%r is not a baked stage." % path)
+			magic, self.fps, width, height, frames, index_offset, palette_offset = _HEADER.unpack(header)
+			file.seek(palette_offset)
+			palette = json.loads(file.read().decode())
+		self.dimensions = (width, height)
+		self._palette = [None if colour is None else tuple(colour) for colour in palette]
+
+		self._index = numpy.memmap(path, "<i8", "r", offset=index_offset, shape=(frames + 1,))
+		count = int(self._index[-1])
+		# NumPy cannot map an empty array.
+		if count:
+			self._records = numpy.memmap(path, _RECORD, "r", offset=_HEADER_SIZE, shape=(count,))
+		else:
+			self._records = numpy.empty(0, _RECORD)
+
+	def __len__(self):
+		return len(self._index) - 1
+
+	def frame(self, index):
+		"""Return the array of records of the frame with the given index."""
+		return self._records[self._index[index]:self._index[index + 1]]
+
+	def commands(self, index, offset=(0, 0)):
+		"""
+		Return the list of draw commands of the frame with the given index,
+		moved by the given offset.
+		"""
+		records = self.frame(index)
+		x = records["x"]
+		y = records["y"]
+		dx, dy = offset
+		if dx or dy:
+			x = x + int(dx)
+			y = y + int(dy)
+		palette = self._palette.__getitem__
+		return list(map(CircleCommand,
+			records["layer"].tolist(), x.tolist(), y.tolist(), records["radius"].tolist(),
+			map(palette, records["colour"].tolist()), records["glow_radius"].tolist(),
+			map(palette, records["glow_colour"].tolist())))
+
+
+class BakedStagePlayer(Bullet):
+
+	"""
+	An invisible bullet that draws a BakedStage, one frame per frame, offset
+	by its position. It dies after the last frame, unless ``loop`` is True,
+	in which case it starts over.
+
+	Configuration:
+
+		stage: The BakedStage, or the path of its file.
+
+		loop: Whether to play the stage in a loop (defaults to False).
+	"""
+
+	__slots__ = ("stage", "loop", "_frame")
+
+	def initialize(self, **config):
+		stage = config["stage"]
+		if not isinstance(stage, BakedStage):
+			stage = BakedStage(stage)
+		fps = globalSystem.getFPS()
+		if fps is not None and fps != stage.fps:
+			raise ConfigurationError(
+				"Stage baked at %d FPS cannot be played at %d FPS." % (stage.fps, fps))
+		self.stage = stage
+		self.loop = config.get("loop", False)
+		# The index of the next frame to draw.
+		self._frame = 0
+
+	def update(self):
+		stage = self.stage
+		if self._frame < len(stage):
+			globalSystem._draw_list.extend(stage.commands(self._frame, self.position))
+			self._frame += 1
+		if self._frame >= len(stage):
+			if self.loop:
+				self._frame = 0
+			else:
+				self.kill()
+
+
+def bakeStage(path, frames):
+	"""
+	Run the stage set up on the global system headless for the given number
+	of frames (see ``_DMLSystem.runOffline``), and write what it draws to a
+	baked stage file at the given path.
+
+	The stage really is run: afterwards its surviving bullets are still
+	live and the system's frame and time have moved on. Stages are meant to
+	be baked ahead of time in a process of their own, such as a build
+	script, rather than by the game that plays them.
+	"""
+	if not globalSystem.getDimensions():
+		raise DMLSystemError("Dimensions not set.")
+	if not globalSystem.getFPS():
+		raise DMLSystemError("FPS not set.")
+
+	writer = BakeWriter(path, globalSystem.getFPS(), globalSystem.getDimensions())
+	backend = globalSystem.getRenderBackend()
+	globalSystem.setRenderBackend(BakingBackend(writer))
+	writer.open()
+	try:
+		globalSystem.runOffline(frames)
+	finally:
+		globalSystem.setRenderBackend(backend)
+		writer.close()
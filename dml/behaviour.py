@@ -0,0 +1,321 @@
+"""
+Keyframe behaviours: bullet scripts of timed actions, run in batch.
+
+Much bullet logic is a fixed script, such as "at 0.25 seconds slow down,
+at 1.5 seconds speed up again and turn". Rather than checking the time in
+``update`` every frame, a bullet class can describe such a script as a
+Behaviour:
+
+	class Bullet1(dml.Bullet):
+
+		BEHAVIOUR = (dml.Behaviour()
+			.at(0.25).transitionToSpeed(0, 0.5)
+			.at(1.5).transitionToSpeed(dml.maths.Uniform(4, 8), 0.5).rotate(dml.maths.Uniform(0, 0.3)))
+
+The keyframes are compiled into a table of frame offsets when the first
+bullet of the behaviour is added to the system. Every frame, the system
+performs the keyframes that have come due for all of the bullets of each
+behaviour at once, drawing any random values for the whole group in one
+go, and never looks at the bullets in between.
+
+Bullets whose class does not override ``update`` are moved and rendered
+by their behaviour, and their ``update`` is never called.
+"""
+import itertools
+
+import numpy
+
+from .core   import globalSystem
+from .bullet import Bullet
+from .maths  import Distribution
+from .components import LinearAccelerator, Path, Render
+
+
+class BehaviourError(Exception):
+	"""
+	An error thrown when a keyframe cannot be performed, or when a Behaviour
+	is changed after it has been used.
+	"""
+	pass
+
+
+def _method(name):
+	"""Return a function calling the method of the given name (Internal)."""
+	return lambda target, *args : getattr(target, name)(*args)
+
+def _addComponent(bullet, componentType, config):
+	"""Add a new component to a bullet (Internal)."""
+	bullet.addComponent(componentType(**config))
+
+def _removeComponent(bullet, componentType):
+	"""Remove a component from a bullet, if it has one (Internal)."""
+	component = bullet.getComponent(componentType)
+	if component is not None:
+		bullet.removeComponent(component)
+
+def _swapComponent(bullet, componentType, newType, config):
+	"""Replace a component of a bullet with a new one (Internal)."""
+	_removeComponent(bullet, componentType)
+	bullet.addComponent(newType(**config))
+
+def _nextPathElement(bullet):
+	"""Move a bullet's Path on to its next element (Internal)."""
+	path = bullet.getComponent(Path)
+	if path is None:
+		raise BehaviourError("%s has no Path component." % type(bullet).__name__)
+	path.forceNext()
+
+def _keyframeOffset(time, timestep):
+	"""
+	Return the number of frames after its first that a bullet's local time
+	reaches the given time, exactly as ``Bullet.At`` would find it
+	(Internal).
+	"""
+	local_time = 0
+	offset = 0
+	while local_time < time:
+		local_time += timestep
+		offset += 1
+	return offset
+
+
+class Behaviour(object):
+
+	"""
+	A script of keyframes, each a time and the actions performed at it,
+	shared by every bullet whose class sets it as its ``BEHAVIOUR``.
+
+	Keyframes are added by calling ``at`` with a time (in seconds of a
+	bullet's local time), followed by the actions to perform at that time.
+	Every method returns the Behaviour, so they can be chained. Arguments
+	of actions may be any Distribution of ``dml.maths``, such as Uniform,
+	Normal or Choice, which draws a value over its own interval for each
+	bullet.
+
+	Actions act on a component of the bullet: by default a LinearAccelerator
+	for motion and a Render for appearance. Actions given ``Path`` as their
+	component act on the path's current element. Actions on a component the
+	bullet doesn't have raise a BehaviourError.
+
+	If ``move`` or ``render`` is False, bullets that run only this
+	behaviour are not moved or rendered.
+	"""
+
+	def __init__(self, move=True, render=True, seed=None):
+		self.move = move
+		self.render = render
+		self._generator = numpy.random.default_rng(seed)
+
+		# The (time, actions) of every keyframe, in the order they were added.
+		self._keyframes = []
+		self._current = None
+
+		# The compiled table, built when the first bullet is added: the frame
+		# offsets of the keyframes in order, and their lists of actions.
+		self._offsets = None
+		self._actions = None
+
+		# The bullets that run only this behaviour, used as an ordered set.
+		self._bullets = {}
+		# The bullets added since the last frame, which are scheduled in their
+		# first frame.
+		self._new = []
+		# The bullets due at each global frame, as {keyframe index : bullets}.
+		self._schedule = {}
+		# Whether the bullets of each class still need their ``update``.
+		self._scripted = {}
+
+	def _checkCompiled(self):
+		"""Raise a BehaviourError if this behaviour is in use (Internal)."""
+		if self._offsets is not None:
+			raise BehaviourError("Cannot change a behaviour once it is in use.")
+
+	def at(self, time):
+		"""Start a keyframe at the given time, to which actions are added."""
+		self._checkCompiled()
+		self._current = []
+		self._keyframes.append((time, self._current))
+		return self
+
+	def do(self, function, *args, component=None):
+		"""
+		Add an action calling the given function with the bullet (or its
+		component of the given type) and the given arguments.
+		"""
+		self._checkCompiled()
+		if self._current is None:
+			raise BehaviourError("Actions must follow a call to 'at'.")
+		self._current.append((component, function, args))
+		return self
+
+	def call(self, name, *args, component=None):
+		"""
+		Add an action calling the method of the given name of the bullet (or
+		its component of the given type) with the given arguments.
+		"""
+		return self.do(_method(name), *args, component=component)
+
+	def setSpeed(self, speed, component=LinearAccelerator):
+		"""Set the speed of the bullet's motion."""
+		return self.call("setSpeed", speed, component=component)
+
+	def transitionToSpeed(self, speed, time, component=LinearAccelerator):
+		"""Smoothly transition the speed of the bullet's motion over a time."""
+		return self.call("transitionToSpeed", speed, time, component=component)
+
+	def rotate(self, amount, radians=True, component=LinearAccelerator):
+		"""Rotate the direction of the bullet's motion."""
+		return self.call("rotate", amount, radians, component=component)
+
+	def changeDirection(self, direction, component=LinearAccelerator):
+		"""Change the direction of the bullet's motion."""
+		return self.call("changeDirection", direction, component=component)
+
+	def stop(self, component=LinearAccelerator):
+		"""Stop the bullet's motion."""
+		return self.call("stop", component=component)
+
+	def nextPathElement(self):
+		"""Move the bullet's Path on to its next element."""
+		return self.do(_nextPathElement)
+
+	def setColour(self, colour, component=Render):
+		"""Set the colour of the bullet's renderer."""
+		return self.call("setColour", colour, component=component)
+
+	def setRadius(self, radius, component=Render):
+		"""Set the radius of the bullet's renderer."""
+		return self.call("setRadius", radius, component=component)
+
+	def addComponent(self, componentType, **config):
+		"""Add a new component of the given type and configuration."""
+		return self.do(_addComponent, componentType, config)
+
+	def removeComponent(self, componentType):
+		"""Remove the bullet's component of the given type, if any."""
+		return self.do(_removeComponent, componentType)
+
+	def swapComponent(self, componentType, newType, **config):
+		"""
+		Replace the bullet's component of the given type with a new component
+		of another type and configuration.
+		"""
+		return self.do(_swapComponent, componentType, newType, config)
+
+	def kill(self):
+		"""Kill the bullet."""
+		return self.call("kill")
+
+	def _compile(self):
+		"""Compile the keyframes into the table of frame offsets (Internal)."""
+		timestep = globalSystem._timestep
+		if timestep is None:
+			raise BehaviourError("The FPS must be set before a behaviour is used.")
+
+		table = {}
+		for time, actions in self._keyframes:
+			table.setdefault(_keyframeOffset(time, timestep), []).extend(actions)
+		self._offsets = sorted(table)
+		self._actions = [table[offset] for offset in self._offsets]
+
+	def _add(self, bullet):
+		"""
+		Start running this behaviour on a bullet that was added to the system,
+		and return True if its ``update`` must still be called (Internal).
+		"""
+		if self._offsets is None:
+			self._compile()
+
+		bulletType = type(bullet)
+		scripted = self._scripted.get(bulletType)
+		if scripted is None:
+			scripted = self._scripted[bulletType] = bulletType.update is not Bullet.update
+
+		if not scripted:
+			self._bullets[bullet] = None
+		if self._offsets:
+			self._new.append(bullet)
+		return scripted
+
+	def _remove(self, bullet):
+		"""Stop running this behaviour on a bullet (Internal)."""
+		# Removed bullets left in the schedule are skipped when they come due.
+		self._bullets.pop(bullet, None)
+
+	def _isIdle(self):
+		"""Return whether this behaviour has no bullets left to run (Internal)."""
+		return not (self._bullets or self._new or self._schedule)
+
+	def _scheduleAt(self, frame, index, bullets):
+		"""Schedule bullets for a keyframe at a global frame (Internal)."""
+		due = self._schedule.get(frame)
+		if due is None:
+			due = self._schedule[frame] = {}
+		due.setdefault(index, []).extend(bullets)
+
+	def _step(self):
+		"""
+		Move and render the bullets that run only this behaviour, and perform
+		the keyframes due this frame (Internal).
+		"""
+		frame = globalSystem.global_frame
+		if self._new:
+			self._scheduleAt(frame + self._offsets[0], 0, self._new)
+			self._new = []
+
+		if self._bullets:
+			if globalSystem._batched:
+				move, render = self.move, self.render
+				for bullet in self._bullets:
+					bullet._move_requested = move
+					bullet._render_requested = render
+			else:
+				for bullet in self._bullets:
+					if self.render:
+						bullet.render()
+					if self.move:
+						bullet.move()
+					for component in bullet._auto_components:
+						component._auto()
+
+		due = self._schedule.pop(frame, None)
+		if due is None:
+			return
+		offsets = self._offsets
+		for index, bullets in sorted(due.items()):
+			bullets = [bullet for bullet in bullets if bullet._live and not bullet._dead]
+			if not bullets:
+				continue
+			for action in self._actions[index]:
+				self._perform(action, bullets)
+			if index + 1 < len(offsets):
+				self._scheduleAt(frame + offsets[index + 1] - offsets[index], index + 1, bullets)
+
+	def _perform(self, action, bullets):
+		"""Perform an action on every given bullet (Internal)."""
+		componentType, function, args = action
+		if componentType is None:
+			targets = bullets
+		else:
+			targets = [_getTarget(bullet, componentType) for bullet in bullets]
+
+		# Random arguments are drawn for every bullet at once, and the others
+		# repeated.
+		count = len(bullets)
+		columns = [
+			arg.sample(count, self._generator).tolist() if isinstance(arg, Distribution)
+			else itertools.repeat(arg, count) for arg in args]
+		for target, values in zip(targets, zip(*columns) if columns else itertools.repeat(())):
+			function(target, *values)
+
+
+def _getTarget(bullet, componentType):
+	"""Return the object an action on the given component acts on (Internal)."""
+	component = bullet.getComponent(componentType)
+	if component is None:
+		raise BehaviourError("%s has no %s component." % (type(bullet).__name__, componentType.__name__))
+	if isinstance(component, Path):
+		if component._current_element >= len(component._elements):
+			raise BehaviourError("%s's Path has no current element." % type(bullet).__name__)
+		return component.getCurrentElement()
+	return component
@@ -3,9 +3,9 @@ import random
 
 from .components import *
 
-from .utils    import getBasesLinear
 from .core     import globalSystem
 from .maths    import Vector2D
+from .utils    import getAttributes, copyAttributes
 
 
 class Bullet(object):
@@ -22,11 +22,22 @@ class Bullet(object):
 	# The size of a random name.
 	_RAND_NAME_SIZE = 16**10
 
+	# The keyframe Behaviour (see dml.behaviour) bullets of this class run, if
+	# any.
+	BEHAVIOUR = None
+
+	# The attributes of every bullet are stored in slots to keep bullets small.
+	# Subclasses that don't declare their own slots get a ``__dict__`` as usual.
+	__slots__ = (
+		"name", "origin", "position", "_current_displacement", "local_time", "_dead",
+		"_live", "_move_requested", "_render_requested", "_components",
+		"_component_map", "_motion_components", "_render_components", "_auto_components")
+
 	def __init__(self, origin, name=None, **config):
 		super().__init__()
 		if name is None:
 			# Generate a random name if none is given.
-			name = "%010x" % random.randrange(Bullet._RAND_NAME_SIZE)
+			name = self._randomName()
 		self.name = name
 
 		# The origin is the origin of this bullet's local coordinate space
@@ -46,34 +57,140 @@ class Bullet(object):
 
 		self._dead = False
 
-		# Components are stored in a dictionary where the keys are the classes of the
-		# components and the values are a list of all components of that type attached
-		# to this bullet. This is so that we can say self.getComponent(Parent) and get
-		# all components whose parent class Parent, rather than just all components of
-		# type Parent.
-		self._components = {}
+		# Whether this bullet is in the system. Components added to a live bullet
+		# are registered with the system immediately.
+		self._live = False
+
+		# In ECS mode, ``move`` and ``render`` only set these flags, and the component
+		# systems move and render every flagged bullet in batches.
+		self._move_requested = False
+		self._render_requested = False
+
+		# All components attached to this bullet, in the order they were added.
+		# Components are looked up by any class in their linear chain of bases, so
+		# that we can say self.getComponent(Parent) and get all components whose
+		# parent class is Parent, rather than just all components of type Parent.
+		self._components = ()
+		# The components of each type looked up so far, as {type : tuple}, dropped
+		# whenever a component is added or removed.
+		self._component_map = None
+
+		# Flat tuples of the components ``move``, ``render`` and ``_update`` dispatch
+		# to every frame. They are rebuilt whenever a component is added, so that
+		# dispatching doesn't have to look anything up in ``_components``.
+		self._motion_components = ()
+		self._render_components = ()
 
 		# Auto components are components that update themselves regardless of a 
 		# bullet's ``update`` method.
-		self._auto_components = []
+		self._auto_components = ()
 
 		self.initialize(**config)
 
 		globalSystem.addBullet(self)
 
+	@staticmethod
+	def _randomName():
+		"""Generate a random name (Internal)."""
+		return "%010x" % random.randrange(Bullet._RAND_NAME_SIZE)
+
 	def initialize(self, **config):
 		"""Extra initialization. Use this to add components to a bullet."""
 		pass
 
+	def stamp(self, **config):
+		"""
+		Apply per-instance configuration to a bullet stamped from a Prefab.
+
+		Override this alongside ``initialize`` to make a bullet class cheap
+		to instance through a Prefab. It receives only the per-instance
+		fields, and should update the attributes and components that
+		``initialize`` derived from them.
+		"""
+		pass
+
+	def _cloneLayout(self):
+		"""
+		Describe where each of this bullet's components is referenced, as
+		indices into its list of all components, so that copies can be wired
+		up without searching (Internal).
+		"""
+		components = self._getAllComponents()
+		index = {id(component) : i for i, component in enumerate(components)}
+		indices = lambda components : tuple(index[id(component)] for component in components)
+		return (
+			indices(self._motion_components),
+			indices(self._render_components),
+			indices(self._auto_components),
+			# Attributes referring to components, such as cached references set in
+			# ``initialize``.
+			tuple((key, index[id(value)]) for key, value in getAttributes(self).items()
+				  if id(value) in index)
+			)
+
+	def _clone(self, origin, name=None, layout=None):
+		"""
+		Return an unregistered copy of this bullet at a new origin, with copies
+		of all of its components (Internal).
+		"""
+		if layout is None:
+			layout = self._cloneLayout()
+		motion, render, auto, attributes = layout
+
+		clone = object.__new__(type(self))
+		copyAttributes(self, clone)
+		clone.name = self._randomName() if name is None else name
+		clone.origin = Vector2D(origin)
+		clone.position = clone.origin
+		clone._current_displacement = Vector2D.origin
+		clone.local_time = 0
+		clone._dead = False
+		clone._live = False
+		clone._move_requested = False
+		clone._render_requested = False
+
+		copies = [component._clone(clone) for component in self._getAllComponents()]
+		clone._components = tuple(copies)
+		clone._component_map = None
+		clone._motion_components = tuple([copies[i] for i in motion])
+		clone._render_components = tuple([copies[i] for i in render])
+		clone._auto_components = tuple([copies[i] for i in auto])
+		for key, i in attributes:
+			setattr(clone, key, copies[i])
+		return clone
+
 	def addComponent(self, component):
 		"""Add a component to this bullet."""
 		component = component.withBullet(self)
-		for base in getBasesLinear(type(component), Component):
-			self._components.setdefault(base, []) \
-						    .append(component)
-
-		if component.AUTOMATIC:
-			self._auto_components.append(component)
+		bases = getComponentLayout(type(component)).bases
+		self._components += (component,)
+		self._component_map = None
+
+		if Motion in bases:
+			self._motion_components += (component,)
+		if Render in bases:
+			self._render_components += (component,)
+		if component.AUTOMATIC and not component.BATCHED:
+			self._auto_components += (component,)
+
+		if self._live:
+			globalSystem._registerComponent(component)
+
+	def removeComponent(self, component):
+		"""Remove a component from this bullet."""
+		without = lambda components : tuple([c for c in components if c is not component])
+		self._components = without(self._components)
+		self._component_map = None
+		self._motion_components = without(self._motion_components)
+		self._render_components = without(self._render_components)
+		self._auto_components = without(self._auto_components)
+
+		if self._live:
+			globalSystem._unregisterComponent(component)
+
+	def _getAllComponents(self):
+		"""Return every component attached to this bullet (Internal)."""
+		return self._components
 
 	def getComponent(self, componentType):
 		"""
@@ -84,14 +201,24 @@ class Bullet(object):
 
 		If the component does not exist, None will be returned.
 		"""
-		components = self._components.get(componentType)
-		if components is None:
-			return components
-		return components[0]
+		components = self._getComponentsOf(componentType)
+		return components[0] if components else None
 
 	def getComponents(self, componentType):
 		"""Get a list of components."""
-		return self._components.get(componentType, [])
+		return list(self._getComponentsOf(componentType))
+
+	def _getComponentsOf(self, componentType):
+		"""Return the tuple of this bullet's components of a type (Internal)."""
+		component_map = self._component_map
+		if component_map is None:
+			component_map = self._component_map = {}
+		components = component_map.get(componentType)
+		if components is None:
+			components = component_map[componentType] = tuple([
+				component for component in self._components
+				if componentType in getComponentLayout(type(component)).bases])
+		return components
 
 	def forEach(self, componentType):
 		"""
@@ -114,7 +241,7 @@ class Bullet(object):
 
 		====
 		"""
-		return ComponentListCaller(self._components[componentType])
+		return ComponentListCaller(self.getComponents(componentType))
 
 	def getFromEach(self, componentType):
 		"""
@@ -140,7 +267,7 @@ class Bullet(object):
 
 		====
 		"""
-		return ComponentListGetter(self._components[componentType])
+		return ComponentListGetter(self.getComponents(componentType))
 
 	def After(self, time):
 		"""
@@ -187,7 +314,6 @@ class Bullet(object):
 		self.update()
 		for component in self._auto_components:
 			component._auto()
-		self.local_time += globalSystem._timestep
 
 	def update(self):
 		"""External update. Describe your bullet's functionality here."""
@@ -195,12 +321,26 @@ class Bullet(object):
 
 	def render(self):
 		"""Activate all Render components."""
-		for component in self.getComponents(Render):
+		if globalSystem._batched:
+			self._render_requested = True
+			return
+		for component in self._render_components:
 			component.render()
 
 	def move(self):
-		"""Activate all Motion components."""
-		for component in self.getComponents(Motion):
+		"""
+		Activate all Motion components. In ECS mode the bullet is only marked,
+		and moved after every bullet's ``update`` has run.
+		"""
+		if globalSystem._batched:
+			self._move_requested = True
+			return
+		for component in self._motion_components:
 			component.moveBullet()
+		self._commitMove()
+
+	def _commitMove(self):
+		"""Move to the displacement accumulated by the Motion components (Internal)."""
 		self.position = self.origin + self._current_displacement
-		self._current_displacement = Vector2D.origin
\ No newline at end of file
+		self._current_displacement = Vector2D.origin
+		self._move_requested = False
\ No newline at end of file
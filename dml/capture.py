@@ -0,0 +1,154 @@
+"""
+Capturing rendered frames to disk.
+
+Frames are copied out of the screen as NumPy arrays and handed to a
+background thread, which writes them with a FrameWriter, so that the
+simulation never waits on the disk.
+"""
+import os
+import queue
+import threading
+
+import numpy
+import pygame
+
+
+def _unpackPixels(pixels, shifts):
+	"""
+	Return the (width, height, 3) RGB array of an array of packed 32-bit
+	pixels with the given channel shifts, or the array itself if it is
+	already unpacked (Internal).
+	"""
+	if shifts is None:
+		return pixels
+	frame = numpy.empty(pixels.shape + (3,), dtype=numpy.uint8)
+	for channel in range(3):
+		# Assigning to the 8-bit array keeps the lowest byte.
+		frame[..., channel] = pixels >> shifts[channel]
+	return frame
+
+
+class FrameWriter(object):
+
+	"""
+	Base class for writers of captured frames. Frames are (width, height, 3)
+	arrays of RGB values, as returned by ``pygame.surfarray.array3d``.
+	"""
+
+	def open(self, dimensions):
+		"""Prepare to write frames of the given dimensions."""
+		pass
+
+	def write(self, index, frame):
+		"""Write the frame with the given index."""
+		raise NotImplementedError
+
+	def close(self):
+		"""Finish writing."""
+		pass
+
+
+class ImageSequenceWriter(FrameWriter):
+
+	"""
+	Writes every frame to its own image file in a directory. The format is
+	determined by the extension of ``pattern``, which is formatted with the
+	frame index.
+	"""
+
+	def __init__(self, directory, pattern="frame%05d.png"):
+		self.directory = directory
+		self.pattern = pattern
+
+	def open(self, dimensions):
+		os.makedirs(self.directory, exist_ok=True)
+
+	def write(self, index, frame):
+		path = os.path.join(self.directory, self.pattern % index)
+		pygame.image.save(pygame.surfarray.make_surface(frame), path)
+
+
+class RawVideoWriter(FrameWriter):
+
+	"""
+	Writes every frame to a single file as raw, row-major RGB24 video, which
+	can be encoded with, for example:
+
+		ffmpeg -f rawvideo -pix_fmt rgb24 -s WIDTHxHEIGHT -r FPS -i PATH out.mp4
+	"""
+
+	def __init__(self, path):
+		self.path = path
+		self._file = None
+
+	def open(self, dimensions):
+		self._file = open(self.path, "wb")
+
+	def write(self, index, frame):
+		# Surface arrays are indexed by column first.
+		self._file.write(numpy.ascontiguousarray(frame.transpose(1, 0, 2)).data)
+
+	def close(self):
+		self._file.close()
+
+
+class FrameCapture(object):
+
+	"""
+	Writes captured frames with a FrameWriter on a background thread.
+
+	Frames are queued without limit, so that submitting a frame never waits
+	for the writer. Capturing faster than the writer can keep up uses memory
+	for the frames waiting in the queue.
+	"""
+
+	def __init__(self, writer):
+		self.writer = writer
+		self._queue = queue.Queue()
+		self._thread = None
+		self._error = None
+		self._count = 0
+
+	def start(self, dimensions):
+		"""Open the writer and start the writing thread."""
+		self.writer.open(dimensions)
+		self._thread = threading.Thread(target=self._work, daemon=True)
+		self._thread.start()
+
+	def _work(self):
+		"""Write queued frames until the end of the capture (Internal)."""
+		while True:
+			item = self._queue.get()
+			if item is None:
+				return
+			if self._error is None:
+				index, pixels, shifts = item
+				try:
+					self.writer.write(index, _unpackPixels(pixels, shifts))
+				except Exception as error:
+					# Raised in the simulating thread by ``capture`` or ``finish``.
+					self._error = error
+
+	def _checkError(self):
+		"""Raise the error that stopped the writer, if any (Internal)."""
+		if self._error is not None:
+			raise self._error
+
+	def capture(self, surface):
+		"""Copy the pixels of a surface and queue them to be written."""
+		self._checkError()
+		if surface.get_bytesize() == 4:
+			# Copying the packed pixels is much cheaper than splitting them into
+			# channels, which is left to the writing thread.
+			item = (self._count, pygame.surfarray.pixels2d(surface).copy(), surface.get_shifts())
+		else:
+			item = (self._count, pygame.surfarray.array3d(surface), None)
+		self._queue.put(item)
+		self._count += 1
+
+	def finish(self):
+		"""Wait for every queued frame to be written and close the writer."""
+		self._queue.put(None)
+		self._thread.join()
+		self.writer.close()
+		self._checkError()
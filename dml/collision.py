@@ -0,0 +1,104 @@
+"""
+The collision pass run by the system once per frame.
+
+Colliders (see dml.components.collision) are grouped by layer, and every
+pair of layers registered with ``globalSystem.addCollisionCheck`` is tested
+through a spatial hash, so a check costs roughly linear time in the number
+of colliders instead of the product of the two layers' sizes.
+"""
+import numpy
+
+from .maths.spatial import SpatialHash
+
+
+class CollisionWorld(object):
+
+	"""
+	Tests colliders between pairs of layers and reports the hits (Internal).
+	"""
+
+	def __init__(self):
+		self._checks = []
+
+		# The colliders of the last frame and the indices of each layer's colliders.
+		# These are only rebuilt when the colliders change, or when one changes
+		# layer (see ``invalidate``).
+		self._components = ()
+		self._layer_indices = {}
+
+	def addCheck(self, layer_a, layer_b, callback=None):
+		"""Test colliders in layer_a against those in layer_b every frame."""
+		self._checks.append((layer_a, layer_b, callback))
+
+	def hasChecks(self):
+		"""Return True if any checks are registered."""
+		return bool(self._checks)
+
+	def invalidate(self):
+		"""Regroup the colliders by layer on the next run."""
+		self._components = ()
+
+	def _snapshot(self, components):
+		"""Rebuild the layer indices if the set of colliders changed (Internal)."""
+		cached = self._components
+		if len(cached) == len(components) and (not cached or (
+			cached[0] is components[0] and cached[-1] is components[-1])):
+			return
+		self._components = components
+		layers = {}
+		for i, component in enumerate(components):
+			layers.setdefault(component.layer, []).append(i)
+		self._layer_indices = {
+			layer : numpy.array(indices, dtype=numpy.intp)
+			for layer, indices in layers.items()}
+
+	def run(self, colliders):
+		"""Run every check over the given colliders and report the hits."""
+		components = list(colliders)
+		self._snapshot(components)
+		if not components:
+			return
+
+		count = len(components)
+		bullets = [component.bullet for component in components]
+		positions = [bullet.position for bullet in bullets]
+		points = numpy.empty((count, 2))
+		points[:, 0] = numpy.fromiter([position.x for position in positions], float, count)
+		points[:, 1] = numpy.fromiter([position.y for position in positions], float, count)
+		radii = numpy.fromiter([component.radius for component in components], float, count)
+		alive = ~numpy.fromiter([bullet.isDead() for bullet in bullets], bool, count)
+
+		layer_indices = {}
+		for layer, indices in self._layer_indices.items():
+			layer_indices[layer] = indices[alive[indices]]
+
+		hashes = {}
+		empty = numpy.zeros(0, dtype=numpy.intp)
+		for layer_a, layer_b, callback in self._checks:
+			indices_a = layer_indices.get(layer_a, empty)
+			indices_b = layer_indices.get(layer_b, empty)
+			if not len(indices_a) or not len(indices_b):
+				continue
+
+			cell_size = max(radii[indices_a].max() + radii[indices_b].max(), 1)
+			key = (layer_b, cell_size)
+			grid = hashes.get(key)
+			if grid is None:
+				grid = hashes[key] = SpatialHash(points[indices_b], cell_size)
+
+			i, j = grid.queryPairs(points[indices_a], radii[indices_b], radii[indices_a])
+			i = indices_a[i]
+			j = indices_b[j]
+			if layer_a == layer_b:
+				# Report each pair within a layer once, and never a collider with itself.
+				keep = i < j
+				i = i[keep]
+				j = j[keep]
+
+			for a, b in zip(i.tolist(), j.tolist()):
+				collider_a = components[a]
+				collider_b = components[b]
+				if callback is not None:
+					callback(collider_a, collider_b)
+				collider_a.hit(collider_b)
+				collider_b.hit(collider_a)
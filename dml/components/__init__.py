@@ -1,4 +1,5 @@
 from .core   import *
+from .collision import *
 from .death  import *
 from .motion import *
 from .paths  import *
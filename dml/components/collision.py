@@ -0,0 +1,63 @@
+from ..core import globalSystem
+from .core import *
+from .render import Circle
+
+class Collider(Component):
+
+	"""
+	Base collider component. Colliders belong to a ``layer``, and the system
+	tests the layers given to ``globalSystem.addCollisionCheck`` against each
+	other every frame.
+
+	When two colliders hit, each one's ``onHit`` callback (if configured)
+	is called with the collider itself and the collider it hit.
+	"""
+
+	__slots__ = ("_layer", "_on_hit")
+
+	# All colliders share one registry, so they are all tested in the same pass.
+	SHARED_REGISTRY = True
+
+	def initialize(self, **config):
+		self._layer = config["layer"]
+		self._on_hit = config.get("onHit")
+
+	@property
+	def layer(self):
+		"""The layer of this collider, changed with ``setLayer``."""
+		return self._layer
+
+	def setLayer(self, layer):
+		"""Move this collider to another layer."""
+		self._layer = layer
+		globalSystem._collisions.invalidate()
+
+	def hit(self, other):
+		"""Report a hit with another collider."""
+		if self._on_hit is not None:
+			self._on_hit(self, other)
+
+
+class CircleCollider(Collider):
+
+	"""
+	A circular collider. If no ``radius`` is configured, the radius of the
+	bullet's Circle (or GlowingCircle) renderer is used.
+	"""
+
+	__slots__ = ("radius",)
+
+	def initialize(self, **config):
+		super().initialize(**config)
+		radius = config.get("radius")
+		if radius is None:
+			circle = self.bullet.getComponent(Circle)
+			if circle is None:
+				raise ConfigurationError(
+					"``radius`` must be defined if the bullet has no Circle component.")
+			radius = circle.radius
+		self.radius = radius
+
+	def setRadius(self, radius):
+		"""Set a new radius."""
+		self.radius = radius
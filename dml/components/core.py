@@ -1,3 +1,5 @@
+from ..utils import getBasesLinear, copyAttributes
+
 class ComponentError(Exception):
 	"""
 	An error thrown if a component's requirements aren't all met.
@@ -10,6 +12,32 @@ class ConfigurationError(Exception):
 	"""
 	pass
 
+
+class _ComponentLayout(object):
+
+	"""
+	Per-class information about a component type that never changes, so it
+	is computed once and cached rather than recomputed for every instance
+	(Internal).
+	"""
+
+	def __init__(self, componentType):
+		# The linear chain of base classes, used to index a bullet's components.
+		self.bases = tuple(getBasesLinear(componentType, Component))
+		self.requirements = tuple(componentType.REQUIREMENTS)
+		self.conflicts = tuple(componentType.CONFLICTS)
+		self.singleton = componentType.SINGLETON
+		self.needs_validation = bool(self.requirements or self.conflicts or self.singleton)
+
+_LAYOUTS = {}
+
+def getComponentLayout(componentType):
+	"""Return the cached layout of the given component type (Internal)."""
+	layout = _LAYOUTS.get(componentType)
+	if layout is None:
+		layout = _LAYOUTS[componentType] = _ComponentLayout(componentType)
+	return layout
+
 class Component(object):
 
 	"""
@@ -25,53 +53,106 @@ class Component(object):
 	SINGLETON = False
 	AUTOMATIC = False
 
+	# Batched automatic components are not updated through their bullet. The
+	# system instead calls ``_autoBatch`` once per frame on all of them.
+	BATCHED = False
+
+	# The type under which the system registers instances of this component.
+	# If None, the component's exact type is used.
+	REGISTRY_TYPE = None
+
+	# If set to True by a class, it and all of its subclasses are registered
+	# under that class, sharing one registry.
+	SHARED_REGISTRY = False
+
+	# Components are stored in slots to keep bullets small. Subclasses declare
+	# the attributes they add, and those that don't get a ``__dict__`` as usual.
+	__slots__ = ("_config", "bullet")
+
+	def __init_subclass__(cls, **kwargs):
+		super().__init_subclass__(**kwargs)
+		if cls.__dict__.get("SHARED_REGISTRY"):
+			cls.REGISTRY_TYPE = cls
+
 	def __init__(self, **config):
 		self._config = config
 		self.bullet = None
 
 	def withBullet(self, bullet):
-		"""Initialize this component with a bullet instance."""
+		"""
+		Initialize this component with a bullet instance. A component that was
+		initialized before, such as one removed from a bullet and added again,
+		keeps its state instead.
+		"""
+		layout = getComponentLayout(self.__class__)
+		if layout.needs_validation:
+			self._validate(bullet, layout)
+
+		self.bullet = bullet
+		if self._config is not None:
+			self.initialize(**self._config)
+			# The configuration is not needed once the component is initialized.
+			self._config = None
+		return self
 
+	def _validate(self, bullet, layout):
+		"""Check this component against the bullet's other components (Internal)."""
 		# Check if the requirements are met.
-		for req in self.REQUIREMENTS:
-			if bullet.getComponents(req) == []:
+		for req in layout.requirements:
+			if bullet.getComponent(req) is None:
 				raise ComponentError(
 					"%s component requires %s." % (
 						self.__class__.__name__,
-						req.__class__.__name__
+						req.__name__
 					)
 				)
 
 		# Check if any conflicting components exist.
-		for con in self.CONFLICTS:
-			if bullet.getComponents(con):
+		for con in layout.conflicts:
+			if bullet.getComponent(con) is not None:
 				raise ComponentError(
 					"%s component conflicts with %s." % (
 						self.__class__.__name__,
-						con.__class__.__name__
+						con.__name__
 						)
 					)
 
 		# Check if the bullet already has this component.
-		if self.SINGLETON and bullet.getComponents(self.__class__):
+		if layout.singleton and bullet.getComponent(self.__class__) is not None:
 			raise ComponentError(
 				"%s component cannot be duplicated." % (
 					self.__class__.__name__
 					)
 				)
 
-		self.bullet = bullet
-		self.initialize(**self._config)
-		return self
-
 	def initialize(self, **config):
 		"""Extra initialization specific to the component class."""
 		pass
 
+	def _clone(self, bullet):
+		"""
+		Return a copy of this component attached to another bullet, used when
+		stamping prefabs. Components holding mutable state must override this
+		to copy that state (Internal).
+		"""
+		clone = object.__new__(type(self))
+		copyAttributes(self, clone)
+		clone.bullet = bullet
+		return clone
+
 	def _auto(self):
 		"""Automatically update the component (Internal)."""
 		pass
 
+	@classmethod
+	def _autoBatch(cls, components):
+		"""
+		Automatically update every given component of this type at once. Used
+		in ECS mode, and overridable with a vectorized kernel (Internal).
+		"""
+		for component in components:
+			component._auto()
+
 
 class _ComponentList(object):
 
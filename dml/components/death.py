@@ -1,45 +1,201 @@
+import numpy
+
 from ..core import globalSystem
 from .core import *
 
-class DieIfOffscreen(Component):
+_INF = float('inf')
+
+class Expiry(Component):
+
+	"""
+	Base class for automatic components that kill their bullet once it
+	leaves (or enters) a region of space or outlives a timeout.
+
+	Expiry components are not updated one bullet at a time. Instead, every
+	frame the system checks all of them in a single vectorized pass over
+	the bullets' positions and local times, with each component's region
+	and timeout stored as a row of parameters.
+	"""
+
+	AUTOMATIC = True
+	BATCHED = True
+
+	# All expiry components share one registry, so that they are all checked
+	# in the same pass regardless of their exact type.
+	SHARED_REGISTRY = True
+
+	__slots__ = ("_bounds", "_circle", "_inside", "_timeout")
+
+	def initialize(self, **config):
+		# The region is the intersection of an axis-aligned box and a circle, each
+		# of which is unbounded unless set by a subclass.
+		self._bounds = (-_INF, -_INF, _INF, _INF)
+		self._circle = (0, 0, _INF)
+		# If True, the bullet dies inside the region rather than outside of it.
+		self._inside = False
+		self._timeout = _INF
+
+	def _parameters(self):
+		"""Return this component's row of expiry parameters (Internal)."""
+		xmin, ymin, xmax, ymax = self._bounds
+		cx, cy, radius = self._circle
+		return (xmin, ymin, xmax, ymax, cx, cy, radius*radius, self._inside, self._timeout)
+
+	def _auto(self):
+		x, y = self.bullet.position
+		xmin, ymin, xmax, ymax, cx, cy, radius_squared, inside, timeout = self._parameters()
+		outside = not (xmin <= x <= xmax and ymin <= y <= ymax) \
+				  or (x - cx)**2 + (y - cy)**2 > radius_squared
+		if outside != inside or self.bullet.local_time > timeout:
+			self.bullet.kill()
+
+	# Incremented whenever the parameters of any expiry component change
+	# (Internal).
+	_version = 0
+
+	# The components, parameter columns and version of the last batch
+	# (Internal).
+	_batch_components = ()
+	_batch_parameters = None
+	_batch_version = -1
+
+	def _changed(self):
+		"""Invalidate the parameters of the last batch (Internal)."""
+		Expiry._version += 1
+
+	@classmethod
+	def _autoBatch(cls, components):
+		components = list(components)
+		count = len(components)
+		if not count:
+			return
+
+		# Parameters rarely change, so they are only gathered again when the set
+		# of components changes, or when a component's parameters are changed.
+		# Components are only ever appended to or removed from the registry, so
+		# comparing the length and the first and last components is enough to
+		# detect the former.
+		cached = Expiry._batch_components
+		if len(cached) != count or cached[0] is not components[0] \
+							   or cached[-1] is not components[-1] \
+							   or Expiry._batch_version != Expiry._version:
+			Expiry._batch_components = components
+			Expiry._batch_version = Expiry._version
+			Expiry._batch_parameters = numpy.array(
+				[component._parameters() for component in components], dtype=float).T
+		xmin, ymin, xmax, ymax, cx, cy, radius_squared, inside, timeout = Expiry._batch_parameters
+
+		bullets = [component.bullet for component in components]
+		positions = [bullet.position for bullet in bullets]
+		x = numpy.fromiter([position.x for position in positions], float, count)
+		y = numpy.fromiter([position.y for position in positions], float, count)
+		time = numpy.fromiter([bullet.local_time for bullet in bullets], float, count)
+
+		outside = (x < xmin) | (x > xmax) | (y < ymin) | (y > ymax) \
+				| ((x - cx)**2 + (y - cy)**2 > radius_squared)
+		dead = (outside != inside.astype(bool)) | (time > timeout)
+
+		for i in numpy.flatnonzero(dead):
+			bullets[i].kill()
+
+
+class DieIfOffscreen(Expiry):
 
 	"""
 	An automatic component that kills the bullet if it goes
 	off-screen.
 	"""
 
-	AUTOMATIC = True
+	__slots__ = ("_leeway",)
 
 	def initialize(self, **config):
+		super().initialize(**config)
 		# The amount of leeway the bullet has when determining if it is
 		# offscreen or not. If its value is 100, then the bullet can move
 		# 100 pixels offscreen before dying.
 		self.leeway = config.get("leeway", 10)
 
+	@property
+	def leeway(self):
+		return self._leeway
+
+	@leeway.setter
+	def leeway(self, leeway):
+		self._leeway = leeway
 		# Remember the dimensions so we don't keep recalculating them every frame.
 		dimensions = globalSystem.getDimensions()
-		self._xrange = (-self.leeway, dimensions[0] + self.leeway)
-		self._yrange = (-self.leeway, dimensions[1] + self.leeway)
+		self._bounds = (-leeway, -leeway, dimensions[0] + leeway, dimensions[1] + leeway)
+		self._changed()
 
-	def _auto(self):
-		x, y = self.bullet.position
-		if not (self._xrange[0] <= x <= self._xrange[1] and \
-				self._yrange[0] <= y <= self._yrange[1]):
-			self.bullet.kill()
-
-class DieIfAfter(Component):
+class DieIfAfter(Expiry):
 
 	"""
 	An automatic component that kills the bullet after a
 	given amount of time.
 	"""
 
-	AUTOMATIC = True
+	__slots__ = ()
 
 	def initialize(self, **config):
+		super().initialize(**config)
 		# The time after which to kill the bullet.
 		self.time = config["time"]
 
-	def _auto(self):
-		if self.bullet.local_time > self.time:
-			self.bullet.kill()
\ No newline at end of file
+	@property
+	def time(self):
+		return self._timeout
+
+	@time.setter
+	def time(self, time):
+		self._timeout = time
+		self._changed()
+
+class _RegionExpiry(Expiry):
+
+	"""
+	Base class for expiry components with a configurable region. The region
+	is either a rectangle, given by ``rect`` as (left, top, width, height),
+	or a circle, given by ``centre`` and ``radius``.
+	"""
+
+	__slots__ = ()
+
+	def initialize(self, **config):
+		super().initialize(**config)
+		rect = config.get("rect")
+		radius = config.get("radius")
+
+		if (rect is None) == (radius is None):
+			raise ConfigurationError(
+				"Either only ``rect`` or ``centre`` and ``radius`` must be defined.")
+
+		if rect is not None:
+			left, top, width, height = rect
+			self._bounds = (left, top, left + width, top + height)
+		else:
+			if "centre" not in config:
+				raise ConfigurationError("A ``radius`` must be given with a ``centre``.")
+			cx, cy = config["centre"]
+			self._circle = (cx, cy, radius)
+
+class DieIfOutside(_RegionExpiry):
+
+	"""
+	An automatic component that kills the bullet once it leaves
+	a given rectangle or circle.
+	"""
+
+	__slots__ = ()
+
+class DieIfInside(_RegionExpiry):
+
+	"""
+	An automatic component that kills the bullet once it enters
+	a given rectangle or circle.
+	"""
+
+	__slots__ = ()
+
+	def initialize(self, **config):
+		super().initialize(**config)
+		self._inside = True
@@ -14,6 +14,8 @@ class Motion(Component):
 	to be inherited by other components.
 	"""
 
+	__slots__ = ("displacement",)
+
 	def initialize(self, **config):
 		self.displacement = Vector2D.origin
 
@@ -26,6 +28,16 @@ class Motion(Component):
 		"""Update this motion component (Internal)."""
 		pass
 
+	@classmethod
+	def _moveBatch(cls, components):
+		"""
+		Move the bullets of every given component of this type whose bullet
+		asked to move this frame. Used in ECS mode (Internal).
+		"""
+		for component in components:
+			if component.bullet._move_requested:
+				component.moveBullet()
+
 class LinearAccelerator(Motion):
 
 	"""
@@ -34,6 +46,8 @@ class LinearAccelerator(Motion):
 	be altered at run-time.
 	"""
 
+	__slots__ = ("speed", "direction", "_transition_time", "_transition_amount")
+
 	def initialize(self, **config):
 		super().initialize(**config)
 		self.speed = config["initialSpeed"]
@@ -2,5 +2,7 @@ from .arc        import *
 from .common     import *
 from .bezier     import *
 from .core       import *
+from .ellipse    import *
 from .lemniscate import *
-from .linear     import *
\ No newline at end of file
+from .linear     import *
+from .spline     import *
\ No newline at end of file
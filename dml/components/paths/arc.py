@@ -5,13 +5,30 @@ from ...core  import globalSystem
 from ..core import *
 from .core import PathElement
 from .common import *
+from .batch import joinBatch
 
 class ArclikePathElement(AcceleratableElement):
 
 	"""
 	Base class for arc-like PathElements.
+
+	An arc-like PathElement moves along a parametric curve, where the
+	``current_angle`` is the curve parameter. If ``constantSpeed`` is set in
+	the config, the angle is instead treated as a uniform parameter that is
+	mapped through a cached arclength table, so the curve is traversed at
+	constant speed.
+
+	In ECS mode, elements that are not replaying a trajectory are advanced
+	together with the others of their family of curve by an ArclikeBatch
+	(see dml.components.paths.batch).
 	"""
 
+	_CACHE_TRAJECTORY = True
+
+	# The parametric function of the curve. It is called with the arguments
+	# returned by ``_parametricArguments`` followed by the angle.
+	_PARAMETRIC_FUNCTION = None
+
 	def initialize(self, **config):
 		# Parse the config and unpack it.
 		initial_angle, final_angle, duration, speed, repeats = getArcConfig(config)
@@ -31,6 +48,75 @@ class ArclikePathElement(AcceleratableElement):
 		self._transition_time = 0
 		self._transition_amount = 0
 
+		self.constant_speed = config.get("constantSpeed", False)
+		self._arclength_table = None
+
+	def _parametricArguments(self):
+		"""
+		Return the arguments of the parametric function other than the angle (Internal).
+		"""
+		raise NotImplementedError
+
+	def _period(self):
+		"""
+		Return the period of the curve in terms of the angle (Internal).
+		"""
+		return 2*math.pi
+
+	def _getArclengthTable(self):
+		"""
+		Return the arclength table used for constant-speed traversal (Internal).
+		"""
+		if self._arclength_table is None:
+			# Time-based elements only ever cover the angles between the initial and
+			# final angles, so the table only needs to cover those. Otherwise a single
+			# period of the curve is tabulated and extended periodically.
+			if self.duration is not None:
+				t_min = min(self.initial_angle, self.final_angle)
+				t_max = max(self.initial_angle, self.final_angle)
+			else:
+				t_min = self.initial_angle
+				t_max = self.initial_angle + self._period()
+			# Sample more densely for curves with long periods.
+			samples = 512*max(1, math.ceil((t_max - t_min)/(2*math.pi)))
+			self._arclength_table = getArclengthTable(
+				self._PARAMETRIC_FUNCTION, self._parametricArguments(), t_min, t_max, samples)
+		return self._arclength_table
+
+	def _curve(self, angle):
+		"""
+		Evaluate the curve at the given angle (Internal).
+		"""
+		if self.constant_speed:
+			angle = self._getArclengthTable().uniformParameter(angle)
+		return self._PARAMETRIC_FUNCTION(*self._parametricArguments(), angle)
+
+	def updateDisplacement(self):
+		"""
+		Update this PathElement's displacement.
+		"""
+		self.displacement = self._curve(self.current_angle) - self.pivot
+		self.current_angle += self.speed
+
+		# Transition the speed (if necessary)
+		self._transition()
+
+		self._checkDone()
+
+	def _enterBatch(self):
+		# Elements replaying a trajectory or with events left are not batched,
+		# and neither are constant-speed ones, whose arclength tables differ.
+		if (self._frame == 0 or self.done or self._trajectory is not None
+				or self.constant_speed or self._hasEvents()):
+			return None
+		return joinBatch(self)
+
+	def _seekDisplacement(self, frames):
+		if self.duration is not None:
+			return None
+		# The displacement is evaluated before the angle is advanced.
+		return self._curve(self.current_angle + self._travelled(frames - 1)) - self.pivot
+
 	# We have to override setSpeed and transitionToSpeed because we have
 	# to divide the speed by 100 to normalize it. For more information,
 	# see the second comment in getArcConfig.
@@ -38,6 +124,7 @@ class ArclikePathElement(AcceleratableElement):
 	def setSpeed(self, speed):
 		"""Set a new speed."""
 		self._timeBasedError()
+		self._leaveBatch()
 
 		self.speed = speed/100
 		self._transition_time = 0
@@ -45,6 +132,7 @@ class ArclikePathElement(AcceleratableElement):
 	def transitionToSpeed(self, new_speed, time):
 		"""Smoothly transition to a new speed over a given period of time."""
 		self._timeBasedError()
+		self._leaveBatch()
 
 		self._transition_amount = (
 			new_speed/100 - self.speed) / time * globalSystem._timestep
@@ -52,10 +140,9 @@ class ArclikePathElement(AcceleratableElement):
 
 	def _checkDone(self):
 		if self.duration is not None:
-			# If we've completed one iteration.
-			if self.current_angle >= self.final_angle or self.current_angle <= self.initial_angle:
-				self._current_iteration += 1
-				self.speed *= -1
+			self.speed, self._current_iteration = reverseAtArcEnds(
+				self.current_angle, self.speed, self._current_iteration,
+				self.initial_angle, self.final_angle)
 
 			# If we've completed all iterations.
 			if self._current_iteration == self.repeats:
@@ -67,25 +154,18 @@ class ArcPathElement(ArclikePathElement):
 	A PathElement that represents motion in an arc (circle sector).
 	"""
 
+	_PARAMETRIC_FUNCTION = staticmethod(parametricCircle)
+
 	def initialize(self, **config):
 		super().initialize(**config)
 		
 		radius = config["radius"]
 		self.radius = radius
 
-		self.pivot = parametricCircle(radius, self.initial_angle)
+		self.pivot = self._curve(self.initial_angle)
 
-	def updateDisplacement(self):
-		"""
-		Update this PathElement's displacement.
-		"""
-		self.displacement = parametricCircle(self.radius, self.current_angle) - self.pivot
-		self.current_angle += self.speed
-
-		# Transition the speed (if necessary)
-		self._transition()
-
-		self._checkDone()
+	def _parametricArguments(self):
+		return (self.radius,)
 
 
 class EpitrochoidPathElement(ArclikePathElement):
@@ -94,6 +174,8 @@ class EpitrochoidPathElement(ArclikePathElement):
 	A PathElement that represents motion in an epitrochoid sector.
 	"""
 
+	_PARAMETRIC_FUNCTION = staticmethod(parametricEpitrochoid)
+
 	def initialize(self, **config):
 		super().initialize(**config)
 
@@ -101,7 +183,7 @@ class EpitrochoidPathElement(ArclikePathElement):
 		self._r = config["outerRadius"]
 		self._d = config["armRadius"]
 
-		self.pivot = parametricEpitrochoid(self._R, self._r, self._d, self.initial_angle)
+		self.pivot = self._curve(self.initial_angle)
 
 		# This part normalizes the speed relative to the periodicity of the
 		# epitrochoid. An epitrochoid is periodic in 2*ri*pi, where ri is the
@@ -112,19 +194,11 @@ class EpitrochoidPathElement(ArclikePathElement):
 			periodicity = float(self._r).as_integer_ratio()[0]
 			self.speed = arclength / duration * periodicity * globalSystem._timestep
 
+	def _parametricArguments(self):
+		return (self._R, self._r, self._d)
 
-	def updateDisplacement(self):
-		"""
-		Update this PathElement's displacement.
-		"""
-		self.displacement = parametricEpitrochoid(
-			self._R, self._r, self._d, self.current_angle) - self.pivot
-		self.current_angle += self.speed
-
-		# Transition the speed (if necessary)
-		self._transition()
-
-		self._checkDone()
+	def _period(self):
+		return 2*math.pi*float(self._r).as_integer_ratio()[0]
 
 
 class LimaconPathElement(EpitrochoidPathElement):
@@ -158,6 +232,8 @@ class HypotrochoidPathElement(ArclikePathElement):
 	A PathElement that represents motion in a hypotrochoid sector.
 	"""
 
+	_PARAMETRIC_FUNCTION = staticmethod(parametricHypotrochoid)
+
 	def initialize(self, **config):
 		super().initialize(**config)
 
@@ -165,7 +241,7 @@ class HypotrochoidPathElement(ArclikePathElement):
 		self._r = config["innerRadius"]
 		self._d = config["armRadius"]
 
-		self.pivot = parametricHypotrochoid(self._R, self._r, self._d, self.initial_angle)
+		self.pivot = self._curve(self.initial_angle)
 
 		# This part normalizes the speed relative to the periodicity of the
 		# hypotrochoid. A hypotrochoid is periodic in 2*ri*pi, where ri is the
@@ -176,18 +252,11 @@ class HypotrochoidPathElement(ArclikePathElement):
 			periodicity = float(self._r).as_integer_ratio()[0]
 			self.speed = arclength / duration * periodicity * globalSystem._timestep
 
-	def updateDisplacement(self):
-		"""
-		Update this PathElement's displacement.
-		"""
-		self.displacement = parametricHypotrochoid(
-			self._R, self._r, self._d, self.current_angle) - self.pivot
-		self.current_angle += self.speed
-
-		# Transition the speed (if necessary)
-		self._transition()
+	def _parametricArguments(self):
+		return (self._R, self._r, self._d)
 
-		self._checkDone()
+	def _period(self):
+		return 2*math.pi*float(self._r).as_integer_ratio()[0]
 
 
 class HypocycloidPathElement(HypotrochoidPathElement):
@@ -208,24 +277,17 @@ class RosePathElement(ArclikePathElement):
 	A PathElement that represents motion in a rose curve.
 	"""
 
+	_PARAMETRIC_FUNCTION = staticmethod(parametricRose)
+
 	def initialize(self, **config):
 		super().initialize(**config)
 		self.radius = config["radius"]
 		self.petals = config["petals"]
 
-		self.pivot = parametricRose(self.radius, self.petals, self.initial_angle)
-
-	def updateDisplacement(self):
-		"""
-		Update this PathElement's displacement.
-		"""
-		self.displacement = parametricRose(
-			self.radius, self.petals, self.current_angle) - self.pivot
-		self.current_angle += self.speed
-
-		self._transition()
+		self.pivot = self._curve(self.initial_angle)
 
-		self._checkDone()
+	def _parametricArguments(self):
+		return (self.radius, self.petals)
 
 
 class GearPathElement(ArclikePathElement):
@@ -234,23 +296,15 @@ class GearPathElement(ArclikePathElement):
 	A PathElement that represents motion in a gear curve.
 	"""
 
+	_PARAMETRIC_FUNCTION = staticmethod(parametricGear)
+
 	def initialize(self, **config):
 		super().initialize(**config)
 		self.radius = config["radius"]
 		self.gear_teeth  = config["gearTeath"]
 		self.gear_offset = config.get("gearOffset", 10)
 
-		self.pivot = parametricGear(
-			self.radius, self.gear_teeth, self.gear_offset, self.initial_angle)
-
-	def updateDisplacement(self):
-		"""
-		Update this PathElement's displacement.
-		"""
-		self.displacement = parametricGear(
-			self.radius, self.gear_teeth, self.gear_offset, self.current_angle) - self.pivot
-		self.current_angle += self.speed
-
-		self._transition()
+		self.pivot = self._curve(self.initial_angle)
 
-		self._checkDone()
\ No newline at end of file
+	def _parametricArguments(self):
+		return (self.radius, self.gear_teeth, self.gear_offset)
\ No newline at end of file
@@ -0,0 +1,185 @@
+"""
+Batched updating of arc-like PathElements in ECS mode.
+
+Arc-like elements following the same family of curve are advanced together
+by an ArclikeBatch, which holds their state as NumPy arrays and evaluates
+the vectorized version of their parametric function (see
+dml.maths.getVectorizedParametric) for all of them in one step.
+
+While an element is in a batch, the batch holds its angle, speed,
+transition, iteration, local time and displacement, and the element's own
+attributes are left as they were when it joined. Any method that relies on
+or changes that state must call ``_leaveBatch`` first, which writes it
+back.
+
+The batches belong to the system, which prunes them at the end of every
+frame, so elements whose bullets have gone are not kept alive.
+"""
+import numpy
+
+from ...maths import Vector2D, getVectorizedParametric
+from ...core  import globalSystem
+from .common  import reverseAtArcEnds
+
+# The rows of a batch's state array. The arguments of the parametric
+# function follow the fixed rows.
+_ANGLE          = 0
+_SPEED          = 1
+_TIME           = 2
+_AMOUNT         = 3
+_ITERATION      = 4
+_LOCAL_TIME     = 5
+_FRAME          = 6
+_DISPLACEMENT_X = 7
+_DISPLACEMENT_Y = 8
+_TIMED          = 9
+_INITIAL        = 10
+_FINAL          = 11
+_REPEATS        = 12
+_PIVOT_X        = 13
+_PIVOT_Y        = 14
+_ORIGIN_X       = 15
+_ORIGIN_Y       = 16
+_STEPPED        = 17
+_ARGUMENTS      = 18
+
+
+class ArclikeBatch(object):
+
+	"""
+	The state of every batched arc-like element of one family of curve,
+	stored column-wise with one column per element.
+	"""
+
+	def __init__(self, function, arity):
+		self._function = function
+		self._elements = []
+		self._state = numpy.zeros((_ARGUMENTS + arity, 64))
+
+		# The frame elements were last stepped in, and how many were stepped.
+		self._frame = -1
+		self._stepped = 0
+
+	def add(self, element):
+		"""Add an element to this batch, taking over its state."""
+		slot = len(self._elements)
+		if slot == self._state.shape[1]:
+			self._state = numpy.concatenate((self._state, numpy.zeros_like(self._state)), axis=1)
+
+		timed = element.duration is not None
+		self._state[:, slot] = (
+			element.current_angle, element.speed,
+			element._transition_time, element._transition_amount,
+			element._current_iteration, element.local_time, element._frame,
+			element.displacement.x, element.displacement.y, timed,
+			element.initial_angle, element.final_angle if timed else 0, element.repeats,
+			element.pivot.x, element.pivot.y, element.origin.x, element.origin.y,
+			globalSystem.global_frame) + tuple(element._parametricArguments())
+
+		self._elements.append(element)
+		element._batch = self
+		element._batch_slot = slot
+
+	def remove(self, element):
+		"""Remove an element from this batch, writing its state back."""
+		slot = element._batch_slot
+		state = self._state[:_DISPLACEMENT_Y + 1, slot].tolist()
+		if self._state[_STEPPED, slot] == self._frame:
+			self._stepped -= 1
+
+		(element.current_angle, element.speed, element._transition_time,
+			element._transition_amount) = state[:_ITERATION]
+		element._current_iteration = int(state[_ITERATION])
+		element.local_time = state[_LOCAL_TIME]
+		element._frame = int(state[_FRAME])
+		element.displacement = Vector2D(state[_DISPLACEMENT_X], state[_DISPLACEMENT_Y])
+		element._batch = None
+		element._batch_slot = None
+
+		# Fill the hole with the last element.
+		last = self._elements.pop()
+		if last is not element:
+			self._state[:, slot] = self._state[:, len(self._elements)]
+			self._elements[slot] = last
+			last._batch_slot = slot
+
+	def prune(self):
+		"""
+		Remove the elements that were neither stepped nor added in the current
+		frame, such as those of bullets that have been deleted, and return
+		whether any elements are left.
+		"""
+		frame = globalSystem.global_frame
+		if self._frame != frame or self._stepped < len(self._elements):
+			stale = numpy.flatnonzero(self._state[_STEPPED, :len(self._elements)] < frame)
+			for element in [self._elements[slot] for slot in stale.tolist()]:
+				self.remove(element)
+		return bool(self._elements)
+
+	def step(self, elements):
+		"""
+		Update every given element of this batch once, as
+		``PathElement.getDisplacement`` would, and return the lists of the x
+		and y coordinates it would return, and the indices of the elements that
+		finished, which are removed from the batch.
+		"""
+		frame = globalSystem.global_frame
+		if frame != self._frame:
+			self._frame = frame
+			self._stepped = 0
+		self._stepped += len(elements)
+		timestep = globalSystem._timestep
+
+		slots = numpy.fromiter([element._batch_slot for element in elements], numpy.intp, len(elements))
+		state = self._state[:, slots]
+		angle = state[_ANGLE]
+
+		x, y = self._function(*state[_ARGUMENTS:], angle)
+		state[_DISPLACEMENT_X] = x - state[_PIVOT_X]
+		state[_DISPLACEMENT_Y] = y - state[_PIVOT_Y]
+
+		angle += state[_SPEED]
+
+		# Transition the speeds (if necessary).
+		transitioning = state[_TIME] > 1e-9
+		state[_SPEED] += numpy.where(transitioning, state[_AMOUNT], 0)
+		state[_TIME] -= numpy.where(transitioning, timestep, 0)
+
+		# Time-based elements turn back at the ends of their arcs, and are done
+		# once they have completed every iteration.
+		timed = state[_TIMED] != 0
+		# Other elements never turn, as their angle is taken to be NaN.
+		state[_SPEED], state[_ITERATION] = reverseAtArcEnds(
+			numpy.where(timed, angle, numpy.nan), state[_SPEED], state[_ITERATION],
+			state[_INITIAL], state[_FINAL])
+		done = numpy.flatnonzero(timed & (state[_ITERATION] == state[_REPEATS])).tolist()
+
+		state[_LOCAL_TIME] += timestep
+		state[_FRAME] += 1
+		state[_STEPPED] = frame
+		self._state[:, slots] = state
+
+		for i in done:
+			element = elements[i]
+			self.remove(element)
+			element.done = True
+
+		return ((state[_DISPLACEMENT_X] + state[_ORIGIN_X]).tolist(),
+				(state[_DISPLACEMENT_Y] + state[_ORIGIN_Y]).tolist(), done)
+
+
+def joinBatch(element):
+	"""
+	Add an arc-like element to the batch of its family of curve, and return
+	the batch, or None if its parametric function has no vectorized version.
+	"""
+	function = element._PARAMETRIC_FUNCTION
+	batches = globalSystem._path_batches
+	batch = batches.get(function)
+	if batch is None:
+		vectorized = getVectorizedParametric(function)
+		if vectorized is None:
+			return None
+		batch = batches[function] = ArclikeBatch(vectorized, len(element._parametricArguments()))
+	batch.add(element)
+	return batch
@@ -1,10 +1,12 @@
 import warnings
 import math
+import copy
 
 from ...maths import *
 from ..core import *
 from .core import *
 from .common import AcceleratableElement
+from .trajectory import getElementState
 
 
 class _BezierBasePathElement(AcceleratableElement):
@@ -43,6 +45,8 @@ class BezierPathElement(_BezierBasePathElement):
 	A PathElement that represents motion in a bezier curve of variable degree.
 	"""
 
+	_CACHE_TRAJECTORY = True
+
 	def initialize(self, **config):
 		super().initialize(**config)
 		duration = self.duration
@@ -57,6 +61,11 @@ class BezierPathElement(_BezierBasePathElement):
 				speed = config["initialSpeed"]
 		self.speed = speed
 
+	def _seekDisplacement(self, frames):
+		if self.duration is not None:
+			return None
+		return bezier(self.control_polygon, self._time + self._travelled(frames - 1))
+
 	def updateDisplacement(self):
 		"""
 		Update this PathElement's displacement.
@@ -224,6 +233,11 @@ class CompositeBezierPathElement(PathElement):
 		self._origin = origin
 
 	def getDisplacement(self):
+		if self._frame == 0:
+			# The state is copied for seeking, as the RKODE changes in place.
+			self._initial_state = copy.deepcopy(getElementState(self))
+		self._frame += 1
+
 		if self.done:
 			return self._displacement + self._origin
 
@@ -22,6 +22,7 @@ class AcceleratableElement(TimeBasedElement):
 	def stop(self):
 		"""Completely hault all motion."""
 		self._timeBasedError()
+		self._leaveBatch()
 
 		self.speed = 0
 		self._transition_time = 0
@@ -29,6 +30,7 @@ class AcceleratableElement(TimeBasedElement):
 	def setSpeed(self, speed):
 		"""Set a new speed."""
 		self._timeBasedError()
+		self._leaveBatch()
 
 		self.speed = speed
 		self._transition_time = 0
@@ -36,6 +38,7 @@ class AcceleratableElement(TimeBasedElement):
 	def transitionToSpeed(self, new_speed, time):
 		"""Smoothly transition to a new speed over a given period of time."""
 		self._timeBasedError()
+		self._leaveBatch()
 
 		self._transition_amount = (
 			new_speed - self.speed) / time * globalSystem._timestep
@@ -44,8 +47,25 @@ class AcceleratableElement(TimeBasedElement):
 	def reverse(self):
 		"""Reverse the direction of motion."""
 		self._timeBasedError()
+		self._leaveBatch()
 		self.speed *= -1
 
+	def _travelled(self, steps):
+		"""
+		Return the sum of the speeds of the next given number of updates,
+		including any transition in progress (Internal).
+		"""
+		timestep = globalSystem._timestep
+		# The number of updates the transition lasts for.
+		transition_steps = 0
+		remaining = self._transition_time
+		while remaining > 1e-9:
+			remaining -= timestep
+			transition_steps += 1
+		# The speed of the kth update is speed + min(k, transition_steps)*amount.
+		j = min(steps, transition_steps)
+		return steps*self.speed + self._transition_amount*(j*(j - 1)/2 + (steps - j)*transition_steps)
+
 	def _transition(self):
 		"""
 		Update the speed if we are in the middle of transitioning.
@@ -101,4 +121,15 @@ def getArcConfig(config):
 		speed /= 100
 		repeats = 1
 		final_angle = None
-	return initial_angle, final_angle, duration, speed, repeats
\ No newline at end of file
+	return initial_angle, final_angle, duration, speed, repeats
+
+def reverseAtArcEnds(angle, speed, iteration, initial_angle, final_angle):
+	"""
+	Turn time-based arc-like motion back when its angle reaches either end
+	of its arc, counting an iteration each time.
+
+	The return value is a 2-tuple containing the new speed and iteration
+	number. The arguments may be numbers or NumPy arrays of them.
+	"""
+	turned = (angle >= final_angle) | (angle <= initial_angle)
+	return speed*(1 - 2*turned), iteration + turned
\ No newline at end of file
@@ -1,8 +1,19 @@
+import copy
+
 from ...timeline import *
 from ...maths    import Vector2D
 from ...core     import globalSystem
 
 from ..motion import Motion
+from .trajectory import getTrajectory, getCombinedTrajectory, getElementState
+
+def _framesAt(t):
+	"""
+	Return the number of updates a PathElement has had once it has been
+	running for t seconds (Internal).
+	"""
+	return int(t/globalSystem._timestep + 1e-9) + 1
+
 
 class Path(Motion):
 
@@ -11,6 +22,8 @@ class Path(Motion):
 	path of vector-valued functions called PathElements.
 	"""
 
+	__slots__ = ("_elements", "_current_element")
+
 	def initialize(self, **config):
 		super().initialize(**config)
 		self._elements = []
@@ -23,6 +36,24 @@ class Path(Motion):
 		self._elements.append(path_element)
 		path_element.setParent(self)
 
+	def setPathElements(self, path_elements):
+		"""
+		Replace every PathElement of this path with the given ones, starting
+		again from the first of them.
+		"""
+		for element in self._elements:
+			element._leaveBatch()
+		self._elements = []
+		self._current_element = 0
+		for element in path_elements:
+			self.addPathElement(element)
+
+	def _clone(self, bullet):
+		clone = super()._clone(bullet)
+		# PathElements hold their own progress, so each path needs its own copies.
+		clone._elements = copy.deepcopy(self._elements, {id(self) : clone, id(self.bullet) : bullet})
+		return clone
+
 	def getCurrentElement(self):
 		"""
 		Return the current PathElement.
@@ -44,7 +75,40 @@ class Path(Motion):
 		current_element = self._elements[self._current_element]
 		current_element.updateTimeline()
 		self.displacement = current_element.getDisplacement()
-
+		self._checkElementDone(current_element)
+
+	@classmethod
+	def _moveBatch(cls, components):
+		# Elements that can be batched are advanced together by their batches
+		# (see dml.components.paths.batch), and the rest one at a time.
+		batches = {}
+		for component in components:
+			bullet = component.bullet
+			if not bullet._move_requested:
+				continue
+			bullet._current_displacement += component.displacement
+
+			if component._current_element < len(component._elements):
+				element = component._elements[component._current_element]
+				batch = element._batch or element._enterBatch()
+				if batch is not None:
+					paths, elements = batches.setdefault(batch, ([], []))
+					paths.append(component)
+					elements.append(element)
+					continue
+			component._move()
+
+		for batch, (paths, elements) in batches.items():
+			x, y, finished = batch.step(elements)
+			for path, dx, dy in zip(paths, x, y):
+				path.displacement = Vector2D(dx, dy)
+			for i in finished:
+				paths[i]._checkElementDone(elements[i])
+
+	def _checkElementDone(self, current_element):
+		"""
+		Move to the next PathElement if the current one is done (Internal).
+		"""
 		if current_element.done:
 			# Move to the next PathElement if the current one is done and
 			# there are PathElements left in the list.
@@ -52,7 +116,27 @@ class Path(Motion):
 			if self._current_element < len(self._elements):
 				self._elements[self._current_element].setOrigin(
 					self.displacement)
-				self._elements[self._current_element].timeline.begin()
+				self._elements[self._current_element]._beginTimeline()
+
+	def positionAt(self, t):
+		"""
+		Return this path's displacement once it has been moving for t seconds,
+		following its PathElements in turn, computed directly rather than by
+		stepping wherever possible (see PathElement.positionAt).
+		"""
+		frames = _framesAt(t)
+		origin = self._elements[0].origin if self._elements else Vector2D.origin
+		for i, element in enumerate(self._elements):
+			count = element._frameCount()
+			if count is None or frames <= count or i == len(self._elements) - 1:
+				if count is not None:
+					frames = min(frames, count)
+				return element._displacementAfter(frames) + origin
+			# The next element starts the frame after this one is done, from where
+			# this one ended.
+			frames -= count
+			origin = element._displacementAfter(count) + origin
+		return origin
 
 	def isFinished(self):
 		"""
@@ -65,8 +149,17 @@ class PathElement(object):
 
 	"""
 	Base class for all PathElements used by the Path component.
+
+	Elements whose class sets ``_CACHE_TRAJECTORY`` and which have a
+	``duration`` and no timeline events replay a shared, cached trajectory
+	(see dml.components.paths.trajectory) instead of calling
+	``updateDisplacement`` every frame. While replaying, their other state
+	is not advanced, so any method that relies on or changes that state must
+	call ``_leaveReplay`` first.
 	"""
 
+	_CACHE_TRAJECTORY = False
+
 	def __init__(self, **config):
 		# The ``done`` flag tells the Path component that this
 		# PathElement is complete, and it can move on to the next
@@ -82,22 +175,56 @@ class PathElement(object):
 		self.displacement = Vector2D.origin
 		self.initialize(**config)
 
-		self.timeline = Timeline()
+		# Most elements have no events, so their timelines are only created when
+		# first used.
+		self._timeline = None
 
 		self.local_time = 0
 
 		self.parent = None
 
+		# The trajectory being replayed, the number of frames this element has
+		# been updated for, and the state it started in.
+		self._trajectory = None
+		self._frame = 0
+		self._initial_state = None
+
+		# The batch advancing this element in ECS mode, if any, and its slot in
+		# the batch.
+		self._batch = None
+		self._batch_slot = None
+
+		# The CompoundElement this element was flattened into, if any.
+		self._compound = None
+
 	def initialize(self, **config):
 		"""
 		Initialize this PathElement.
 		"""
 		pass
 
+	@property
+	def timeline(self):
+		"""This PathElement's timeline of events, created when first used."""
+		if self._timeline is None:
+			self._timeline = Timeline()
+		return self._timeline
+
+	def _hasEvents(self):
+		"""Return True if this element has timeline events left (Internal)."""
+		return self._timeline is not None and not self._timeline.isEmpty()
+
+	def _beginTimeline(self):
+		"""Begin running this element's timeline, if it has one (Internal)."""
+		if self._timeline is not None:
+			self._timeline.begin()
+
 	def withTimeline(self, *events):
 		"""
 		Add a timeline of events to this PathElement.
 		"""
+		self._leaveReplay()
+		self._leaveBatch()
 		for event in events:
 			self.timeline.addTimestamp(event)
 
@@ -117,16 +244,175 @@ class PathElement(object):
 		"""
 		Return this PathElement's displacement.
 		"""
-		if not self.done:
-			self.updateDisplacement()
+		self._advance()
 		self.local_time += globalSystem._timestep
 		return self.displacement + self.origin
 
+	def _advance(self):
+		"""
+		Update this element's displacement once, unless it is done, without
+		advancing its clock (Internal).
+		"""
+		if self._batch is not None:
+			self._leaveBatch()
+		if not self.done:
+			if self._frame == 0:
+				self._begin()
+
+			if self._trajectory is not None:
+				points = self._trajectory.points
+				self.displacement = points[self._frame]
+				self._frame += 1
+				if self._frame == len(points):
+					self.done = True
+			else:
+				self._frame += 1
+				self.updateDisplacement()
+
+	def _begin(self):
+		"""
+		Remember the state this element starts in, and start replaying a
+		cached trajectory if possible (Internal).
+		"""
+		self._initial_state = getElementState(self)
+		if self._isCacheable() and not self._hasEvents():
+			self._trajectory = getTrajectory(self, self._initial_state)
+
+	def _isCacheable(self):
+		"""Return True if this element's trajectory can be cached (Internal)."""
+		return self._CACHE_TRAJECTORY and getattr(self, "duration", None) is not None
+
+	def _leaveReplay(self):
+		"""
+		Stop replaying a cached trajectory, bringing the rest of the state up
+		to date by stepping from the initial state (Internal).
+		"""
+		if self._compound is not None:
+			# The compound element may be replaying this element's part too.
+			self._compound._leaveReplay()
+		if self._trajectory is None:
+			return
+		frames = self._frame
+		done = self.done
+		self._trajectory = None
+		self.__dict__.update(self._initial_state)
+
+		timestep = globalSystem._timestep
+		for _ in range(frames):
+			self.updateDisplacement()
+			self.local_time += timestep
+		self.done = self.done or done
+
+	def _enterBatch(self):
+		"""
+		Add this element to a batch advancing it along with others of its
+		kind, and return the batch, or None if it cannot be batched (Internal).
+		"""
+		return None
+
+	def _leaveBatch(self):
+		"""
+		Stop being advanced by a batch, bringing this element's state up to
+		date (Internal).
+		"""
+		if self._batch is not None:
+			self._batch.remove(self)
+
+	def positionAt(self, t):
+		"""
+		Return this PathElement's displacement, as returned by
+		``getDisplacement``, once it has been running for t seconds.
+
+		The position is computed directly rather than by stepping wherever
+		possible. It is that of the element from the state it started in (or
+		its current state if it has not started yet), without any timeline
+		events or changes made to it since.
+		"""
+		return self._displacementAfter(_framesAt(t)) + self.origin
+
+	def _startState(self):
+		"""Return the state seeking starts from (Internal)."""
+		if self._initial_state is not None:
+			return self._initial_state
+		return getElementState(self)
+
+	def _startCopy(self):
+		"""Return a copy of this element in the state seeking starts from (Internal)."""
+		element = copy.copy(self)
+		element._batch = None
+		element.__dict__.update(self._startState())
+		# The copy is deep, as some elements change parts of their state in place.
+		# The compound elements of the original are left out of the copy.
+		element = copy.deepcopy(element, {
+			id(self.parent) : self.parent, id(self._timeline) : self._timeline,
+			id(self._compound) : None, id(self) : None})
+		element._trajectory = None
+		element._frame = 0
+		element._initial_state = None
+		element.setOrigin(Vector2D.origin)
+		return element
+
+	def _seekTrajectory(self):
+		"""Return the cached trajectory used for seeking, or None (Internal)."""
+		if self._trajectory is not None:
+			return self._trajectory
+		if self._isCacheable():
+			return getTrajectory(self, self._startState())
+		return None
+
+	def _seekDisplacement(self, frames):
+		"""
+		Return the displacement of this element after the given number of
+		updates in closed form, or None if there is none. Called on an element
+		in the state seeking starts from (Internal).
+		"""
+		return None
+
+	def _displacementAfter(self, frames):
+		"""Return the displacement after the given number of updates (Internal)."""
+		trajectory = self._seekTrajectory()
+		if trajectory is not None:
+			points = trajectory.points
+			return points[min(frames, len(points)) - 1]
+
+		element = self._startCopy()
+		displacement = element._seekDisplacement(frames)
+		if displacement is not None:
+			return displacement
+
+		# There is no closed form, so step a copy instead.
+		element._CACHE_TRAJECTORY = False
+		for _ in range(frames):
+			displacement = element.getDisplacement()
+			if element.done:
+				break
+		return displacement
+
+	def _frameCount(self):
+		"""
+		Return the number of updates until this element is done, or None if it
+		only ends when forced to (Internal).
+		"""
+		if getattr(self, "duration", None) is None:
+			return None
+		trajectory = self._seekTrajectory()
+		if trajectory is not None:
+			return len(trajectory)
+
+		element = self._startCopy()
+		element._CACHE_TRAJECTORY = False
+		frames = 0
+		while not element.done:
+			element.getDisplacement()
+			frames += 1
+		return frames
+
 	def updateTimeline(self):
 		"""
 		Perform the next event in this PathElement's timeline.
 		"""
-		self.timeline.doNext(self.local_time, self)
+		if self._timeline is not None:
+			self._timeline.doNext(self.local_time, self)
 
 	def updateDisplacement(self):
 		"""
@@ -138,6 +424,9 @@ class PathElement(object):
 		"""
 		Force this element to end.
 		"""
+		if self._compound is not None:
+			self._compound._leaveReplay()
+		self._leaveBatch()
 		self.done = True
 
 
@@ -146,23 +435,151 @@ class CompoundElement(PathElement):
 	"""
 	A PathElement that compounds multiple PathElements of different types
 	into a single PathElement.
+
+	Nested CompoundElements are flattened into this one when it is created.
+	They are never advanced themselves, but their timelines are run, and
+	``forceEnd`` and ``setOrigin`` act on their children. Its children share
+	its clock, against which their timelines run, and once a child is done
+	its final displacement is folded into a constant instead of being
+	requested every frame. If every child replays a cached trajectory, the
+	combined trajectory is computed once up front instead.
 	"""
 
 	def __init__(self, *elements):
 		super().__init__()
 		self.elements = elements
 
+		# The flattened children, each with the number of compound elements it
+		# was nested in, and the flattened compound elements themselves.
+		self._children = []
+		self._nested = []
+		self._flatten(elements, 0)
+
+		# The children that are not done, the sum of the final displacements of
+		# those that are, and the update after which the last of those counts
+		# as done.
+		self._active = None
+		self._settled = Vector2D.origin
+		self._finish = 0
+
+	def _flatten(self, elements, depth):
+		"""Add the leaves of a tree of compound elements as children (Internal)."""
+		for element in elements:
+			element._compound = self
+			if isinstance(element, CompoundElement) and not element._hasEvents():
+				self._nested.append(element)
+				self._flatten(element.elements, depth + 1)
+			else:
+				self._children.append((element, depth))
+
+	def _offset(self):
+		"""Return the sum of the origins of the flattened compound elements (Internal)."""
+		offset = Vector2D.origin
+		for element in self._nested:
+			offset += element.origin
+		return offset
+
+	def _begin(self):
+		super()._begin()
+		if not self._hasEvents():
+			self._trajectory = self._combinedTrajectory()
+
+	def _combinedTrajectory(self):
+		"""
+		Return the trajectory of this element if every child replays a cached
+		trajectory, or None (Internal).
+		"""
+		if any(element._hasEvents() for element in self._nested):
+			return None
+		parts = []
+		for element, depth in self._children:
+			if element._hasEvents():
+				return None
+			trajectory = element._seekTrajectory()
+			if trajectory is None:
+				return None
+			parts.append((trajectory, element.origin, depth))
+		if not parts:
+			return None
+		return getCombinedTrajectory(parts, self._offset())
+
 	def updateDisplacement(self):
 		"""
 		Update this PathElement's displacement.
 		"""
+		if self._active is None:
+			for element in self._nested:
+				element._beginTimeline()
+			for element, depth in self._children:
+				element._beginTimeline()
+			self._active = list(self._children)
+			self._settled = self._offset()
+
+		for element in self._nested:
+			if element._timeline is not None:
+				element.local_time = self.local_time
+				element.updateTimeline()
+
+		# Like a nested compound element, this element is done the update after
+		# all of its children are.
+		self.done = not self._active and self._finish < self._frame
+
+		x = self._settled.x
+		y = self._settled.y
+		finished = False
+		for element, depth in self._active:
+			element.local_time = self.local_time
+			element.updateTimeline()
+			element._advance()
+
+			displacement = element.displacement
+			origin = element.origin
+			x += displacement.x + origin.x
+			y += displacement.y + origin.y
+			if element.done:
+				finished = True
+				self._settled += displacement + origin
+				self._finish = max(self._finish, element._frame + depth)
+
+		if finished:
+			self._active = [(element, depth) for element, depth in self._active if not element.done]
+		self.displacement = Vector2D(x, y)
+
+	def forceEnd(self):
+		"""
+		Force this element to end. If it was flattened into another, its
+		children are ended instead.
+		"""
+		super().forceEnd()
+		if self._compound is not None:
+			for element, depth in self._children:
+				element.forceEnd()
+
+	def setOrigin(self, origin):
+		"""
+		Set the origin for this PathElement.
+		"""
+		compound = self._compound
+		if compound is not None:
+			compound._leaveReplay()
+			if compound._active is not None:
+				compound._settled += origin - self.origin
+		self.origin = origin
+
+	def _displacementAfter(self, frames):
+		# Children are updated once for each update of the compound element, even
+		# once they are done.
 		sum = Vector2D.origin
-		self.done = True
 		for element in self.elements:
-			if not element.done:
-				self.done = False
-			sum += element.getDisplacement()
-		self.displacement = sum
+			sum += element.positionAt((frames - 1)*globalSystem._timestep)
+		return sum
+
+	def _frameCount(self):
+		counts = [element._frameCount() for element in self.elements]
+		if None in counts:
+			return None
+		# The compound element is done the update after all of its children are.
+		return max(counts, default=0) + 1
 
 
 class StaticPathElement(PathElement):
@@ -1,6 +1,6 @@
 from ...maths import (
 	parametricEllipse, parametricSuperEllipse, 
-	parametricHippopede, parametricCassini)
+	parametricHippopede, parametricCassiniOval)
 from .arc import ArclikePathElement
 
 class _EllipticPathElement(ArclikePathElement):
@@ -14,20 +14,10 @@ class _EllipticPathElement(ArclikePathElement):
 		self.hradius = config["hradius"]
 		self.vradius = config["vradius"]
 
-		self.pivot = self._PARAMETRIC_FUNCTION(
-			self.hradius, self.vradius, self.initial_angle)
+		self.pivot = self._curve(self.initial_angle)
 
-	def updateDisplacement(self):
-		"""
-		Update this PathElement's displacement.
-		"""
-		self.displacement = self._PARAMETRIC_FUNCTION(
-			self.hradius, self.vradius, self.current_angle) - self.pivot
-		self.current_angle += self.speed
-
-		self._transition()
-
-		self._checkDone()
+	def _parametricArguments(self):
+		return (self.hradius, self.vradius)
 
 class EllipsePathElement(_EllipticPathElement):
 
@@ -35,7 +25,7 @@ class EllipsePathElement(_EllipticPathElement):
 	A PathElement that represents motion in an ellipse.
 	"""
 
-	_PARAMETRIC_FUNCTION = parametricEllipse
+	_PARAMETRIC_FUNCTION = staticmethod(parametricEllipse)
 
 class SuperEllipsePathElement(_EllipticPathElement):
 
@@ -43,24 +33,15 @@ class SuperEllipsePathElement(_EllipticPathElement):
 	A PathElement that represents motion in a super-ellipse.
 	"""
 
+	_PARAMETRIC_FUNCTION = staticmethod(parametricSuperEllipse)
+
 	def initialize(self, **config):
-		super().initialize(**config)
+		# The exponent has to be known before the base class computes the pivot.
 		self.exponent = config["exponent"]
+		super().initialize(**config)
 
-		self.pivot = parametricSuperEllipse(
-			self.hradius, self.vradius, self.exponent, self.current_angle)
-
-	def updateDisplacement(self):
-		"""
-		Update this PathElement's displacement.
-		"""
-		self.displacement = parametricSuperEllipse(
-			self.hradius, self.vradius, self.exponent, self.current_angle) - self.pivot
-		self.current_angle += self.speed
-
-		self._transition()
-
-		self._checkDone()
+	def _parametricArguments(self):
+		return (self.hradius, self.vradius, self.exponent)
 
 
 class HippopedePathElement(_EllipticPathElement):
@@ -69,7 +50,7 @@ class HippopedePathElement(_EllipticPathElement):
 	A PathElement that represents motion in a hippopede.
 	"""
 
-	_PARAMETRIC_FUNCTION = parametricHippopede
+	_PARAMETRIC_FUNCTION = staticmethod(parametricHippopede)
 
 
 class CassiniOvalPathElement(_EllipticPathElement):
@@ -78,4 +59,4 @@ class CassiniOvalPathElement(_EllipticPathElement):
 	A PathElement that represents motion in a Cassini oval.
 	"""
 
-	_PARAMETRIC_FUNCTION = parametricCassini
\ No newline at end of file
+	_PARAMETRIC_FUNCTION = staticmethod(parametricCassiniOval)
\ No newline at end of file
@@ -7,34 +7,29 @@ class _LemniscatePathElement(ArclikePathElement):
 	Base PathElement for lemniscates.
 	"""
 
-	_PARAMETRIC_FUNCTION = None
-
 	def initialize(self, **config):
 		super().initialize(**config)
 		self.radius = config["radius"]
 
-	def updateDisplacement(self):
-		self.displacement = self._PARAMETRIC_FUNCTION(self.radius, self.current_angle)
-		self.current_angle += self.speed
-
-		self._transition()
+		self.pivot = self._curve(self.initial_angle)
 
-		self._checkDone()
+	def _parametricArguments(self):
+		return (self.radius,)
 
-class LemniscateGeronoPathElement(ArclikePathElement):
+class LemniscateGeronoPathElement(_LemniscatePathElement):
 
 	"""
 	A PathElement that represents motion in the shape of the Lemniscate of 
 	Gerono.
 	"""
 
-	_PARAMETRIC_FUNCTION = parametricLGerono
+	_PARAMETRIC_FUNCTION = staticmethod(parametricLGerono)
 
-class LemniscateBernoulliPathElement(ArclikePathElement):
+class LemniscateBernoulliPathElement(_LemniscatePathElement):
 
 	"""
 	A PathElement that represents motion in the shape of the Lemniscate of
 	Bernoulli.
 	"""
 
-	_PARAMETRIC_FUNCTION = parametricLBernoulli
\ No newline at end of file
+	_PARAMETRIC_FUNCTION = staticmethod(parametricLBernoulli)
\ No newline at end of file
@@ -14,6 +14,8 @@ class LinearPathElement(AcceleratableElement):
 	A PathElement that represents linear motion.
 	"""
 
+	_CACHE_TRAJECTORY = True
+
 	def initialize(self, **config):
 		direction = getDirectionOrAngle(config, return_none=True)
 
@@ -79,16 +81,24 @@ class LinearPathElement(AcceleratableElement):
 
 	def rotate(self, amount, radians=True):
 		"""Rotate the direction."""
+		self._leaveReplay()
 		self.direction = self.direction.rotate(amount, radians=radians)
 
 	def changeDirection(self, direction):
 		"""Change the direction."""
+		self._leaveReplay()
 		self.direction = Vector2D(*direction).normalize()
 
 	def takeAim(self):
 		"""Aim directly at the player (the mouse)."""
+		self._leaveReplay()
 		self.direction = (Vector2D(*pygame.mouse.get_pos()) - self.bullet.position).normalize()
 
+	def _seekDisplacement(self, frames):
+		if self.duration is not None:
+			return None
+		return self.displacement + self._travelled(frames)*self.direction
+
 	def updateDisplacement(self):
 		"""
 		Update this PathElement's displacement.
@@ -0,0 +1,81 @@
+import math
+
+from ...maths import *
+from ...core  import globalSystem
+from ..core import *
+from .core import PathElement
+
+
+class SplinePathElement(PathElement):
+
+	"""
+	A PathElement that represents motion along a piecewise-cubic spline over
+	a given duration.
+
+	The curve passes through ``points`` and is given by exactly one of:
+
+	- ``tangents``, the tangent at each point (a cubic Hermite spline);
+	- ``weightPolygon``, the weights of a composite Bezier curve, as used by
+	  CompositeBezierPathElement (``controlPolygon`` may be given instead of
+	  ``points``);
+	- neither, for a Catmull-Rom spline, or a cardinal spline if a
+	  ``tension`` is given.
+
+	Every segment is traversed in the same time. With a ``repeatCount``, the
+	curve is traversed back and forth. The curve is converted to polynomial
+	coefficients once, and the position in each frame is computed from the
+	elapsed time alone, so the cost per frame does not depend on the number
+	of points.
+	"""
+
+	def initialize(self, **config):
+		points = config.get("points", config.get("controlPolygon"))
+		if points is None or len(points) < 2:
+			raise ConfigurationError(
+				"Must have at least 2 points in points.")
+
+		try:
+			if "weightPolygon" in config:
+				spline = CubicSpline.fromCompositeBezier(points, config["weightPolygon"])
+			elif "tangents" in config:
+				spline = CubicSpline.fromHermite(points, config["tangents"])
+			else:
+				spline = CubicSpline.fromCatmullRom(points, config.get("tension", 0))
+		except ValueError as error:
+			raise ConfigurationError(str(error))
+		self.spline = spline
+
+		self.duration = config["duration"]
+		self.repeats = config.get("repeatCount", 1)
+
+		# The parameter advances by this much each frame.
+		self._speed = spline.segments/self.duration * globalSystem._timestep
+		# The number of updates until every repeat is done.
+		self._frames = max(1, math.ceil(self.repeats*spline.segments/self._speed - 1e-9))
+
+	def _parameterAt(self, frame):
+		"""
+		Return the curve parameter in the given update, counting from 1, going
+		back and forth along the curve (Internal).
+		"""
+		segments = self.spline.segments
+		u = (frame - 1)*self._speed
+		iteration = int(u // segments)
+		u -= iteration*segments
+		if iteration % 2:
+			u = segments - u
+		return u
+
+	def updateDisplacement(self):
+		"""
+		Update this PathElement's displacement.
+		"""
+		self.displacement = self.spline(self._parameterAt(self._frame))
+		if self._frame >= self._frames:
+			self.done = True
+
+	def _seekDisplacement(self, frames):
+		return self.spline(self._parameterAt(min(frames, self._frames)))
+
+	def _frameCount(self):
+		return self._frames
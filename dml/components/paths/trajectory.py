@@ -0,0 +1,137 @@
+"""
+A cache of the trajectories of time-based PathElements.
+
+A PathElement with a duration follows a path that is fully determined by
+its state when it starts and the system timestep. Such a path is sampled
+once into a Trajectory, shared by every element starting in the same
+state, which elements then replay a frame at a time instead of
+recomputing it.
+"""
+import copy
+
+import numpy
+
+from ...maths import Vector2D
+from ...utils import LRUCache
+from ...core  import globalSystem
+
+# Trajectories longer than this many frames are not cached.
+_MAX_FRAMES = 10000
+
+# The attributes of a PathElement which are not part of its trajectory's key.
+_UNKEYED = frozenset((
+	"parent", "_timeline", "origin", "_trajectory", "_frame", "_initial_state",
+	"_batch", "_batch_slot", "_compound"))
+
+_TRAJECTORIES = LRUCache(256)
+
+
+class Trajectory(object):
+
+	"""
+	The displacements of a PathElement in every frame until it is done.
+	Trajectories are shared and never changed, so they are not copied.
+	"""
+
+	def __init__(self, points):
+		self.points = points
+
+	def __len__(self):
+		return len(self.points)
+
+	def __copy__(self):
+		return self
+
+	def __deepcopy__(self, memo):
+		return self
+
+
+class _Unkeyable(Exception):
+	pass
+
+def _freeze(value):
+	"""Return a hashable equivalent of an attribute's value (Internal)."""
+	if isinstance(value, Vector2D):
+		return (Vector2D, value.x, value.y)
+	if isinstance(value, (list, tuple)):
+		return tuple([_freeze(item) for item in value])
+	if isinstance(value, dict):
+		return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+	try:
+		hash(value)
+	except TypeError:
+		raise _Unkeyable
+	return value
+
+def getElementState(element):
+	"""Return the attributes that determine an element's trajectory."""
+	return {name : value for name, value in element.__dict__.items() if name not in _UNKEYED}
+
+def _sample(element, state):
+	"""
+	Sample the trajectory of an element starting in the given state, or
+	return False if it is too long (Internal).
+	"""
+	sampler = copy.copy(element)
+	sampler.__dict__.update(state)
+	timestep = globalSystem._timestep
+
+	points = []
+	while not sampler.done:
+		if len(points) == _MAX_FRAMES:
+			return False
+		sampler.updateDisplacement()
+		sampler.local_time += timestep
+		points.append(sampler.displacement)
+	return Trajectory(points)
+
+def getTrajectory(element, state):
+	"""
+	Return the (cached) Trajectory of an element starting in the given
+	state, or None if it cannot be cached.
+	"""
+	try:
+		key = (type(element), globalSystem._timestep, _freeze(state))
+	except _Unkeyable:
+		return None
+	# Elements whose trajectories are too long are cached as False, so that
+	# they are not sampled again.
+	trajectory = _TRAJECTORIES.getOrCreate(key, lambda : _sample(element, state))
+	if trajectory is False:
+		return None
+	return trajectory
+
+def _combine(parts, offset):
+	"""Sample the trajectory of a compound element (Internal)."""
+	# A compound element is done the update after its last child is, and a
+	# flattened child counts as done one update later for each compound
+	# element it was nested in.
+	length = max(len(trajectory) + depth for trajectory, origin, depth in parts) + 1
+	frames = numpy.arange(1, length + 1)
+	x = numpy.full(length, float(offset.x))
+	y = numpy.full(length, float(offset.y))
+	for trajectory, origin, depth in parts:
+		points = trajectory.points
+		# Children stay where they ended once they are done.
+		indices = numpy.minimum(frames, len(points)) - 1
+		x += numpy.array([point.x for point in points])[indices] + origin.x
+		y += numpy.array([point.y for point in points])[indices] + origin.y
+	return Trajectory([Vector2D(*point) for point in zip(x.tolist(), y.tolist())])
+
+def getCombinedTrajectory(parts, offset):
+	"""
+	Return the (cached) Trajectory of a compound element from the
+	trajectories of its children, given as (trajectory, origin, depth)
+	tuples, and the sum of the origins of the compound elements they were
+	flattened from. Returns None if a child's trajectory is empty.
+	"""
+	if not all(len(trajectory) for trajectory, origin, depth in parts):
+		return None
+	# Trajectories are never changed, so they identify themselves.
+	key = (Trajectory, tuple((trajectory, _freeze(origin), depth) for trajectory, origin, depth in parts),
+		_freeze(offset))
+	return _TRAJECTORIES.getOrCreate(key, lambda : _combine(parts, offset))
+
+def clearTrajectoryCache():
+	"""Discard every cached trajectory."""
+	_TRAJECTORIES.clear()
@@ -4,25 +4,50 @@ import math
 from ..maths import Vector2D
 from ..utils import lighten, darken
 from ..core import globalSystem
+from ..rendering import CircleCommand
 from .core import *
 
 
+def _tupleColour(colour):
+	"""
+	Return a colour as a tuple, since the render backends hash draw commands
+	and colours may be given as any sequence (Internal).
+	"""
+	return colour if colour.__class__ is tuple else tuple(colour)
+
+
 class Render(Component):
 	"""Represents anything that can be rendered."""
 
+	__slots__ = ()
+
 	def render(self):
-		"""Render the bullet."""
+		"""Submit this renderer's draw commands to the system's draw list."""
 		raise NotImplementedError()
 
+	@classmethod
+	def _renderBatch(cls, components):
+		"""
+		Render every given component of this type whose bullet asked to be
+		rendered this frame. Used in ECS mode (Internal).
+		"""
+		for component in components:
+			if component.bullet._render_requested:
+				component.render()
+
 
 class Circle(Render):
 	"""Represents a coloured circle."""
 
+	__slots__ = ("radius", "colour", "_orig_radius", "_orig_colour", "layer")
+
 	def initialize(self, **config):
 		self.radius = config["radius"]
 		self.colour = config["colour"]
 		self._orig_radius = self.radius
 		self._orig_colour = self.colour
+		# Circles in higher layers are drawn on top of those in lower ones.
+		self.layer = config.get("layer", 0)
 
 	def scale(self, amount):
 		"""Scale the renderer by the given amount."""
@@ -44,6 +69,11 @@ class Circle(Render):
 		"""Lighten the colour by a given amount."""
 		self.colour = lighten(self.colour, amount)
 
+	def setColour(self, colour):
+		"""Set a new colour, which is also the colour it resets to."""
+		self.colour = colour
+		self._orig_colour = colour
+
 	def resetColour(self):
 		"""Reset the colour."""
 		self.colour = self._orig_colour
@@ -55,20 +85,18 @@ class Circle(Render):
 
 	def render(self, offset=None):
 		if offset is None:
-			offset = Vector2D.origin
+			x, y = self.bullet.position.floor()
 		else:
-			offset = Vector2D(*offset)
-		pygame.draw.circle(
-			globalSystem.screen,
-			self.colour,
-			tuple((self.bullet.position + offset).floor()),
-			self.radius
-		)
+			x, y = (self.bullet.position + Vector2D(*offset)).floor()
+		globalSystem._draw_list.submit(CircleCommand(
+			self.layer, x, y, self.radius, _tupleColour(self.colour), 0, None))
 
 
 class GlowingCircle(Circle):
 	"""Represents a white circle with a coloured glow surrounding it."""
 
+	__slots__ = ("interior_colour", "glow_radius", "_orig_glow_radius", "_orig_interior")
+
 	def initialize(self, **config):
 		super().initialize(**config)
 		self.interior_colour = config.get("interiorColour", (255, 255, 255))
@@ -107,11 +135,9 @@ class GlowingCircle(Circle):
 
 	def render(self, offset=None):
 		if offset is None:
-			offset = Vector2D.origin
+			x, y = self.bullet.position.floor()
 		else:
-			offset = Vector2D(*offset)
-		position = tuple((self.bullet.position - offset).floor())
-		pygame.draw.circle(
-			globalSystem.screen, self.colour, position, self.radius + self.glow_radius)
-		pygame.draw.circle(
-			globalSystem.screen, self.interior_colour, position, self.radius)
\ No newline at end of file
+			x, y = (self.bullet.position - Vector2D(*offset)).floor()
+		globalSystem._draw_list.submit(CircleCommand(
+			self.layer, x, y, self.radius, _tupleColour(self.interior_colour),
+			self.glow_radius, _tupleColour(self.colour)))
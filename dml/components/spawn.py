@@ -2,6 +2,8 @@ import pygame
 import random
 import math
 
+import numpy
+
 from ..utils import mergeDicts
 from ..core  import globalSystem
 from ..maths import *
@@ -9,12 +11,19 @@ from ..maths import *
 from .utils  import *
 from .core   import *
 
+def _checkCount(n):
+	"""Check that a number of bullets to fire is not negative (Internal)."""
+	if n < 0:
+		raise ConfigurationError("Cannot fire a negative number of bullets.")
+
 class LinearShooter(Component):
 
 	"""
 	A component that allows a bullet to fire other bullets linearly.
 	"""
 
+	__slots__ = ("bulletType", "direction", "_extra_config")
+
 	def initialize(self, **config):
 		# The type of bullet to be spawned.
 		self.bulletType = config["bulletType"]
@@ -35,3 +44,56 @@ class LinearShooter(Component):
 		new_bullet = self.bulletType(self.bullet.position, direction=self.direction, **config)
 		return new_bullet
 
+	def fireRing(self, n, **extra_config):
+		"""
+		Spawn n bullets evenly spaced around a full circle, starting at the
+		current direction, and return them.
+		"""
+		_checkCount(n)
+		if n == 0:
+			return []
+		offsets = numpy.arange(n) * (2*math.pi/n)
+		return self._fireAngles(self.direction.angle() + offsets, extra_config)
+
+	def fireSpread(self, n, arc, **extra_config):
+		"""
+		Spawn n bullets evenly spaced across an arc (in radians) centred on the
+		current direction, and return them.
+		"""
+		_checkCount(n)
+		offsets = numpy.linspace(-arc/2, arc/2, n) if n > 1 else numpy.zeros(n)
+		return self._fireAngles(self.direction.angle() + offsets, extra_config)
+
+	def fireVolley(self, directions, **extra_config):
+		"""Spawn one bullet in each of the given directions and return them."""
+		directions = numpy.asarray([tuple(direction) for direction in directions], dtype=float)
+		if not len(directions):
+			return []
+		lengths = numpy.hypot(directions[:, 0], directions[:, 1])
+		if not lengths.all():
+			raise ConfigurationError("Cannot fire in a direction of zero length.")
+		directions /= lengths[:, None]
+		return self.fireDirections(directions, **extra_config)
+
+	def _fireAngles(self, angles, extra_config):
+		"""Spawn one bullet at each of an array of angles (Internal)."""
+		directions = numpy.empty((len(angles), 2))
+		directions[:, 0] = numpy.cos(angles)
+		directions[:, 1] = numpy.sin(angles)
+		return self.fireDirections(directions, **extra_config)
+
+	def fireDirections(self, directions, **extra_config):
+		"""
+		Spawn one bullet along each row of an (n, 2) array of unit vectors, and
+		return them.
+		"""
+		# The configuration is merged once for the whole batch, and the bullets are
+		# added to the system together.
+		config = mergeDicts(self._extra_config, extra_config)
+		bulletType = self.bulletType
+		position = self.bullet.position
+		with globalSystem.batchedSpawning() as bullets:
+			for x, y in directions.tolist():
+				bulletType(position, direction=Vector2D(x, y), **config)
+		return bullets
+
@@ -1,7 +1,29 @@
+import contextlib
+import asyncio
+import inspect
 import pygame
+import enum
 
 from . import utils
 from . import timeline
+from .collision import CollisionWorld
+from .query     import BulletIndex
+from .capture   import FrameCapture
+from .pipeline  import FramePipeline
+from .rendering import DrawList, DirtyRegions, ImmediateBackend, BatchedBackend
+
+# How late a frame of ``runAsync`` may run, in seconds, before the schedule
+# is reset instead of catching up.
+_MAX_LAG = 1
+
+def _settleFuture(future, result, error):
+	"""Set the result of a future, or its exception if one is given (Internal)."""
+	if future.done():
+		return
+	if error is not None:
+		future.set_exception(error)
+	else:
+		future.set_result(result)
 
 
 class DMLSystemError(Exception):
@@ -17,6 +39,25 @@ class _DMLSystem(object, metaclass=utils.SingletonMeta):
 	of the bullet.
 	"""
 
+	class ExecutionMode(enum.Enum):
+		"""
+		An option determining how components are driven each frame.
+
+			PER_BULLET: Every bullet is updated in turn, and its ``update``
+				method moves and renders it through its own components.
+
+			ECS: Bullets' ``update`` methods only run custom logic. Component
+				systems then run over every registered instance of a component
+				type at once, in phase order (see dml.systems). Calls to
+				``move`` and ``render`` in ``update`` only request them, and
+				are carried out by the systems after every ``update`` has run,
+				so code following ``self.move()`` still sees the bullet where
+				it was before this frame's move.
+		"""
+
+		PER_BULLET = 1
+		ECS = 2
+
 	def __init__(self):
 		self._dim = None
 		self._fps = None
@@ -26,13 +67,64 @@ class _DMLSystem(object, metaclass=utils.SingletonMeta):
 		self.global_time = 0
 
 		self._running = False
+		# True from the start of a run until it has finished, even once ``stop``
+		# has been called.
+		self._in_run = False
+		# True while a frame is being simulated, during which bullets are only
+		# added and deleted at the end of the frame.
+		self._stepping = False
+
+		self._execution_mode = _DMLSystem.ExecutionMode.PER_BULLET
+		self._batched = False
+
+		# Every live component, keyed by its exact type. The values are dicts
+		# used as insertion-ordered sets.
+		self._registries = {}
+		self._component_systems = []
+		# The cached (component type, components) batches for each component system.
+		self._system_batches = None
+		# The cached registries of batched automatic components.
+		self._batched_autos = None
+		# The batches advancing arc-like path elements in ECS mode, keyed by
+		# their parametric function (see dml.components.paths.batch).
+		self._path_batches = {}
+
+		self._collisions = CollisionWorld()
+		self._index = BulletIndex()
+		# Incremented whenever a bullet is added or removed, so that the spatial
+		# index, otherwise built once per frame, is rebuilt when it is out of date.
+		self._generation = 0
+
+		# While not None, new bullets are collected here by ``batchedSpawning``.
+		self._spawn_batch = None
 
 		self._bullets = {}
+		# The bullets whose ``update`` is called, which is all of them except
+		# those that only run a keyframe Behaviour.
+		self._scripted = {}
+		# The Behaviours of live bullets, used as an ordered set.
+		self._behaviours = {}
 		self._to_delete = []
 		self._to_add = []
 		self._timeline = timeline.Timeline()
 
 		self.screen = None
+		# Render components submit draw commands here, which are drawn by the
+		# render backend once every bullet has been updated.
+		self._draw_list = DrawList()
+		self._render_backend = ImmediateBackend()
+		# While not None, only the regions drawn this frame and the last are
+		# cleared and updated on the display.
+		self._dirty_regions = None
+		# If True, frames are simulated on a worker thread while the previous
+		# frame is rendered.
+		self._pipelined = False
+		# The prepared draw commands of frames that were simulated ahead by a
+		# FramePipeline but not drawn before it stopped, which are drawn first
+		# when the system next steps.
+		self._surplus = []
+		# The futures of the tasks waiting for the next frame of ``runAsync``.
+		self._frame_waiters = []
 
 	def _checkRunning(self):
 		"""Check if the system is running and throw an error if so."""
@@ -40,6 +132,16 @@ class _DMLSystem(object, metaclass=utils.SingletonMeta):
 			raise DMLSystemError(
 				"Cannot change system components when running.")
 
+	def _checkNotInRun(self):
+		"""Throw an error if a run of the system is in progress (Internal)."""
+		if self._in_run:
+			raise DMLSystemError("The system is already running.")
+
+	def _startRun(self):
+		"""Mark a run of the system as in progress (Internal)."""
+		self._in_run = True
+		self._running = True
+
 	def setDimensions(self, dimensions):
 		"""Set the dimensions of the screen."""
 		self._checkRunning()
@@ -51,6 +153,123 @@ class _DMLSystem(object, metaclass=utils.SingletonMeta):
 		self._fps = integer
 		self._timestep = 1 / self._fps
 
+	def setExecutionMode(self, mode):
+		"""Set the ExecutionMode of the system."""
+		self._checkRunning()
+		self._execution_mode = mode
+		self._batched = mode is _DMLSystem.ExecutionMode.ECS
+
+	def getExecutionMode(self):
+		"""Return the ExecutionMode."""
+		return self._execution_mode
+
+	def setRenderBackend(self, backend):
+		"""Set the RenderBackend that draws each frame (see dml.rendering)."""
+		self._checkRunning()
+		self._render_backend = backend
+
+	def getRenderBackend(self):
+		"""Return the RenderBackend."""
+		return self._render_backend
+
+	def setDrawOrder(self, order):
+		"""Set the DrawList.Order in which each frame's commands are drawn."""
+		self._checkRunning()
+		self._draw_list.order = order
+
+	def setCulling(self, enabled=True):
+		"""Enable or disable dropping draw commands that are entirely offscreen."""
+		self._checkRunning()
+		self._draw_list.cull = enabled
+
+	def setSpriteBatching(self, enabled=True):
+		"""
+		Enable or disable sprite batching. This is a shorthand for setting a
+		BatchedBackend, which draws circles as cached sprites blitted together
+		once per frame, or an ImmediateBackend, which draws with pygame.draw.
+		"""
+		self.setRenderBackend(BatchedBackend() if enabled else ImmediateBackend())
+
+	def setDirtyRendering(self, enabled=True, threshold=0.5):
+		"""
+		Enable or disable dirty-rectangle rendering. When enabled, instead of
+		clearing and updating the whole screen every frame, only the regions
+		covered by this frame's and the last frame's draw commands are. If
+		those cover more than ``threshold`` times the area of the screen, the
+		whole screen is cleared and updated as usual.
+
+		Anything drawn onto the screen outside of the draw list is not
+		tracked.
+		"""
+		self._checkRunning()
+		self._dirty_regions = DirtyRegions(threshold) if enabled else None
+
+	def setPipelining(self, enabled=True):
+		"""
+		Enable or disable pipelining. When enabled, each frame is simulated on
+		a worker thread while the main thread draws and presents the previous
+		one from its prepared draw commands, which overlaps the two when
+		either releases the GIL (such as NumPy and pygame calls, and waiting on
+		the clock). pygame's event handling, drawing and display stay on the
+		main thread, so bullets should not draw onto the screen directly.
+
+		Everything a frame's simulation runs, including bullets' ``update``
+		methods, timeline callbacks and calls to ``pygame.mouse.get_pos`` (as
+		made by ``AimedGatling`` and ``LinearAccelerator.takeAim``), runs on
+		the worker thread, one frame ahead of what is on the screen.
+		"""
+		self._checkRunning()
+		self._pipelined = enabled
+
+	def addComponentSystem(self, system):
+		"""Add a component system, to be run in ECS mode in order of its phase."""
+		self._checkRunning()
+		self._component_systems.append(system)
+		self._component_systems.sort(key=lambda system : system.PHASE)
+		self._system_batches = None
+
+	def getComponents(self, componentType):
+		"""
+		Return every live component registered under the given type (which
+		is the component's exact type unless it sets REGISTRY_TYPE).
+		"""
+		return list(self._registries.get(componentType, ()))
+
+	def addCollisionCheck(self, layer_a, layer_b, callback=None):
+		"""
+		Test the colliders in layer_a against those in layer_b every frame.
+
+		For every hit, the callback (if given) is called with both colliders,
+		followed by each collider's own ``onHit`` callback.
+		"""
+		self._collisions.addCheck(layer_a, layer_b, callback)
+
+	def setQueryCellSize(self, cell_size):
+		"""Set the cell size of the spatial index used by the query methods."""
+		self._index.cell_size = cell_size
+		self._index.invalidate()
+
+	def _getIndex(self):
+		"""Return the spatial index over the live bullets (Internal)."""
+		self._index.refresh(self._bullets.values(), (self.global_frame, self._generation))
+		return self._index
+
+	def bulletsInRadius(self, centre, radius):
+		"""Return a BulletSelection of the bullets within a radius of a centre."""
+		return self._getIndex().inRadius(tuple(centre), radius)
+
+	def bulletsInRect(self, rect):
+		"""
+		Return a BulletSelection of the bullets in a rectangle given as
+		(left, top, width, height).
+		"""
+		left, top, width, height = rect
+		return self._getIndex().inRect(left, top, left + width, top + height)
+
+	def nearestBullets(self, point, k):
+		"""Return a BulletSelection of the k bullets nearest a point, nearest first."""
+		return self._getIndex().nearest(point, k)
+
 	def getDimensions(self):
 		"""Return the dimensions."""
 		return self._dim
@@ -61,17 +280,135 @@ class _DMLSystem(object, metaclass=utils.SingletonMeta):
 
 	def addBullet(self, bullet):
 		"""Add a bullet to the system."""
-		if self._running:
+		if self._spawn_batch is not None:
+			self._spawn_batch.append(bullet)
+		elif self._stepping:
 			self._to_add.append(bullet)
 		else:
-			self._bullets[bullet.name] = bullet
+			self._insertBullet(bullet)
+
+	def addBullets(self, bullets):
+		"""
+		Add a list of bullets to the system, or after the current frame if
+		one is being simulated.
+		"""
+		if self._stepping:
+			self._to_add.extend(bullets)
+		else:
+			for bullet in bullets:
+				self._insertBullet(bullet)
+
+	@contextlib.contextmanager
+	def batchedSpawning(self):
+		"""
+		A context in which newly created bullets are collected rather than
+		added one at a time, and then added together with ``addBullets``
+		when the context exits. The context value is the list of bullets.
+		"""
+		previous = self._spawn_batch
+		batch = self._spawn_batch = []
+		try:
+			yield batch
+		finally:
+			self._spawn_batch = previous
+			self.addBullets(batch)
 
 	def deleteBullet(self, bullet_name):
 		"""Delete a bullet from the system by its name."""
-		if self._running:
+		if self._stepping:
 			self._to_delete.append(bullet_name)
 		else:
-			del self._bullets[bullet_name]
+			self._removeBullet(bullet_name)
+
+	def _insertBullet(self, bullet):
+		"""Insert a bullet and register its components (Internal)."""
+		self._bullets[bullet.name] = bullet
+		bullet._live = True
+		self._generation += 1
+		behaviour = bullet.BEHAVIOUR
+		if behaviour is None or behaviour._add(bullet):
+			self._scripted[bullet.name] = bullet
+		if behaviour is not None:
+			self._behaviours[behaviour] = None
+		for component in bullet._getAllComponents():
+			self._registerComponent(component)
+
+	def _removeBullet(self, bullet_name):
+		"""Remove a bullet and unregister its components (Internal)."""
+		bullet = self._bullets.pop(bullet_name, None)
+		if bullet is None:
+			return
+		bullet._live = False
+		self._generation += 1
+		self._scripted.pop(bullet_name, None)
+		if bullet.BEHAVIOUR is not None:
+			bullet.BEHAVIOUR._remove(bullet)
+		for component in bullet._getAllComponents():
+			self._unregisterComponent(component)
+
+	def _stepBehaviours(self):
+		"""
+		Step every Behaviour, and forget those left with no bullets to run
+		(Internal).
+		"""
+		idle = []
+		for behaviour in self._behaviours:
+			behaviour._step()
+			if behaviour._isIdle():
+				idle.append(behaviour)
+		for behaviour in idle:
+			del self._behaviours[behaviour]
+
+	def _prunePathBatches(self):
+		"""
+		Release the path elements that were not advanced this frame from their
+		batches, and drop the batches left empty (Internal).
+		"""
+		for function, batch in list(self._path_batches.items()):
+			if not batch.prune():
+				del self._path_batches[function]
+
+	def _registerComponent(self, component):
+		"""Add a component to the registry of its type (Internal)."""
+		componentType = component.REGISTRY_TYPE or type(component)
+		registry = self._registries.get(componentType)
+		if registry is None:
+			registry = self._registries[componentType] = {}
+			self._system_batches = None
+			self._batched_autos = None
+		registry[component] = None
+
+	def _unregisterComponent(self, component):
+		"""Remove a component from the registry of its type (Internal)."""
+		self._registries[component.REGISTRY_TYPE or type(component)].pop(component, None)
+
+	def _getSystemBatches(self):
+		"""
+		Return, for each component system, the registries of the component
+		types it accepts (Internal).
+		"""
+		if self._system_batches is None:
+			self._system_batches = [
+				(system, [(componentType, registry)
+					for componentType, registry in self._registries.items()
+					if system.accepts(componentType)])
+				for system in self._component_systems]
+		return self._system_batches
+
+	def _runCollisions(self):
+		"""Run the collision checks over every live collider (Internal)."""
+		# Imported here because the components package depends on this module.
+		from .components.collision import Collider
+		self._collisions.run(self._registries.get(Collider, ()))
+
+	def _getBatchedAutos(self):
+		"""Return the registries of batched automatic components (Internal)."""
+		if self._batched_autos is None:
+			self._batched_autos = [
+				(componentType, registry)
+				for componentType, registry in self._registries.items()
+				if componentType.AUTOMATIC and componentType.BATCHED]
+		return self._batched_autos
 
 	def getBullet(self, bullet_name):
 		"""Retrieve a bullet by its name or None if it doesn't exist."""
@@ -83,6 +420,7 @@ class _DMLSystem(object, metaclass=utils.SingletonMeta):
 
 	def run(self):
 		"""Run the system."""
+		self._checkNotInRun()
 		self._timeline.begin()
 
 		if not self._dim:
@@ -95,44 +433,280 @@ class _DMLSystem(object, metaclass=utils.SingletonMeta):
 		self.screen = pygame.display.set_mode(self._dim)
 		clock = pygame.time.Clock()
 
-		self._running = True
+		self._startRun()
+		pipeline = None
+		try:
+			pipeline = self._startPipeline()
+
+			while self._running:
+
+				if self._dirty_regions is None:
+					self.screen.fill((0, 0, 0))
+				
+				for evt in pygame.event.get():
+					if evt.type == pygame.QUIT:
+						self._running = False
+
+				self._stepFrame(pipeline, self._running)
+
+				if self._dirty_regions is None:
+					pygame.display.update()
+				else:
+					self._dirty_regions.present()
+				clock.tick(self._fps)
+		finally:
+			self._running = False
+			self._in_run = False
+			if pipeline is not None:
+				self._surplus = pipeline.stop()
+			self._failFrameWaiters()
 
-		while self._running:
+		pygame.quit()
 
-			self.screen.fill((0, 0, 0))
-			
-			for evt in pygame.event.get():
-				if evt.type == pygame.QUIT:
-					self._running = False
+	def runOffline(self, frames, writer=None):
+		"""
+		Simulate the given number of frames on an offscreen surface, without
+		a window, events or waiting on the clock, so as fast as possible.
 
-			# Do the next event in the timeline.
-			self._timeline.doNext(self.global_time)
+		If a FrameWriter (see dml.capture) is given, every frame is captured
+		and written with it on a background thread. This returns once every
+		frame has been written.
+		"""
+		self._checkNotInRun()
+		self._timeline.begin()
+
+		if not self._dim:
+			raise DMLSystemError("Dimensions not set.")
+		if not self._fps:
+			raise DMLSystemError("FPS not set.")
+
+		self.screen = pygame.Surface(self._dim)
+		capture = None
+		if writer is not None:
+			capture = FrameCapture(writer)
+			capture.start(self._dim)
+
+		self._startRun()
+		pipeline = None
+		try:
+			pipeline = self._startPipeline(frames > 0)
+			for frame in range(frames):
+				if not self._running:
+					break
+				if self._dirty_regions is None:
+					self.screen.fill((0, 0, 0))
+
+				self._stepFrame(pipeline, frame + 1 < frames)
+
+				if capture is not None:
+					capture.capture(self.screen)
+		finally:
+			self._running = False
+			self._in_run = False
+			if pipeline is not None:
+				self._surplus = pipeline.stop()
+			self._failFrameWaiters()
+			if capture is not None:
+				capture.finish()
+
+	async def runAsync(self, frames=None, callback=None):
+		"""
+		Run the system in the running asyncio event loop, on an offscreen
+		surface, yielding to the loop between frames. Frames are scheduled
+		from when the run started, so time spent simulating and in other tasks
+		does not accumulate as drift. If the loop falls more than a second
+		behind, the schedule is reset rather than caught up.
+
+		The run lasts for the given number of frames, or until ``stop`` is
+		called. If a callback is given, it is called with the system after
+		every frame, and awaited if it returns an awaitable, before the next
+		frame is simulated. Pipelining is not used.
+
+		There is a single system, so only one run, of any kind, can be in
+		progress at once: several systems cannot share one event loop.
+		Starting another run while one is in progress raises a
+		DMLSystemError.
+		"""
+		self._checkNotInRun()
+		self._timeline.begin()
+
+		if not self._dim:
+			raise DMLSystemError("Dimensions not set.")
+		if not self._fps:
+			raise DMLSystemError("FPS not set.")
 
-			# Update the bullets
-			for bullet in self._bullets.values():
+		self.screen = pygame.Surface(self._dim)
+		loop = asyncio.get_running_loop()
+
+		self._startRun()
+		count = 0
+		start = loop.time()
+		try:
+			while self._running and (frames is None or count < frames):
+				if self._dirty_regions is None:
+					self.screen.fill((0, 0, 0))
+
+				self._stepFrame()
+				count += 1
+
+				if callback is not None:
+					result = callback(self)
+					if inspect.isawaitable(result):
+						await result
+
+				delay = start + count*self._timestep - loop.time()
+				if delay < -_MAX_LAG:
+					start -= delay
+				# Even when late, sleeping lets other tasks run.
+				await asyncio.sleep(max(delay, 0))
+		finally:
+			self._running = False
+			self._in_run = False
+			self._failFrameWaiters()
+
+	async def nextFrame(self):
+		"""
+		Wait for the next frame drawn by any of the ways of running the system,
+		and return the global frame after it. Raises a DMLSystemError if the
+		system is not running, or stops before the next frame.
+		"""
+		if not self._running:
+			raise DMLSystemError("The system is not running.")
+		future = asyncio.get_running_loop().create_future()
+		self._frame_waiters.append(future)
+		return await future
+
+	def _resolveFrameWaiters(self, result=None, error=None):
+		"""
+		Give every coroutine waiting in ``nextFrame`` the given result, or
+		the given error, on its own event loop (Internal).
+		"""
+		waiters = self._frame_waiters
+		if not waiters:
+			return
+		self._frame_waiters = []
+		try:
+			current = asyncio.get_running_loop()
+		except RuntimeError:
+			current = None
+		for future in waiters:
+			if future.get_loop() is current:
+				_settleFuture(future, result, error)
+			else:
+				# The system runs outside the waiter's loop (``run`` and
+				# ``runOffline``), possibly on another thread.
+				future.get_loop().call_soon_threadsafe(_settleFuture, future, result, error)
+
+	def _failFrameWaiters(self):
+		"""Fail every coroutine waiting in ``nextFrame`` (Internal)."""
+		self._resolveFrameWaiters(error=DMLSystemError("The system stopped running."))
+
+	def stop(self):
+		"""Stop running the system after the current frame."""
+		self._running = False
+
+	def _startPipeline(self, first=True):
+		"""
+		Return a started FramePipeline if pipelining, or None. The pipeline
+		starts with the frames left over by the last one, or else simulating
+		the first frame if ``first`` is True (Internal).
+		"""
+		if not self._pipelined:
+			return None
+		pipeline = FramePipeline(self._simulateFrame, self._surplus)
+		self._surplus = []
+		pipeline.start()
+		if first and not pipeline.pending():
+			pipeline.request()
+		return pipeline
+
+	def _stepFrame(self, pipeline=None, more=True):
+		"""
+		Simulate and draw a single frame, or draw the next frame simulated by
+		a FramePipeline, having it simulate the one after while this one is
+		drawn if ``more`` frames are to follow (Internal).
+		"""
+		if pipeline is None:
+			commands = self._surplus.pop(0) if self._surplus else self._simulateFrame()
+			# Left over frames were simulated ahead of the one drawn.
+			frame = self.global_frame - len(self._surplus)
+		else:
+			commands = pipeline.next()
+			frame = self.global_frame - pipeline.pending()
+			if more and not pipeline.pending():
+				pipeline.request()
+		self._drawFrame(commands)
+		self._resolveFrameWaiters(frame)
+
+	def _drawFrame(self, commands):
+		"""Draw a frame's prepared draw commands onto the screen (Internal)."""
+		if self._dirty_regions is not None:
+			self._dirty_regions.clear(self.screen, commands)
+		self._render_backend.draw(self.screen, commands)
+
+	def _simulateFrame(self):
+		"""Simulate a single frame and return its prepared draw commands (Internal)."""
+		self._stepping = True
+
+		# Do the next event in the timeline.
+		self._timeline.doNext(self.global_time)
+
+		bullets = self._bullets.values()
+
+		# Update the bullets
+		if self._batched:
+			# Custom per-bullet logic runs first. Calls to ``move`` and ``render``
+			# only mark the bullet, and are carried out by the component systems.
+			for bullet in self._scripted.values():
+				bullet.update()
+			self._stepBehaviours()
+
+			for system, batches in self._getSystemBatches():
+				system.run(batches)
+		else:
+			for bullet in self._scripted.values():
 				bullet._update()
-				if bullet.isDead():
-					self._to_delete.append(bullet.name)
+			self._stepBehaviours()
 
-			# Remove dead bullets
-			for name in self._to_delete:
-				del self._bullets[name]
+			for componentType, components in self._getBatchedAutos():
+				componentType._autoBatch(components)
 
-			# Add new bullets
-			for bullet in self._to_add:
-				self._bullets[bullet.name] = bullet
+		# Clearing replaces the draw list's commands rather than emptying them, so
+		# the prepared commands are left untouched by the following frames.
+		commands = self._draw_list.prepare(self._dim)
+		self._draw_list.clear()
 
-			# Refresh deleted bullet and new bullet lists.
-			self._to_delete = []
-			self._to_add = []
+		if self._collisions.hasChecks():
+			self._runCollisions()
 
-			pygame.display.update()
-			clock.tick(self._fps)
+		timestep = self._timestep
+		for bullet in bullets:
+			bullet._render_requested = False
+			bullet.local_time += timestep
+			if bullet.isDead():
+				self._to_delete.append(bullet.name)
 
-			self.global_frame += 1
-			self.global_time += self._timestep
+		self._stepping = False
 
-		pygame.quit()
+		# Remove dead bullets
+		for name in self._to_delete:
+			self._removeBullet(name)
+
+		# Add new bullets
+		for bullet in self._to_add:
+			self._insertBullet(bullet)
+
+		# Refresh deleted bullet and new bullet lists.
+		self._to_delete = []
+		self._to_add = []
+
+		if self._path_batches:
+			self._prunePathBatches()
+
+		self.global_frame += 1
+		self.global_time += self._timestep
+
+		return commands
 
 
 globalSystem = _DMLSystem()
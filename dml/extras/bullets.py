@@ -2,6 +2,8 @@ import pygame
 import math
 import enum
 
+import numpy
+
 from ..core   import globalSystem
 from ..bullet import *
 from ..maths  import *
@@ -30,6 +32,8 @@ class CircleShot(Bullet):
 	A basic bullet that has a glowing circle component and dies if offscreen.
 	"""
 
+	__slots__ = ()
+
 	CONFIGURATION = {}
 
 	def initialize(self, **config):
@@ -39,6 +43,10 @@ class CircleShot(Bullet):
 			))
 		self.addComponent(DieIfOffscreen(leeway=10))
 
+	def stamp(self, **config):
+		# The radius and colour are fixed by a Prefab's static configuration.
+		pass
+
 	def update(self):
 		"""Update the bullet."""
 		self.render()
@@ -49,11 +57,18 @@ class DirectionalShot(Bullet):
 	A bullet with a required ``direction`` parameter.
 	"""
 
+	__slots__ = ("direction",)
+
 	CONFIGURATION = {}
 
 	def initialize(self, **config):
 		self.direction = _getDirectionOrAngle(config, self.CONFIGURATION)
 
+	def stamp(self, **config):
+		# Bullets stamped without a direction keep the template's.
+		if "direction" in config or "angle" in config:
+			self.direction = _getDirectionOrAngle(config, self.CONFIGURATION)
+
 
 class DirectionalCircleShot(CircleShot):
 
@@ -61,10 +76,17 @@ class DirectionalCircleShot(CircleShot):
 	A circle shot with a direction.
 	"""
 
+	__slots__ = ("direction",)
+
 	def initialize(self, **config):
 		super().initialize(**config)
 		self.direction = getDirectionOrAngle(config)
 
+	def stamp(self, **config):
+		super().stamp(**config)
+		if "direction" in config or "angle" in config:
+			self.direction = getDirectionOrAngle(config)
+
 	def getDirection(self):
 		"""Retrieve this bullet's direction."""
 		return self.direction
@@ -79,12 +101,19 @@ class VelocityShot(DirectionalShot):
 	A bullet with a required ``direction`` and ``speed`` parameter.
 	"""
 
+	__slots__ = ("speed",)
+
 	CONFIGURATION = {}
 
 	def initialize(self, **config):
 		super().initialize(**config)
 		self.speed = _getFromConfig('speed', config, self.CONFIGURATION)
 
+	def stamp(self, **config):
+		super().stamp(**config)
+		if "speed" in config:
+			self.speed = config["speed"]
+
 	def getSpeed(self):
 		"""Retrieve this bullet's speed."""
 		return self.speed
@@ -125,6 +154,10 @@ class GatlingShot(VelocityShot):
 
 	CONFIGURATION = {}
 
+	__slots__ = (
+		"_drawer", "_accelerator", "_strobe_interval", "_strobe_count", "_darken",
+		"_darken_amount", "_lighten_amount", "_retrograde_radius_multiplier", "_strobe_render")
+
 	def initialize(self, **config):
 		super().initialize(**config)
 
@@ -139,6 +172,7 @@ class GatlingShot(VelocityShot):
 		# Having references to components eliminates the time spent retrieving them
 		# in the update method.
 		self._drawer = self.getComponent(GlowingCircle)
+		self._accelerator = self.getComponent(LinearAccelerator)
 
 		render_type = self.CONFIGURATION.get("renderType", GatlingShot.RenderType.NORMAL)
 
@@ -172,6 +206,11 @@ class GatlingShot(VelocityShot):
 		self._strobe_render = render_type is GatlingShot.RenderType.STROBOSCOPIC or \
 							  render_type is GatlingShot.RenderType.DIMINISHING_STROBOSCOPIC
 
+	def stamp(self, **config):
+		super().stamp(**config)
+		self._accelerator.setSpeed(self.speed)
+		self._accelerator.changeDirection(self.direction)
+
 	def update(self):
 		self.move()
 
@@ -207,6 +246,8 @@ class Gatling(Bullet):
 
 	CONFIGURATION = {}
 
+	__slots__ = ("_bullet_type", "angle", "min_angle", "max_angle", "density", "interval", "_sampler")
+
 	def initialize(self, **config):
 		# The type of bullet to spawn.
 		self._bullet_type = _getFromConfig('bulletType', self.CONFIGURATION, config)
@@ -227,8 +268,15 @@ class Gatling(Bullet):
 		# The interval between spawning of each bullet.
 		self.interval = _getFromConfig('spawnInterval', self.CONFIGURATION, config, default=0.01, strict=False)
 
-		# The random distribution function.
-		self._distribution = self.CONFIGURATION.get('distribution', random.uniform)
+		# The random distribution of angular offsets, which is either the name of a
+		# distribution, a Distribution, or a function of the minimum and maximum
+		# angles returning a single offset.
+		distribution = self.CONFIGURATION.get('distribution', random.uniform)
+
+		# Offsets are drawn in blocks from a NumPy generator, seeded with the
+		# optional ``seed`` parameter.
+		seed = _getFromConfig('seed', self.CONFIGURATION, config, strict=False)
+		self._sampler = BlockSampler(distribution, seed=seed, block_size=max(256, self.density))
 
 	def rotate(self, amount, radians=True):
 		"""
@@ -249,12 +297,14 @@ class Gatling(Bullet):
 	def update(self):
 		if self.AtIntervals(self.interval):
 
-			for i in range(self.density):
+			angles = self._sampler.take(self.density, self.min_angle, self.max_angle) \
+				   + (self.angle + math.pi/2)
 
-				direction = Vector2D.fromAngle(self.angle + \
-					self._distribution(self.min_angle, self.max_angle) +\
-					math.pi/2)
-				self._bullet_type(self.position, direction=direction)
+			bullet_type = self._bullet_type
+			position = self.position
+			with globalSystem.batchedSpawning():
+				for x, y in zip(numpy.cos(angles).tolist(), numpy.sin(angles).tolist()):
+					bullet_type(position, direction=Vector2D(x, y))
 
 
 class AimedGatling(Gatling):
@@ -263,6 +313,8 @@ class AimedGatling(Gatling):
 	A gatling that constantly rotates to aim at the player.
 	"""
 
+	__slots__ = ()
+
 	def update(self):
 
 		# Rotate to aim at the mouse.
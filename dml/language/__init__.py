@@ -0,0 +1,9 @@
+"""
+The DML pattern language: a small declarative language for bullet
+patterns, compiled into instruction programs that emitters run a whole
+wave at a time. See dml.language.parser for the syntax.
+"""
+from .errors   import *
+from .parser   import *
+from .compiler import *
+from .runtime  import *
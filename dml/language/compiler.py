@@ -0,0 +1,243 @@
+"""
+The compiler of the DML pattern language, which turns a parsed pattern
+into a Program for each emitter.
+"""
+import math
+
+import numpy
+
+from ..core   import globalSystem
+from ..prefab import Prefab
+from ..maths  import Vector2D
+from ..components import *
+
+from .errors  import PatternError
+from .parser  import parsePattern
+from .program import Program, SPAWN, END
+from .runtime import PatternBullet, PatternEmitter
+
+# The path elements that bullet styles can follow, by name.
+PATH_ELEMENTS = {
+	"line"         : LinearPathElement,
+	"arc"          : ArcPathElement,
+	"ellipse"      : EllipsePathElement,
+	"superellipse" : SuperEllipsePathElement,
+	"hippopede"    : HippopedePathElement,
+	"cassini"      : CassiniOvalPathElement,
+	"epitrochoid"  : EpitrochoidPathElement,
+	"epicycloid"   : EpicycloidPathElement,
+	"limacon"      : LimaconPathElement,
+	"hypotrochoid" : HypotrochoidPathElement,
+	"hypocycloid"  : HypocycloidPathElement,
+	"rose"         : RosePathElement,
+	"gear"         : GearPathElement,
+	"bernoulli"    : LemniscateBernoulliPathElement,
+	"gerono"       : LemniscateGeronoPathElement,
+	"spline"       : SplinePathElement,
+}
+
+_STYLE_OPTIONS = ("colour", "radius", "glow", "layer", "speed", "leeway", "path")
+_WAVE_OPTIONS = ("angle", "arc", "turn", "speed")
+
+
+class BulletStyle(object):
+
+	"""
+	The compiled options of a bullet style. Options prefixed with ``path.``
+	configure the path element, named by ``path``, that bullets of the style
+	follow instead of moving in a straight line.
+	"""
+
+	def __init__(self, name, options, line=None):
+		for key in options:
+			if key not in _STYLE_OPTIONS and not key.startswith("path."):
+				raise PatternError("unknown bullet option %r" % key, line)
+		self.name = name
+		self.colour = options.get("colour", (255, 255, 255))
+		self.radius = options.get("radius", 4)
+		self.glow = options.get("glow", 0)
+		self.layer = options.get("layer", 0)
+		self.speed = options.get("speed", 2)
+		self.leeway = options.get("leeway", 10)
+
+		self.path = options.get("path")
+		self.path_config = {key[5:] : value for key, value in options.items() if key.startswith("path.")}
+		if self.path is not None and self.path not in PATH_ELEMENTS:
+			raise PatternError("unknown path %r" % self.path, line)
+		if self.path is None and self.path_config:
+			raise PatternError("path options given without a path", line)
+		if not (isinstance(self.colour, tuple) and len(self.colour) in (3, 4)
+				and all(isinstance(item, (int, float)) and not isinstance(item, bool) for item in self.colour)):
+			raise PatternError("expected a colour (R, G, B)", line)
+
+		self.line = line
+		self._validated = False
+		# Paths measured in time need the FPS, so without it their configuration
+		# is checked when the pattern is started.
+		if globalSystem.getFPS() is not None:
+			self.validate()
+
+	def validate(self):
+		"""
+		Check the configuration of the path by creating a path element, raising
+		a PatternError if it is invalid.
+		"""
+		if self._validated or self.path is None:
+			return
+		if globalSystem.getFPS() is None:
+			raise PatternError("the FPS must be set before path %r is used" % self.path, self.line)
+		try:
+			self.createPathElement(Vector2D(0, 1), self.speed)
+		except (KeyError, TypeError, ValueError, ConfigurationError) as error:
+			raise PatternError("invalid configuration of path %r: %s" % (self.path, error), self.line)
+		self._validated = True
+
+	def createPathElement(self, direction, speed):
+		"""
+		Return a new path element for a bullet fired in the given direction.
+		Lines are fired along the direction, and arc-like paths start at its
+		angle.
+		"""
+		elementType = PATH_ELEMENTS[self.path]
+		config = dict(self.path_config)
+		if elementType is LinearPathElement:
+			if "direction" not in config and "angle" not in config:
+				config["direction"] = direction
+			if "duration" not in config:
+				config.setdefault("speed", speed)
+		elif issubclass(elementType, ArclikePathElement):
+			config.setdefault("initialAngle", direction.angle())
+			if "duration" not in config and "initialSpeed" not in config:
+				config.setdefault("speed", speed)
+		return elementType(**config)
+
+
+class CompiledEmitter(object):
+
+	"""An emitter's position and the Program it runs."""
+
+	def __init__(self, name, position, program):
+		self.name = name
+		self.position = position
+		self.program = program
+
+
+def _directions(shape, count, angle, arc):
+	"""Return the (count, 2) array of unit vectors of a wave (Internal)."""
+	if shape == "ring":
+		angles = angle + numpy.arange(count)*(2*math.pi/count)
+	elif shape == "spread" and count > 1:
+		angles = angle + numpy.linspace(-arc/2, arc/2, count)
+	else:
+		angles = numpy.full(count, angle)
+	directions = numpy.empty((count, 2))
+	directions[:, 0] = numpy.cos(angles)
+	directions[:, 1] = numpy.sin(angles)
+	return directions
+
+def _compileEmitter(definition, styles):
+	"""Compile an emitter into a CompiledEmitter (Internal)."""
+	if definition.options:
+		raise PatternError("unknown emitter option %r" % next(iter(definition.options)), definition.line)
+
+	# Every instruction as (time, opcode, key, directions, fields), where spawns
+	# with the same key are merged.
+	instructions = []
+	for wave in definition.waves:
+		for key in wave.options:
+			if key not in _WAVE_OPTIONS:
+				raise PatternError("unknown wave option %r" % key, wave.line)
+		if wave.shape == "end":
+			instructions.append((wave.start, END, None, None, None))
+			continue
+		if wave.style not in styles:
+			raise PatternError("unknown bullet style %r" % wave.style, wave.line)
+
+		options = wave.options
+		angle = math.radians(options.get("angle", 90))
+		arc = math.radians(options.get("arc", 0))
+		turn = math.radians(options.get("turn", 0))
+		fields = {"speed" : options["speed"]} if "speed" in options else {}
+		for i in range(wave.times):
+			time = wave.start + i*wave.interval
+			directions = _directions(wave.shape, wave.count, angle + i*turn, arc)
+			instructions.append((time, SPAWN, (wave.style, tuple(sorted(fields.items()))), directions, fields))
+
+	# Sort by time, keeping the order of the source for simultaneous ones.
+	instructions.sort(key=lambda instruction : instruction[0])
+
+	times, opcodes, operands = [], [], []
+	merged = {}
+	for time, opcode, key, directions, fields in instructions:
+		if opcode == SPAWN:
+			index = merged.get((time, key))
+			if index is not None:
+				prefab, previous, fields = operands[index]
+				operands[index] = (prefab, numpy.concatenate((previous, directions)), fields)
+				continue
+			merged[time, key] = len(times)
+			operands.append((key[0], directions, fields))
+		else:
+			operands.append(None)
+		times.append(time)
+		opcodes.append(opcode)
+	return CompiledEmitter(definition.name, definition.position, Program(times, opcodes, operands))
+
+
+class Pattern(object):
+
+	"""
+	A compiled pattern: a Prefab for each bullet style, and the Program of
+	each emitter.
+	"""
+
+	def __init__(self, styles, emitters):
+		self.styles = styles
+		self.emitters = emitters
+		self._prefabs = None
+
+	def start(self, origin=(0, 0)):
+		"""
+		Start the pattern, with emitter positions relative to the given origin,
+		and return the emitters.
+		"""
+		if self._prefabs is None:
+			for style in self.styles.values():
+				style.validate()
+			# Prefabs are built on the first start, as bullets depend on the
+			# system's dimensions.
+			self._prefabs = {name : Prefab(PatternBullet, style=style) for name, style in self.styles.items()}
+		prefabs = self._prefabs
+
+		emitters = []
+		for emitter in self.emitters:
+			program = emitter.program
+			operands = [
+				(prefabs[operand[0]],) + operand[1:] if opcode == SPAWN else operand
+				for opcode, operand in zip(program.opcodes, program.operands)]
+			emitters.append(PatternEmitter(
+				(origin[0] + emitter.position[0], origin[1] + emitter.position[1]),
+				program=Program(program.times, program.opcodes, operands)))
+		return emitters
+
+
+def compilePattern(source):
+	"""
+	Compile the source of a pattern (or a PatternDefinition returned by
+	``parsePattern``) into a Pattern.
+	"""
+	definition = parsePattern(source) if isinstance(source, str) else source
+
+	styles = {}
+	for bullet in definition.bullets:
+		if bullet.name in styles:
+			raise PatternError("bullet style %r defined twice" % bullet.name, bullet.line)
+		styles[bullet.name] = BulletStyle(bullet.name, bullet.options, bullet.line)
+
+	emitters = [_compileEmitter(emitter, styles) for emitter in definition.emitters]
+	return Pattern(styles, emitters)
+
+def loadPattern(path):
+	"""Compile the pattern in the given file."""
+	with open(path) as file:
+		return compilePattern(file.read())
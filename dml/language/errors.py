@@ -0,0 +1,11 @@
+class PatternError(Exception):
+	"""
+	An error in the source of a pattern, with the number of the line it is
+	on (if known).
+	"""
+
+	def __init__(self, message, line=None):
+		if line is not None:
+			message = "line %d: %s" % (line, message)
+		super().__init__(message)
+		self.line = line
@@ -0,0 +1,191 @@
+"""
+The parser of the DML pattern language.
+
+A pattern is a list of bullet styles and emitters. Every line is a
+statement, ``#`` starts a comment, and the waves of an emitter are the
+indented lines following it:
+
+	# Bullet styles: a name followed by options.
+	bullet red colour=(255, 0, 0) radius=4 speed=3
+	bullet orbit colour=(0, 128, 255) radius=3 glow=2 path=arc path.radius=60 path.speed=2
+
+	# Emitters: a name and a position, followed by their waves.
+	emitter boss at (300, 150)
+		at 0.5 ring 24 red
+		at 1 ring 24 red angle=7.5
+		from 2 every 0.1 times 40 ring 6 orbit turn=9
+		at 6 spread 5 red arc=60 angle=90 speed=5
+		at 8 end
+
+A wave is either ``at TIME`` or ``from TIME every INTERVAL times COUNT``,
+followed by a shape (``ring N``, ``spread N`` or ``single``) and the name
+of a bullet style, or by ``end``, which removes the emitter. Angles are in
+degrees, and times in seconds from when the pattern starts.
+"""
+import collections
+import re
+
+from .errors import PatternError
+
+BulletDefinition = collections.namedtuple(
+	"BulletDefinition", ("name", "options", "line"))
+EmitterDefinition = collections.namedtuple(
+	"EmitterDefinition", ("name", "position", "options", "waves", "line"))
+WaveDefinition = collections.namedtuple(
+	"WaveDefinition", ("start", "interval", "times", "shape", "count", "style", "options", "line"))
+PatternDefinition = collections.namedtuple(
+	"PatternDefinition", ("bullets", "emitters"))
+
+# Words, options and tuples, which may contain spaces.
+_TOKEN = re.compile(r"[A-Za-z_][\w.]*=\([^)]*\)|\([^)]*\)|\S+")
+_NAME = re.compile(r"[A-Za-z_]\w*$")
+
+SHAPES = ("ring", "spread", "single")
+
+
+def _parseValue(text, line):
+	"""Parse a number, a tuple of numbers or a name (Internal)."""
+	if text.startswith("("):
+		if not text.endswith(")"):
+			raise PatternError("unterminated tuple %r" % text, line)
+		return tuple(_parseValue(item.strip(), line) for item in text[1:-1].split(",") if item.strip())
+	try:
+		return int(text)
+	except ValueError:
+		pass
+	try:
+		return float(text)
+	except ValueError:
+		pass
+	if text in ("true", "false"):
+		return text == "true"
+	return text
+
+def _parseNumber(text, what, line):
+	"""Parse a number, raising a PatternError if it isn't one (Internal)."""
+	value = _parseValue(text, line)
+	if isinstance(value, bool) or not isinstance(value, (int, float)):
+		raise PatternError("expected a number for %s, got %r" % (what, text), line)
+	return value
+
+def _parseName(text, what, line):
+	"""Check that a token is a name (Internal)."""
+	if not _NAME.match(text):
+		raise PatternError("expected a name for %s, got %r" % (what, text), line)
+	return text
+
+def _splitOptions(tokens, line):
+	"""Split the trailing key=value options off a list of tokens (Internal)."""
+	options = {}
+	while tokens and "=" in tokens[-1]:
+		key, value = tokens.pop().split("=", 1)
+		if not value:
+			raise PatternError("expected a value for option %r" % key, line)
+		if key in options:
+			raise PatternError("option %r given twice" % key, line)
+		options[key] = _parseValue(value, line)
+	for token in tokens:
+		if "=" in token:
+			raise PatternError("options must come last, got %r" % token, line)
+	return tokens, options
+
+def _expect(tokens, word, line):
+	"""Remove the first token, which must be the given word (Internal)."""
+	if not tokens or tokens[0] != word:
+		raise PatternError("expected %r" % word, line)
+	tokens.pop(0)
+
+def _parseWave(tokens, line):
+	"""Parse the tokens of a wave statement (Internal)."""
+	tokens, options = _splitOptions(tokens, line)
+	if not tokens:
+		raise PatternError("expected a wave", line)
+
+	keyword = tokens.pop(0)
+	if keyword == "at":
+		if not tokens:
+			raise PatternError("expected a time after 'at'", line)
+		start = _parseNumber(tokens.pop(0), "the time", line)
+		interval, times = 0, 1
+	elif keyword == "from":
+		if not tokens:
+			raise PatternError("expected a time after 'from'", line)
+		start = _parseNumber(tokens.pop(0), "the time", line)
+		_expect(tokens, "every", line)
+		if not tokens:
+			raise PatternError("expected an interval after 'every'", line)
+		interval = _parseNumber(tokens.pop(0), "the interval", line)
+		_expect(tokens, "times", line)
+		if not tokens:
+			raise PatternError("expected a count after 'times'", line)
+		times = _parseNumber(tokens.pop(0), "the count", line)
+		if interval <= 0 or not isinstance(times, int) or times < 1:
+			raise PatternError("expected a positive interval and count", line)
+	else:
+		raise PatternError("expected 'at' or 'from', got %r" % keyword, line)
+
+	if tokens == ["end"]:
+		if options:
+			raise PatternError("'end' takes no options", line)
+		return WaveDefinition(start, interval, times, "end", 0, None, options, line)
+
+	if not tokens:
+		raise PatternError("expected a shape", line)
+	shape = tokens.pop(0)
+	if shape not in SHAPES:
+		raise PatternError("unknown shape %r" % shape, line)
+	count = 1
+	if shape != "single":
+		if not tokens:
+			raise PatternError("expected a bullet count after %r" % shape, line)
+		count = _parseNumber(tokens.pop(0), "the bullet count", line)
+		if not isinstance(count, int) or count < 1:
+			raise PatternError("expected a positive bullet count", line)
+	if len(tokens) != 1:
+		raise PatternError("expected the name of a bullet style", line)
+	style = _parseName(tokens[0], "the bullet style", line)
+	return WaveDefinition(start, interval, times, shape, count, style, options, line)
+
+def parsePattern(source):
+	"""
+	Parse the source of a pattern into a PatternDefinition, raising a
+	PatternError with the line number of the first error.
+	"""
+	bullets = []
+	emitters = []
+	emitter = None
+
+	for number, text in enumerate(source.splitlines(), 1):
+		indented = text[:1].isspace()
+		text = text.split("#", 1)[0].strip()
+		if not text:
+			continue
+		tokens = _TOKEN.findall(text)
+
+		if indented:
+			if emitter is None:
+				raise PatternError("waves must follow an emitter", number)
+			emitter.waves.append(_parseWave(tokens, number))
+			continue
+
+		keyword = tokens.pop(0)
+		if keyword == "bullet":
+			tokens, options = _splitOptions(tokens, number)
+			if len(tokens) != 1:
+				raise PatternError("expected 'bullet NAME OPTIONS'", number)
+			bullets.append(BulletDefinition(_parseName(tokens[0], "the bullet style", number), options, number))
+			emitter = None
+		elif keyword == "emitter":
+			tokens, options = _splitOptions(tokens, number)
+			if len(tokens) != 3 or tokens[1] != "at":
+				raise PatternError("expected 'emitter NAME at (X, Y) OPTIONS'", number)
+			position = _parseValue(tokens[2], number)
+			if not isinstance(position, tuple) or len(position) != 2:
+				raise PatternError("expected a position (X, Y), got %r" % tokens[2], number)
+			emitter = EmitterDefinition(
+				_parseName(tokens[0], "the emitter", number), position, options, [], number)
+			emitters.append(emitter)
+		else:
+			raise PatternError("expected 'bullet' or 'emitter', got %r" % keyword, number)
+
+	return PatternDefinition(bullets, emitters)
@@ -0,0 +1,37 @@
+"""
+The instruction programs run by pattern emitters.
+"""
+
+# The opcodes of instructions.
+SPAWN = 0
+END   = 1
+
+
+class Program(object):
+
+	"""
+	The instructions of one emitter, sorted by time. Instruction i happens
+	``times[i]`` seconds after the emitter starts, and applies
+	``opcodes[i]`` to ``operands[i]``:
+
+		SPAWN (bullet, directions, fields): spawn a bullet along each row of
+			the (n, 2) array of unit vectors, with the given per-instance
+			fields. The bullet is the name of a bullet style in a compiled
+			program, and its Prefab in the program of a started emitter.
+		END None: remove the emitter.
+
+	Spawns of the same prefab with the same fields at the same time are
+	merged into a single instruction, so whole waves are spawned at once.
+	"""
+
+	def __init__(self, times, opcodes, operands):
+		self.times = times
+		self.opcodes = opcodes
+		self.operands = operands
+
+	def __len__(self):
+		return len(self.times)
+
+	def duration(self):
+		"""Return the time of the last instruction."""
+		return self.times[-1] if self.times else 0
@@ -0,0 +1,99 @@
+"""
+The bullets that run compiled patterns.
+"""
+import bisect
+
+from ..core   import globalSystem
+from ..bullet import Bullet
+from ..maths  import Vector2D
+from ..components import *
+
+from .program import SPAWN, END
+
+
+class PatternBullet(Bullet):
+
+	"""
+	A bullet spawned by a pattern, built from a BulletStyle: a Circle or
+	GlowingCircle, a LinearAccelerator or a Path with a single element, and
+	DieIfOffscreen. It is stamped from a Prefab of its style with a
+	direction and, optionally, a speed.
+	"""
+
+	__slots__ = ("style", "_motion")
+
+	def initialize(self, **config):
+		style = config["style"]
+		self.style = style
+
+		if style.glow:
+			self.addComponent(GlowingCircle(
+				radius=style.radius, colour=style.colour, glowRadius=style.glow, layer=style.layer))
+		else:
+			self.addComponent(Circle(radius=style.radius, colour=style.colour, layer=style.layer))
+		self.addComponent(DieIfOffscreen(leeway=style.leeway))
+
+		direction = Vector2D(*config.get("direction", (0, 1)))
+		speed = config.get("speed", style.speed)
+		if style.path is None:
+			self._motion = LinearAccelerator(initialSpeed=speed, direction=direction)
+			self.addComponent(self._motion)
+		else:
+			self._motion = Path()
+			self.addComponent(self._motion)
+			self._motion.addPathElement(style.createPathElement(direction, speed))
+
+	def stamp(self, **config):
+		direction = Vector2D(*config["direction"])
+		speed = config.get("speed", self.style.speed)
+		if self.style.path is None:
+			self._motion.changeDirection(direction)
+			self._motion.setSpeed(speed)
+		else:
+			self._motion.setPathElements([self.style.createPathElement(direction, speed)])
+
+	def update(self):
+		self.move()
+		self.render()
+
+
+class PatternEmitter(Bullet):
+
+	"""
+	An invisible bullet that runs the Program of an emitter, firing through
+	a LinearShooter. Every frame it performs all of the instructions that
+	have come due at once, and it removes itself after the last one.
+	"""
+
+	__slots__ = ("_program", "_shooter", "_next")
+
+	def initialize(self, **config):
+		self._program = config["program"]
+		# The bullet type is set by each spawn instruction.
+		self._shooter = LinearShooter(bulletType=None, direction=(0, 1))
+		self.addComponent(self._shooter)
+		# The index of the next instruction.
+		self._next = 0
+
+	def update(self):
+		program = self._program
+		start = self._next
+		# Small tolerances keep instructions at multiples of the timestep from
+		# slipping a frame.
+		end = bisect.bisect_right(program.times, self.local_time + 1e-9, start)
+		self._next = end
+
+		shooter = self._shooter
+		opcodes = program.opcodes
+		operands = program.operands
+		for i in range(start, end):
+			if opcodes[i] == SPAWN:
+				prefab, directions, fields = operands[i]
+				shooter.bulletType = prefab
+				shooter.fireDirections(directions, **fields)
+			elif opcodes[i] == END:
+				self.kill()
+				return
+
+		if end == len(program):
+			self.kill()
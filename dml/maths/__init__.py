@@ -5,4 +5,7 @@ from .misc          import *
 from .newton        import *
 from .parametric    import *
 from .reparametrize import *
-from .rkode         import *
\ No newline at end of file
+from .rkode         import *
+from .sampling      import *
+from .spatial       import *
+from .spline        import *
\ No newline at end of file
@@ -1,16 +1,116 @@
+import numpy
 import scipy.special
 
-airyAi = lambda t : scipy.special.airy(t)[0]
-airyBi = lambda t : scipy.special.airy(t)[2]
+class _CachedEvaluator(object):
+	"""
+	Wraps a special function that computes several outputs at once (such as
+	``scipy.special.airy``) and caches the most recent batch of outputs.
 
-airyAiDerivative = lambda t : scipy.special.airy(t)[1]
-airyBiDerivative = lambda t : scipy.special.airy(t)[3]
+	Asking for any one of the outputs computes all of them, so asking for
+	another output at the same input afterwards costs only a comparison.
+	Both scalars and NumPy arrays are accepted.
+	"""
 
-airyAiExp = lambda t : scipy.special.airye(t)[0]
-airyBiExp = lambda t : scipy.special.airye(t)[2]
+	def __init__(self, function):
+		self._function = function
+		self._last_input = None
+		self._last_output = None
 
-airyAiExpDerivative = lambda t : scipy.special.airye(t)[1]
-airyBiExpDerivative = lambda t : scipy.special.airye(t)[3]
+	def evaluate(self, t):
+		"""Evaluate all the outputs at the given input (or array of inputs)."""
+		last = self._last_input
+		if last is not None:
+			if numpy.ndim(t) == 0:
+				if numpy.ndim(last) == 0 and t == last:
+					return self._last_output
+			elif numpy.shape(t) == numpy.shape(last) and numpy.array_equal(t, last):
+				return self._last_output
+
+		# Copy arrays so that mutating the input afterwards can't corrupt the cache.
+		self._last_input = t if numpy.ndim(t) == 0 else numpy.array(t, dtype=float)
+		outputs = self._function(t)
+		# The cached outputs are shared by every caller, so they are read-only.
+		for output in outputs:
+			if isinstance(output, numpy.ndarray):
+				output.flags.writeable = False
+		self._last_output = outputs
+		return outputs
+
+	def output(self, index):
+		"""
+		Return a function evaluating only the output at the given index. Arrays
+		it returns are copies, which the caller may change.
+		"""
+		def evaluate(t):
+			output = self.evaluate(t)[index]
+			return output.copy() if isinstance(output, numpy.ndarray) else output
+		return evaluate
+
+
+class TabulatedFunction(object):
+	"""
+	A function precomputed on a fixed domain and evaluated by linear
+	interpolation.
+
+	Inputs outside of the domain are evaluated with the original function.
+	The table is checked against the original function at the midpoints
+	between its samples, where linear interpolation is least accurate, and
+	the largest difference is kept as ``error``. If a ``tolerance`` is
+	given and the error exceeds it, a ValueError is raised.
+	"""
+
+	def __init__(self, function, t_min, t_max, samples=1024, tolerance=None):
+		self.function = function
+		self.t_min = t_min
+		self.t_max = t_max
+		self._ts = numpy.linspace(t_min, t_max, samples)
+		self._values = numpy.array(function(self._ts), dtype=float)
+		# The table is shared by every call, so it is read-only.
+		self._ts.flags.writeable = False
+		self._values.flags.writeable = False
+
+		midpoints = (self._ts[:-1] + self._ts[1:])/2
+		exact = numpy.asarray(function(midpoints), dtype=float)
+		self.error = float(numpy.max(numpy.abs(self(midpoints) - exact), initial=0))
+		if tolerance is not None and self.error > tolerance:
+			raise ValueError(
+				"Table of %d samples is off by %g, more than the tolerance of %g." % (
+					samples, self.error, tolerance))
+
+	def __call__(self, t):
+		t = numpy.asarray(t, dtype=float)
+		# numpy.interp returns a new array, so callers may change the result.
+		result = numpy.interp(t, self._ts, self._values)
+		outside = (t < self.t_min) | (t > self.t_max)
+		if numpy.any(outside):
+			if result.ndim == 0:
+				return float(self.function(t))
+			result[outside] = self.function(t[outside])
+		return result if result.ndim else float(result)
+
+
+def tabulate(function, t_min, t_max, samples=1024, tolerance=None):
+	"""
+	Precompute the given (vectorized) function over a fixed domain into an
+	interpolation table.
+	"""
+	return TabulatedFunction(function, t_min, t_max, samples, tolerance)
+
+
+_airy  = _CachedEvaluator(scipy.special.airy)
+_airye = _CachedEvaluator(scipy.special.airye)
+
+airyAi = _airy.output(0)
+airyBi = _airy.output(2)
+
+airyAiDerivative = _airy.output(1)
+airyBiDerivative = _airy.output(3)
+
+airyAiExp = _airye.output(0)
+airyBiExp = _airye.output(2)
+
+airyAiExpDerivative = _airye.output(1)
+airyBiExpDerivative = _airye.output(3)
 
 ellipticComplete1 = scipy.special.ellipk
 ellipticComplete2 = scipy.special.ellipe
@@ -18,12 +118,14 @@ ellipticComplete2 = scipy.special.ellipe
 ellipticIncomplete1 = scipy.special.ellipkinc
 ellipticIncomplete2 = scipy.special.ellipeinc
 
+# Bessel functions are NumPy ufuncs, so they already accept arrays natively.
+# SciPy names the exponentially scaled variants *ve (there are no *ne functions).
 besselJ = scipy.special.jn
 besselY = scipy.special.yn
 besselK = scipy.special.kn
 besselI = scipy.special.iv
 
-besselJExp = scipy.special.jne
-besselYExp = scipy.special.yne
-besselKExp = scipy.special.kne
-besselIExp = scipy.special.ive
\ No newline at end of file
+besselJExp = scipy.special.jve
+besselYExp = scipy.special.yve
+besselKExp = scipy.special.kve
+besselIExp = scipy.special.ive
@@ -5,6 +5,8 @@ class Vector2D(object):
 	A vector in 2-dimensional space.
 	"""
 
+	__slots__ = ("x", "y")
+
 	def __init__(self, x, y=None):
 		if y is None:
 			x, y = x
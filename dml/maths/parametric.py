@@ -1,5 +1,7 @@
 import math
 
+import numpy
+
 from .geometry import Vector2D
 from .misc import sgn
 
@@ -84,7 +86,7 @@ def parametricGear(radius, n, b, time):
 	Calculate a point on a parametric Gear curve with the given radius,
 	number of teeth, and tooth depth / gear offset at the given time.
 	"""
-	r = 1 + 1/b*math.tanh(b*math.sin(n*time))
+	r = radius*(1 + 1/b*math.tanh(b*math.sin(n*time)))
 	return r * Vector2D(math.cos(time), math.sin(time))
 
 def parametricLGerono(radius, time):
@@ -92,12 +94,83 @@ def parametricLGerono(radius, time):
 	Calculate a point on a parametric Lemniscate of Gerono with the given 
 	radius at the given time.
 	"""
-	return Vector2D(math.cos(time), math.sin(2*time)/2)
+	return radius * Vector2D(math.cos(time), math.sin(2*time)/2)
 
 def parametricLBernoulli(radius, time):
 	"""
 	Calculate a point on a parametric Lemniscate of Bernoulli with the given
 	radius at the given time.
 	"""
-	A = a*math.sqrt(2)*math.cos(time)/(math.sin(time)**2 + 1)
-	return Vector2D(A, A*math.sin(time))
\ No newline at end of file
+	A = radius*math.sqrt(2)*math.cos(time)/(math.sin(time)**2 + 1)
+	return Vector2D(A, A*math.sin(time))
+
+# Vectorized versions of the parametric functions above, which take arrays
+# of arguments and return the arrays of x and y coordinates.
+
+def _circleArrays(radius, time):
+	return radius*numpy.cos(time), radius*numpy.sin(time)
+
+def _ellipseArrays(hradius, vradius, time):
+	return hradius*numpy.cos(time), vradius*numpy.sin(time)
+
+def _superEllipseArrays(hradius, vradius, exponent, time):
+	n = 2/exponent
+	cos_time = numpy.cos(time)
+	sin_time = numpy.sin(time)
+	return (numpy.abs(cos_time)**n*hradius*numpy.where(cos_time < 0, -1, 1),
+			numpy.abs(sin_time)**n*vradius*numpy.where(sin_time < 0, -1, 1))
+
+def _polarArrays(r, time):
+	return r*numpy.cos(time), r*numpy.sin(time)
+
+def _hippopedeArrays(hradius, vradius, time):
+	return _polarArrays(numpy.sqrt(hradius + (vradius - hradius)*numpy.sin(time)**2), time)
+
+def _cassiniOvalArrays(hradius, vradius, time):
+	c = numpy.cos(2*time)
+	return _polarArrays(numpy.sqrt(hradius**2*c + numpy.sqrt(hradius**4*(c**2 - 1) + vradius**4)), time)
+
+def _epitrochoidArrays(R, r, d, time):
+	A = R + r
+	B = A/r
+	return A*numpy.cos(time) - d*numpy.cos(B*time), A*numpy.sin(time) - d*numpy.sin(B*time)
+
+def _hypotrochoidArrays(R, r, d, time):
+	A = R - r
+	B = A/r
+	return A*numpy.cos(time) + d*numpy.cos(B*time), A*numpy.sin(time) - d*numpy.sin(B*time)
+
+def _roseArrays(radius, k, time):
+	return _polarArrays(numpy.cos(k*time)*radius, time)
+
+def _gearArrays(radius, n, b, time):
+	return _polarArrays(radius*(1 + 1/b*numpy.tanh(b*numpy.sin(n*time))), time)
+
+def _lGeronoArrays(radius, time):
+	return radius*numpy.cos(time), radius*numpy.sin(2*time)/2
+
+def _lBernoulliArrays(radius, time):
+	A = radius*math.sqrt(2)*numpy.cos(time)/(numpy.sin(time)**2 + 1)
+	return A, A*numpy.sin(time)
+
+_VECTORIZED = {
+	parametricCircle       : _circleArrays,
+	parametricEllipse      : _ellipseArrays,
+	parametricSuperEllipse : _superEllipseArrays,
+	parametricHippopede    : _hippopedeArrays,
+	parametricCassiniOval  : _cassiniOvalArrays,
+	parametricEpitrochoid  : _epitrochoidArrays,
+	parametricHypotrochoid : _hypotrochoidArrays,
+	parametricRose         : _roseArrays,
+	parametricGear         : _gearArrays,
+	parametricLGerono      : _lGeronoArrays,
+	parametricLBernoulli   : _lBernoulliArrays,
+}
+
+def getVectorizedParametric(function):
+	"""
+	Return the vectorized version of one of the parametric functions above,
+	or None if it has none. It takes arrays of the same arguments and
+	returns a pair of arrays of x and y coordinates.
+	"""
+	return _VECTORIZED.get(function)
@@ -2,8 +2,14 @@
 This file includes a set of functions and classes that aid in
 reparametrizing parametric curves.
 """
+import bisect
+import math
+
+import numpy
 import scipy.integrate
 
+from ..utils import LRUCache
+from .gquad import gaussianQuadrature
 from .newton import approximateInverse
 from .rkode import RKODE
 
@@ -11,21 +17,115 @@ def normalizeArclengthParametrization(parametrization, derivative, t_min, t_max)
 	"""
 	Normalize an arclength parametrization of a curve.
 	"""
-	arclength = scipy.integrate(lambda t : derivative(t).magnitude(), t_min, t_max)
-	return lambda t : arclength * parametrization
+	arclength = scipy.integrate.quad(lambda t : derivative(t).magnitude(), t_min, t_max)[0]
+	return lambda t : arclength * parametrization(t)
 
 class ArclengthReparametrizer(RKODE):
 
 	"""
-	An RKODE that reparaemtrizes a 2-dimensional parametric curve with an
-	arclenght parametrization.
+	An RKODE that reparametrizes a 2-dimensional parametric curve with an
+	arclength parametrization.
+
+	Each step advances the distance travelled along the curve by ``step_size``
+	and solves dt/ds = 1/|c'(t)| for the new curve parameter.
 	"""
 
-	def __init__(self, curve, derivative, reparametrization, step_size):
-		initial_distance = reparametrization(0)
+	def __init__(self, curve, derivative, step_size, initial_distance=0, t_min=0):
+		speed = lambda t : derivative(t).magnitude()
 		# To find the initial time value we have to use a different method of approximating
 		# the inverse of the arclength function. Otherwise we would have to use another RKODE,
 		# which would be infinite recursion.
-		initial_time = approximateInverse(lambda t : t)
-		super().__init__(lambda y, t : 1/derivative(y).magnitude(), step_size, initial_distance)
-		self._reparam = reparametrization
+		initial_time = t_min
+		if initial_distance:
+			initial_time = approximateInverse(
+				lambda t : gaussianQuadrature(speed, t_min, t), speed, initial_distance)
+		super().__init__(lambda s, t : 1/speed(t), step_size, initial_distance, initial_time)
+		self._curve = curve
+
+	def getNextPoint(self):
+		"""Step along the curve and return the new point on it."""
+		return self._curve(self.getNext())
+
+
+class ArclengthTable(object):
+
+	"""
+	A cumulative arclength table of a parametric curve over [t_min, t_max].
+
+	The table is inverted by interpolation, which gives constant-speed
+	traversal of the curve at the cost of a lookup.
+	"""
+
+	def __init__(self, curve, t_min, t_max, samples=512):
+		ts = numpy.linspace(t_min, t_max, samples)
+		points = numpy.array([tuple(curve(t)) for t in ts], dtype=float)
+		segments = numpy.hypot(*numpy.diff(points, axis=0).T)
+		distances = numpy.concatenate(([0.0], numpy.cumsum(segments)))
+
+		self.t_min = t_min
+		self.t_max = t_max
+		self.length = float(distances[-1])
+
+		self._ts = ts
+		self._distances = distances
+		# Plain lists make scalar lookups much cheaper than going through NumPy.
+		self._ts_list = ts.tolist()
+		self._distances_list = distances.tolist()
+
+	# Tables are shared and never changed, so they are not copied.
+	def __copy__(self):
+		return self
+
+	def __deepcopy__(self, memo):
+		return self
+
+	def distanceAt(self, t):
+		"""Return the arclength from t_min to the given parameter."""
+		return numpy.interp(t, self._ts, self._distances)
+
+	def parameterAt(self, distance):
+		"""
+		Return the curve parameter at the given arclength. Accepts scalars
+		or arrays.
+		"""
+		if numpy.ndim(distance):
+			return numpy.interp(distance, self._distances, self._ts)
+
+		distances = self._distances_list
+		i = bisect.bisect_right(distances, distance)
+		if i <= 0:
+			return self.t_min
+		if i >= len(distances):
+			return self.t_max
+		d0 = distances[i - 1]
+		d1 = distances[i]
+		t0 = self._ts_list[i - 1]
+		if d1 == d0:
+			return t0
+		return t0 + (distance - d0)/(d1 - d0)*(self._ts_list[i] - t0)
+
+	def uniformParameter(self, u):
+		"""
+		Map a uniformly advancing parameter in [t_min, t_max] to the curve
+		parameter at the same fraction of the arclength, so that stepping
+		``u`` at a fixed rate traverses the curve at constant speed. Outside
+		of the domain the mapping is extended periodically.
+		"""
+		span = self.t_max - self.t_min
+		if self.length == 0 or span == 0:
+			return u
+		periods = math.floor((u - self.t_min)/span)
+		u -= periods*span
+		return periods*span + self.parameterAt((u - self.t_min)/span*self.length)
+
+
+_ARCLENGTH_TABLES = LRUCache(256)
+
+def getArclengthTable(function, arguments, t_min, t_max, samples=512):
+	"""
+	Return the (cached) ArclengthTable of the curve ``function(*arguments, t)``
+	over [t_min, t_max], such as one of the functions in dml.maths.parametric.
+	"""
+	key = (function, tuple(arguments), t_min, t_max, samples)
+	return _ARCLENGTH_TABLES.getOrCreate(key, lambda : ArclengthTable(
+		lambda t : function(*arguments, t), t_min, t_max, samples))
@@ -4,7 +4,6 @@ class RKODE(object):
 	"""
 
 	def __init__(self, function, step_size, initial_t, initial_y):
-		print("RKODE __init__ sent : ", function, step_size, initial_t, initial_y)
 		self.step_size = step_size
 		self._tn = initial_t
 		self._yn = initial_y
@@ -0,0 +1,193 @@
+"""
+Random distributions over an interval [low, high], sampled in blocks from a
+seeded NumPy generator.
+
+Every distribution has an interval of its own, [0, 1] unless given, which
+is sampled when no other interval is passed to ``sample``.
+"""
+import random
+
+import numpy
+
+class Distribution(object):
+
+	"""
+	Base class for random distributions over an interval.
+	"""
+
+	def __init__(self, low=0, high=1):
+		self.low = low
+		self.high = high
+
+	def sample(self, count, generator, low=None, high=None):
+		"""
+		Return an array of ``count`` samples in [low, high] (by default, the
+		distribution's own interval) drawn with the given
+		numpy.random.Generator.
+		"""
+		if low is None:
+			low = self.low
+		if high is None:
+			high = self.high
+		return self._sample(count, generator, low, high)
+
+	def _sample(self, count, generator, low, high):
+		"""Return an array of count samples in [low, high] (Internal)."""
+		raise NotImplementedError
+
+
+class Uniform(Distribution):
+
+	"""
+	The uniform distribution over [low, high].
+	"""
+
+	def _sample(self, count, generator, low, high):
+		return generator.uniform(low, high, count)
+
+
+class Normal(Distribution):
+
+	"""
+	The normal distribution centred on the middle of [low, high].
+
+	``deviations`` is the number of standard deviations between the centre
+	and either end of the interval. Samples are not confined to the interval.
+	"""
+
+	def __init__(self, deviations=3, low=0, high=1):
+		Distribution.__init__(self, low, high)
+		self.deviations = deviations
+
+	def _parameters(self, low, high):
+		"""Return the mean and standard deviation (Internal)."""
+		return (low + high)/2, (high - low)/2/self.deviations
+
+	def _sample(self, count, generator, low, high):
+		mean, deviation = self._parameters(low, high)
+		return generator.normal(mean, deviation, count)
+
+
+class TruncatedNormal(Normal):
+
+	"""
+	A normal distribution as in ``Normal``, with samples outside of [low, high]
+	rejected.
+	"""
+
+	def _sample(self, count, generator, low, high):
+		mean, deviation = self._parameters(low, high)
+		samples = generator.normal(mean, deviation, count)
+		# Redraw every rejected sample at once until none are left.
+		rejected = numpy.flatnonzero((samples < low) | (samples > high))
+		while len(rejected):
+			samples[rejected] = generator.normal(mean, deviation, len(rejected))
+			rejected = rejected[(samples[rejected] < low) | (samples[rejected] > high)]
+		return samples
+
+
+class Beta(Distribution):
+
+	"""
+	The beta distribution with shape parameters ``a`` and ``b``, scaled to
+	[low, high].
+	"""
+
+	def __init__(self, a=2, b=2, low=0, high=1):
+		Distribution.__init__(self, low, high)
+		self.a = a
+		self.b = b
+
+	def _sample(self, count, generator, low, high):
+		return low + (high - low)*generator.beta(self.a, self.b, count)
+
+
+class CallableDistribution(Distribution):
+
+	"""
+	A distribution given by a Python function ``function(low, high)`` that
+	returns a single sample, such as ``random.uniform``. Sampling calls the
+	function once per sample and ignores the generator.
+	"""
+
+	def __init__(self, function, low=0, high=1):
+		Distribution.__init__(self, low, high)
+		self.function = function
+
+	def _sample(self, count, generator, low, high):
+		function = self.function
+		return numpy.fromiter((function(low, high) for _ in range(count)), float, count)
+
+
+class Choice(Distribution):
+
+	"""
+	A value chosen uniformly at random from a sequence of values, which
+	need not be numbers. The interval is ignored.
+	"""
+
+	def __init__(self, values):
+		Distribution.__init__(self)
+		self.values = numpy.empty(len(values), object)
+		self.values[:] = list(values)
+
+	def _sample(self, count, generator, low, high):
+		return self.values[generator.integers(len(self.values), size=count)]
+
+
+_NAMED_DISTRIBUTIONS = {
+	"uniform"         : Uniform,
+	"normal"          : Normal,
+	"truncatedNormal" : TruncatedNormal,
+	"beta"            : Beta,
+}
+
+def getDistribution(distribution):
+	"""
+	Return the Distribution for a name (``"uniform"``, ``"normal"``,
+	``"truncatedNormal"`` or ``"beta"``), a Distribution instance, or a
+	Python function ``function(low, high)``. ``random.uniform`` is mapped
+	to the native uniform distribution.
+	"""
+	if isinstance(distribution, Distribution):
+		return distribution
+	if isinstance(distribution, str):
+		if distribution not in _NAMED_DISTRIBUTIONS:
+			raise ValueError("Unknown distribution %r." % distribution)
+		return _NAMED_DISTRIBUTIONS[distribution]()
+	if distribution is random.uniform:
+		return Uniform()
+	return CallableDistribution(distribution)
+
+
+class BlockSampler(object):
+
+	"""
+	Draws samples of a distribution over [low, high] from a seeded generator,
+	a block at a time, so that the cost of going through NumPy is shared by
+	many samples.
+
+	Changing the interval discards any samples left over from the old one.
+	"""
+
+	def __init__(self, distribution, seed=None, block_size=256):
+		self.distribution = getDistribution(distribution)
+		self.block_size = block_size
+		self._generator = numpy.random.default_rng(seed)
+		self._interval = None
+		self._block = numpy.zeros(0)
+		self._index = 0
+
+	def take(self, n, low, high):
+		"""Return an array of the next n samples in [low, high]."""
+		if self._interval != (low, high) or self._index + n > len(self._block):
+			# Keep whatever is left of a block for the same interval.
+			leftover = self._block[self._index:] if self._interval == (low, high) else self._block[:0]
+			size = max(self.block_size, n - len(leftover))
+			self._block = numpy.concatenate((leftover,
+				self.distribution.sample(size, self._generator, low, high)))
+			self._interval = (low, high)
+			self._index = 0
+		samples = self._block[self._index:self._index + n]
+		self._index += n
+		return samples
@@ -0,0 +1,165 @@
+"""
+Spatial indexing of point sets, used for collision detection and spatial
+queries over bullets.
+"""
+import numpy
+
+# Cell coordinates are packed into a single integer key as x*_KEY_SPAN + y.
+_KEY_SPAN   = 1 << 32
+_KEY_OFFSET = 1 << 31
+
+def _expandRanges(lo, hi):
+	"""
+	Return the flattened indices of the ranges [lo[i], hi[i]) along with the
+	index i of the range each one came from (Internal).
+	"""
+	counts = hi - lo
+	total = counts.sum()
+	owners = numpy.repeat(numpy.arange(len(lo)), counts)
+	starts = numpy.repeat(lo - (numpy.cumsum(counts) - counts), counts)
+	return owners, starts + numpy.arange(total)
+
+
+class SpatialHash(object):
+
+	"""
+	A uniform grid over a set of points, stored as the points' cell keys in
+	sorted order so that the contents of any cell are found by binary search.
+	Building the grid and querying it are both vectorized.
+	"""
+
+	def __init__(self, points, cell_size):
+		points = numpy.asarray(points, dtype=float).reshape(-1, 2)
+		self.points = points
+		self.cell_size = cell_size
+
+		# The bounds of the points, to which queried boxes are clipped.
+		if len(points):
+			self._min = points.min(axis=0)
+			self._max = points.max(axis=0)
+
+		keys = self._keys(self._cells(points))
+		self._order = numpy.argsort(keys, kind="stable")
+		self._keys_sorted = keys[self._order]
+
+	def __len__(self):
+		return len(self.points)
+
+	def _cells(self, points):
+		"""Return the integer cell coordinates of the given points (Internal)."""
+		return numpy.floor(points / self.cell_size).astype(numpy.int64)
+
+	def _keys(self, cells):
+		"""Pack cell coordinates into keys (Internal)."""
+		return cells[:, 0]*_KEY_SPAN + (cells[:, 1] + _KEY_OFFSET)
+
+	def _cellRanges(self, cells):
+		"""
+		Return the ranges into the sorted points occupied by each of the given
+		cells (Internal).
+		"""
+		keys = self._keys(cells)
+		lo = numpy.searchsorted(self._keys_sorted, keys, side="left")
+		hi = numpy.searchsorted(self._keys_sorted, keys, side="right")
+		return lo, hi
+
+	def queryPairs(self, points, radii, point_radii):
+		"""
+		Find every pair of a query point and an indexed point that are within
+		the sum of their radii of each other.
+
+		``radii`` are the radii of the indexed points and ``point_radii`` those
+		of the query points (scalars or arrays). The grid's cell size must be
+		at least the largest possible sum of radii.
+
+		Returns two index arrays: into the query points and into the indexed
+		points.
+		"""
+		points = numpy.asarray(points, dtype=float).reshape(-1, 2)
+		empty = numpy.zeros(0, dtype=numpy.intp)
+		if not len(points) or not len(self.points):
+			return empty, empty
+
+		cells = self._cells(points)
+		owners = []
+		indices = []
+		# A point can only touch points in its own cell or the eight around it.
+		for dx in (-1, 0, 1):
+			for dy in (-1, 0, 1):
+				lo, hi = self._cellRanges(cells + (dx, dy))
+				owner, index = _expandRanges(lo, hi)
+				owners.append(owner)
+				indices.append(index)
+
+		i = numpy.concatenate(owners)
+		j = self._order[numpy.concatenate(indices)]
+		if not len(i):
+			return empty, empty
+
+		offsets = points[i] - self.points[j]
+		distances = numpy.broadcast_to(radii, (len(self.points),))[j] \
+				  + numpy.broadcast_to(point_radii, (len(points),))[i]
+		hit = numpy.einsum("ij,ij->i", offsets, offsets) <= distances*distances
+		return i[hit], j[hit]
+
+	def _queryCells(self, cell_min, cell_max):
+		"""
+		Return the indices of the points in the block of cells between the
+		given cell coordinates (inclusive) (Internal).
+		"""
+		xs = numpy.arange(cell_min[0], cell_max[0] + 1, dtype=numpy.int64)
+		ys = numpy.arange(cell_min[1], cell_max[1] + 1, dtype=numpy.int64)
+		if len(xs)*len(ys) >= len(self.points):
+			# Visiting that many cells is no cheaper than checking every point.
+			return numpy.arange(len(self.points))
+		cells = numpy.stack(numpy.meshgrid(xs, ys, indexing="ij"), axis=-1).reshape(-1, 2)
+		lo, hi = self._cellRanges(cells)
+		return self._order[_expandRanges(lo, hi)[1]]
+
+	def queryRect(self, xmin, ymin, xmax, ymax):
+		"""Return the indices of the points inside the given axis-aligned box."""
+		if not len(self.points):
+			return numpy.zeros(0, dtype=numpy.intp)
+		# Clipping the box to the points keeps its cells finite.
+		low = numpy.maximum((xmin, ymin), self._min)
+		high = numpy.minimum((xmax, ymax), self._max)
+		if (low > high).any():
+			return numpy.zeros(0, dtype=numpy.intp)
+		corners = self._cells(numpy.array([low, high], dtype=float))
+		indices = self._queryCells(corners[0], corners[1])
+		x, y = self.points[indices].T
+		return indices[(xmin <= x) & (x <= xmax) & (ymin <= y) & (y <= ymax)]
+
+	def queryRadius(self, centre, radius):
+		"""Return the indices of the points within the given radius of a centre."""
+		cx, cy = centre
+		indices = self.queryRect(cx - radius, cy - radius, cx + radius, cy + radius)
+		offsets = self.points[indices] - (cx, cy)
+		return indices[numpy.einsum("ij,ij->i", offsets, offsets) <= radius*radius]
+
+	def queryNearest(self, point, k):
+		"""
+		Return the indices of the k points nearest to the given point, nearest
+		first.
+		"""
+		count = len(self.points)
+		k = min(k, count)
+		if k <= 0:
+			return numpy.zeros(0, dtype=numpy.intp)
+
+		cell = self._cells(numpy.array([point], dtype=float))[0]
+		reach = 1
+		while True:
+			indices = self._queryCells(cell - reach, cell + reach)
+			offsets = self.points[indices] - point
+			distances = numpy.einsum("ij,ij->i", offsets, offsets)
+			# Every point within ``reach`` cells of the point's own cell has been
+			# visited, so the candidates are final once the kth nearest is closer
+			# than that (or every point has been visited).
+			if len(indices) >= k:
+				nearest = numpy.argpartition(distances, k - 1)[:k]
+				kth = distances[nearest].max()
+				if len(indices) == count or kth <= (reach*self.cell_size)**2:
+					nearest = nearest[numpy.argsort(distances[nearest], kind="stable")]
+					return indices[nearest]
+			reach *= 2
@@ -0,0 +1,106 @@
+"""
+Piecewise-cubic splines stored as polynomial coefficients.
+"""
+import numpy
+
+from .geometry import Vector2D
+
+
+def _points(points):
+	"""Return a list of points as an (n, 2) array of floats (Internal)."""
+	return numpy.array([tuple(point) for point in points], dtype=float).reshape(-1, 2)
+
+
+class CubicSpline(object):
+
+	"""
+	A curve made of cubic segments, the ith of which is traversed as the
+	parameter goes from i to i + 1. Each segment is stored as the
+	coefficients of its polynomial in the local parameter, so evaluating the
+	curve costs the same however many segments it has.
+
+	Splines are never changed, so they are not copied.
+	"""
+
+	def __init__(self, coefficients):
+		# An array of shape (segments, 4, 2), holding the constant, linear,
+		# quadratic and cubic coefficients of each segment.
+		self.coefficients = coefficients
+		self.segments = len(coefficients)
+		# Scalar evaluation is much faster from Python floats than from NumPy
+		# scalars.
+		self._rows = [tuple(row) for row in coefficients.reshape(self.segments, 8).tolist()]
+
+	@classmethod
+	def fromHermite(cls, points, tangents):
+		"""
+		Return the cubic Hermite spline through the given points with the
+		given tangents.
+		"""
+		points = _points(points)
+		tangents = _points(tangents)
+		if len(points) < 2 or len(tangents) != len(points):
+			raise ValueError("A spline needs at least 2 points, and one tangent for each point.")
+		p0, p1 = points[:-1], points[1:]
+		m0, m1 = tangents[:-1], tangents[1:]
+		return cls(numpy.stack((
+			p0,
+			m0,
+			3*(p1 - p0) - 2*m0 - m1,
+			2*(p0 - p1) + m0 + m1), axis=1))
+
+	@classmethod
+	def fromCatmullRom(cls, points, tension=0):
+		"""
+		Return the cardinal spline through the given points with the given
+		tension, which is a Catmull-Rom spline for a tension of 0. The ends
+		use one-sided tangents.
+		"""
+		points = _points(points)
+		if len(points) < 2:
+			raise ValueError("A spline needs at least 2 points.")
+		tangents = numpy.empty_like(points)
+		tangents[1:-1] = (points[2:] - points[:-2])/2
+		tangents[0] = points[1] - points[0]
+		tangents[-1] = points[-1] - points[-2]
+		return cls.fromHermite(points, (1 - tension)*tangents)
+
+	@classmethod
+	def fromCompositeBezier(cls, control_polygon, weight_polygon):
+		"""
+		Return the composite cubic Bezier curve whose ith segment has the
+		control points p[i], p[i] + w[i], p[i + 1] - w[i + 1] and p[i + 1], as
+		used by CompositeBezierPathElement.
+		"""
+		# The tangents of a cubic Bezier curve at its ends are three times its
+		# first and last legs.
+		return cls.fromHermite(control_polygon, 3*_points(weight_polygon))
+
+	def __call__(self, u):
+		"""Return the point at the given parameter, clamped to the curve."""
+		i = int(u)
+		if i >= self.segments:
+			i = self.segments - 1
+		elif i < 0:
+			i = 0
+		t = u - i
+		ax, ay, bx, by, cx, cy, dx, dy = self._rows[i]
+		return Vector2D(((dx*t + cx)*t + bx)*t + ax, ((dy*t + cy)*t + by)*t + ay)
+
+	def evaluate(self, u):
+		"""
+		Return the arrays of the x and y coordinates of the points at an
+		array of parameters.
+		"""
+		u = numpy.asarray(u, dtype=float)
+		i = numpy.clip(u.astype(int), 0, self.segments - 1)
+		t = u - i
+		a, b, c, d = (self.coefficients[i, k] for k in range(4))
+		points = ((d*t[..., None] + c)*t[..., None] + b)*t[..., None] + a
+		return points[..., 0], points[..., 1]
+
+	def __copy__(self):
+		return self
+
+	def __deepcopy__(self, memo):
+		return self
@@ -0,0 +1,88 @@
+"""
+Pipelined simulation, in which frames are simulated on a worker thread
+while the main thread renders the previous frame.
+"""
+import queue
+import threading
+
+
+class FramePipeline(object):
+
+	"""
+	Runs a simulation function on a worker thread, one frame ahead of the
+	thread rendering its results.
+
+	Each call of the function simulates a frame and returns a snapshot of
+	it, which must not be changed afterwards (such as a prepared list of
+	draw commands). The worker only simulates the frames the renderer
+	``request``s, so the renderer requests the next frame before rendering
+	the current one, and only if it is going to take it. No frame is ever
+	simulated and thrown away: the snapshots of frames requested but not
+	taken when the pipeline stops are returned by ``stop``.
+	"""
+
+	def __init__(self, simulate, snapshots=()):
+		self._simulate = simulate
+		self._requests = threading.Semaphore(0)
+		self._ready = queue.Queue()
+		# The number of frames requested (or given as snapshots) and not yet
+		# taken with ``next``.
+		self._pending = 0
+		self._stopping = False
+		self._thread = None
+		for snapshot in snapshots:
+			self._ready.put(snapshot)
+			self._pending += 1
+
+	def start(self):
+		"""Start the worker thread."""
+		self._thread = threading.Thread(target=self._work, daemon=True)
+		self._thread.start()
+
+	def _work(self):
+		"""Simulate the requested frames until stopped (Internal)."""
+		while True:
+			self._requests.acquire()
+			if self._stopping:
+				return
+			try:
+				snapshot = self._simulate()
+			except BaseException as error:
+				# Raised in the rendering thread by ``next``.
+				self._ready.put(error)
+				return
+			self._ready.put(snapshot)
+
+	def pending(self):
+		"""Return the number of frames requested and not yet taken."""
+		return self._pending
+
+	def request(self):
+		"""Ask the worker to simulate one more frame."""
+		self._pending += 1
+		self._requests.release()
+
+	def next(self):
+		"""Wait for and return the snapshot of the next requested frame."""
+		if not self._pending:
+			raise RuntimeError("No frame has been requested.")
+		self._pending -= 1
+		snapshot = self._ready.get()
+		if isinstance(snapshot, BaseException):
+			raise snapshot
+		return snapshot
+
+	def stop(self):
+		"""
+		Wait for the frames still requested, stop the worker, and return the
+		list of their snapshots.
+		"""
+		surplus = []
+		try:
+			while self._pending:
+				surplus.append(self.next())
+		finally:
+			self._stopping = True
+			self._requests.release()
+			self._thread.join()
+		return surplus
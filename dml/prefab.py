@@ -0,0 +1,65 @@
+"""
+Prefabs: bullet classes compiled once into templates for cheap instancing.
+"""
+from .core   import globalSystem
+from .bullet import Bullet
+
+def _definingClass(cls, name):
+	"""Return the first class in the MRO of cls that defines the given attribute."""
+	for base in cls.__mro__:
+		if name in base.__dict__:
+			return base
+	return None
+
+
+class Prefab(object):
+
+	"""
+	A bullet class and its static configuration, compiled once into a
+	template bullet whose components are already created, configured and
+	validated.
+
+	Instances are stamped from the template by copying it and its components
+	and calling the bullet's ``stamp`` method with the per-instance fields
+	(such as direction or speed), which is far cheaper than running
+	``initialize`` again.
+
+	A bullet class opts into stamping by overriding ``stamp`` at or below
+	the class that overrides ``initialize``. Prefabs of classes that don't
+	(whose initialize may do things stamp doesn't know about) fall back to
+	constructing each instance in full.
+
+	Prefabs can be called like a bullet class, so they can be used as the
+	``bulletType`` of a LinearShooter or Gatling. The bullet class is
+	passed by position, so the configuration may itself hold a
+	``bulletType``, as that of a spawner does.
+	"""
+
+	def __init__(self, bulletType, /, **config):
+		self.bulletType = bulletType
+		self._config = config
+
+		self._stampable = issubclass(
+			_definingClass(bulletType, "stamp"), _definingClass(bulletType, "initialize"))
+
+		if self._stampable:
+			# Build the template without adding it to the system.
+			with globalSystem.batchedSpawning() as batch:
+				self._template = bulletType((0, 0), **config)
+				batch.remove(self._template)
+			self._layout = self._template._cloneLayout()
+
+	def spawn(self, origin, name=None, **fields):
+		"""Create a new bullet at the given origin and add it to the system."""
+		if not self._stampable:
+			config = dict(self._config)
+			config.update(fields)
+			return self.bulletType(origin, name=name, **config)
+
+		bullet = self._template._clone(origin, name, self._layout)
+		if fields:
+			bullet.stamp(**fields)
+		globalSystem.addBullet(bullet)
+		return bullet
+
+	__call__ = spawn
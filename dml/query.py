@@ -0,0 +1,116 @@
+"""
+Spatial queries over live bullets.
+
+The system answers radius, box and nearest-k queries from a spatial index
+over every live bullet's position. The index is built on the first query
+of each frame, and again if bullets are added or removed, so positions
+are those the bullets had when it was built: queries made from ``update``
+in PER_BULLET mode see some bullets before and some after this frame's
+move. Bullets killed since the index was built are left out of the
+results. Queries return a BulletSelection, which supports bulk
+operations on the bullets it contains.
+"""
+import numpy
+
+from .maths.spatial import SpatialHash
+
+
+class BulletSelection(object):
+
+	"""
+	A list of bullets returned by a spatial query.
+	"""
+
+	def __init__(self, bullets):
+		self.bullets = bullets
+
+	def __len__(self):
+		return len(self.bullets)
+
+	def __iter__(self):
+		return iter(self.bullets)
+
+	def __getitem__(self, index):
+		return self.bullets[index]
+
+	def kill(self):
+		"""Kill every bullet in the selection."""
+		for bullet in self.bullets:
+			bullet.kill()
+
+	def recolour(self, colour):
+		"""Set the colour of every renderer of every bullet in the selection."""
+		for bullet in self.bullets:
+			for component in bullet._render_components:
+				if hasattr(component, "setColour"):
+					component.setColour(colour)
+
+	def redirect(self, direction):
+		"""
+		Change the direction of every motion component that has one (such
+		as LinearAccelerator) of every bullet in the selection.
+		"""
+		for bullet in self.bullets:
+			for component in bullet._motion_components:
+				if hasattr(component, "changeDirection"):
+					component.changeDirection(direction)
+
+
+class BulletIndex(object):
+
+	"""
+	A spatial index over the positions of the live bullets, rebuilt whenever
+	the key it is refreshed with changes (Internal).
+	"""
+
+	def __init__(self, cell_size=64):
+		self.cell_size = cell_size
+		self._key = None
+		self._bullets = []
+		self._grid = None
+
+	def invalidate(self):
+		"""Force the index to be rebuilt on the next query."""
+		self._key = None
+
+	def refresh(self, bullets, key):
+		"""
+		Rebuild the index over the given bullets that are alive, unless already
+		built with the same key.
+		"""
+		if self._key == key:
+			return
+		self._key = key
+		self._bullets = bullets = [bullet for bullet in bullets if not bullet.isDead()]
+		count = len(bullets)
+		positions = [bullet.position for bullet in bullets]
+		points = numpy.empty((count, 2))
+		points[:, 0] = numpy.fromiter([position.x for position in positions], float, count)
+		points[:, 1] = numpy.fromiter([position.y for position in positions], float, count)
+		self._grid = SpatialHash(points, self.cell_size)
+
+	def _select(self, indices):
+		"""Return the selection of the bullets at the given indices (Internal)."""
+		bullets = self._bullets
+		return BulletSelection([
+			bullet for bullet in [bullets[i] for i in indices.tolist()] if not bullet._dead])
+
+	def inRadius(self, centre, radius):
+		"""Return the bullets within a radius of a centre."""
+		return self._select(self._grid.queryRadius(centre, radius))
+
+	def inRect(self, xmin, ymin, xmax, ymax):
+		"""Return the bullets inside an axis-aligned box."""
+		return self._select(self._grid.queryRect(xmin, ymin, xmax, ymax))
+
+	def nearest(self, point, k):
+		"""Return the k bullets nearest to a point, nearest first."""
+		point = numpy.asarray(tuple(point), dtype=float)
+		count = k
+		while True:
+			indices = self._grid.queryNearest(point, count)
+			selection = self._select(indices)
+			# Ask for as many more as were killed since the index was built.
+			if len(selection) >= k or len(indices) < count:
+				return BulletSelection(selection.bullets[:k])
+			count += k - len(selection)
@@ -0,0 +1,239 @@
+"""
+Render backends, and the per-frame draw list they consume.
+
+Render components do not draw anything themselves. Their ``render`` method
+submits a draw command to the system's draw list, and once every bullet has
+been updated, the list is culled, sorted and handed to the system's render
+backend, which does the actual drawing (or none at all).
+"""
+import collections
+import enum
+import pygame
+
+from .sprites import getCircleSprite
+
+
+CircleCommand = collections.namedtuple("CircleCommand",
+	("layer", "x", "y", "radius", "colour", "glow_radius", "glow_colour"))
+CircleCommand.__doc__ = """
+A command to draw a circle of the given radius and colour centred on (x, y).
+If ``glow_radius`` is non-zero, the circle is surrounded by a glow of that
+width in ``glow_colour``.
+"""
+
+
+class DrawList(object):
+
+	"""
+	The draw commands submitted during a frame.
+	"""
+
+	class Order(enum.Enum):
+		"""
+		An option determining the order in which commands are drawn.
+
+			SUBMISSION: The order in which they were submitted.
+
+			LAYER: In order of layer, and in order of submission within a
+				layer.
+
+			LAYER_AND_SPRITE: In order of layer, and grouped by appearance
+				within a layer, so that backends can draw identical sprites
+				together. Overlapping bullets may be drawn in a different
+				order than they were submitted.
+		"""
+
+		SUBMISSION = 1
+		LAYER = 2
+		LAYER_AND_SPRITE = 3
+
+	def __init__(self, order=Order.LAYER, cull=True):
+		self.order = order
+		# If True, commands that would be drawn entirely offscreen are dropped.
+		self.cull = cull
+		self._commands = []
+
+	def __len__(self):
+		return len(self._commands)
+
+	def __iter__(self):
+		return iter(self._commands)
+
+	def submit(self, command):
+		"""Add a draw command to this frame's list."""
+		self._commands.append(command)
+
+	def extend(self, commands):
+		"""Add a list of draw commands to this frame's list."""
+		self._commands.extend(commands)
+
+	def clear(self):
+		"""Remove every command."""
+		self._commands = []
+
+	def prepare(self, dimensions):
+		"""
+		Return this frame's commands culled to a screen of the given
+		dimensions (if culling) and sorted.
+		"""
+		commands = self._commands
+		if self.cull and dimensions:
+			width, height = dimensions
+			visible = []
+			for command in commands:
+				# A circle covers the pixels from its centre minus its outer radius, up to
+				# but not including its centre plus its outer radius.
+				outer = command.radius + command.glow_radius
+				if -outer < command.x < width + outer and -outer < command.y < height + outer:
+					visible.append(command)
+			commands = visible
+
+		if self.order is DrawList.Order.LAYER:
+			commands = sorted(commands, key=lambda command : command.layer)
+		elif self.order is DrawList.Order.LAYER_AND_SPRITE:
+			# Sprites are ordered by when they first appear, as colours need not
+			# be comparable.
+			sprites = {}
+			commands = sorted(commands, key=lambda command : (command.layer,
+				sprites.setdefault(command[3:], len(sprites))))
+		return commands
+
+
+class RenderBackend(object):
+
+	"""
+	Base class for render backends.
+	"""
+
+	def draw(self, surface, commands):
+		"""Draw a frame's prepared list of commands onto the surface."""
+		raise NotImplementedError
+
+
+class ImmediateBackend(RenderBackend):
+
+	"""
+	Draws every command with pygame.draw, one at a time.
+	"""
+
+	def draw(self, surface, commands):
+		circle = pygame.draw.circle
+		for layer, x, y, radius, colour, glow_radius, glow_colour in commands:
+			if glow_radius:
+				circle(surface, glow_colour, (x, y), radius + glow_radius)
+			circle(surface, colour, (x, y), radius)
+
+
+class BatchedBackend(RenderBackend):
+
+	"""
+	Draws every command as a cached sprite (see dml.sprites), with a single
+	``Surface.blits`` call per frame.
+	"""
+
+	def __init__(self):
+		# The sprites used recently, keyed by command attributes. This is checked
+		# before the shared sprite cache, and is emptied whenever it grows past
+		# the number of sprites that cache holds.
+		self._sprites = {}
+		self._format = None
+
+	def draw(self, surface, commands):
+		format = (surface.get_bitsize(), surface.get_masks())
+		if format != self._format or len(self._sprites) > 512:
+			self._format = format
+			self._sprites = {}
+
+		sprites = self._sprites
+		blits = []
+		for command in commands:
+			attributes = command[3:]
+			sprite = sprites.get(attributes)
+			if sprite is None:
+				sprite = sprites[attributes] = getCircleSprite(surface, *attributes)
+			outer = command.radius + command.glow_radius
+			blits.append((sprite, (command.x - outer, command.y - outer)))
+		surface.blits(blits, doreturn=False)
+
+
+class NullBackend(RenderBackend):
+
+	"""
+	Draws nothing, for running the simulation headless.
+	"""
+
+	def draw(self, surface, commands):
+		pass
+
+
+class RecordingBackend(RenderBackend):
+
+	"""
+	Records the commands of every frame in ``frames``, and passes them on to
+	another backend if one is given.
+	"""
+
+	def __init__(self, backend=None):
+		self.backend = backend
+		self.frames = []
+
+	def record(self, commands):
+		"""Record the commands of a frame."""
+		self.frames.append(list(commands))
+
+	def draw(self, surface, commands):
+		self.record(commands)
+		if self.backend is not None:
+			self.backend.draw(surface, commands)
+
+
+class DirtyRegions(object):
+
+	"""
+	Tracks the screen regions covered by the draw commands of this frame and
+	the last, so that only those regions need to be cleared and updated on
+	the display.
+
+	If the dirty area of a frame is more than ``threshold`` times the area of
+	the screen, the whole screen is cleared and updated instead.
+	"""
+
+	def __init__(self, threshold=0.5, background=(0, 0, 0)):
+		self.threshold = threshold
+		self.background = background
+		self._previous = []
+		# The regions to update on the display, or None for the whole display.
+		self._update = None
+
+	def clear(self, surface, commands):
+		"""
+		Clear the regions drawn in the last frame before the given prepared
+		commands are drawn onto the surface, and remember the regions the
+		commands cover.
+		"""
+		Rect = pygame.Rect
+		rects = []
+		area = 0
+		for command in commands:
+			outer = command.radius + command.glow_radius
+			rects.append(Rect(command.x - outer, command.y - outer, 2*outer, 2*outer))
+			area += 4*outer*outer
+		area += sum([rect.w*rect.h for rect in self._previous])
+
+		width, height = surface.get_size()
+		if area > self.threshold*width*height:
+			surface.fill(self.background)
+			self._update = None
+		else:
+			for rect in self._previous:
+				surface.fill(self.background, rect)
+			# The regions drawn last frame must be updated too, to erase them.
+			self._update = self._previous + rects
+		self._previous = rects
+
+	def present(self):
+		"""Update the dirty regions of the display (or all of it)."""
+		if self._update is None:
+			pygame.display.update()
+		else:
+			pygame.display.update(self._update)
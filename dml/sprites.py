@@ -0,0 +1,53 @@
+"""
+Pre-rasterized sprites for render backends.
+
+Drawing a circle with pygame.draw rasterizes it again every time. Instead,
+each distinct combination of a circle's attributes can be rasterized once
+into a small colour-keyed surface, which is then blitted.
+"""
+import pygame
+
+from .utils import LRUCache
+
+# Colours used as the transparent colour key of sprites. The first one that
+# does not collide with a colour of the sprite is used.
+_COLOUR_KEYS = ((255, 0, 255), (0, 255, 0), (1, 2, 3))
+
+_SPRITES = LRUCache(512)
+
+def _createCircleSprite(surface, radius, colour, glow_radius, glow_colour):
+	"""Rasterize a circle sprite in the pixel format of surface (Internal)."""
+	outer = radius + glow_radius
+	sprite = pygame.Surface((2*outer, 2*outer), 0, surface)
+
+	used = {sprite.map_rgb(colour)}
+	if glow_radius:
+		used.add(sprite.map_rgb(glow_colour))
+	key = next(key for key in _COLOUR_KEYS if sprite.map_rgb(key) not in used)
+	sprite.fill(key)
+	sprite.set_colorkey(key, pygame.RLEACCEL)
+
+	# pygame.draw.circle covers the box of side 2r whose top-left corner is at
+	# (cx - r, cy - r), so the sprite is drawn exactly as the circle would be.
+	if glow_radius:
+		pygame.draw.circle(sprite, glow_colour, (outer, outer), outer)
+	pygame.draw.circle(sprite, colour, (outer, outer), radius)
+	return sprite
+
+def getCircleSprite(surface, radius, colour, glow_radius=0, glow_colour=None):
+	"""
+	Return the (cached) sprite of a circle of the given radius and colour,
+	optionally surrounded by a glow, for blitting onto the given surface.
+
+	The sprite's top-left corner goes at the circle's centre minus
+	``radius + glow_radius``.
+	"""
+	key = (radius, tuple(colour), glow_radius,
+		   tuple(glow_colour) if glow_radius else None,
+		   surface.get_bitsize(), surface.get_masks())
+	return _SPRITES.getOrCreate(key, lambda : _createCircleSprite(
+		surface, radius, colour, glow_radius, glow_colour))
+
+def clearSpriteCache():
+	"""Discard every cached sprite."""
+	_SPRITES.clear()
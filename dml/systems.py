@@ -0,0 +1,89 @@
+"""
+Component systems used by the ECS execution mode.
+
+In ECS mode, a frame first runs every bullet's ``update`` method for custom
+logic, and then runs each component system over every live instance of the
+component types it accepts, one type at a time, in order of the systems'
+phases. Batching by type is what lets a component class replace the
+per-instance loop with a vectorized kernel.
+"""
+from .core       import globalSystem
+from .components import Motion, Render
+
+
+class ComponentSystem(object):
+
+	"""
+	Base class for component systems.
+	"""
+
+	# The order in which systems are run within a frame.
+	PHASE = 0
+
+	def accepts(self, componentType):
+		"""Return True if this system runs over the given component type."""
+		return False
+
+	def run(self, batches):
+		"""
+		Run this system over a list of (component type, components) pairs,
+		one for each accepted type.
+		"""
+		raise NotImplementedError
+
+
+class MotionSystem(ComponentSystem):
+
+	"""
+	Moves every bullet that asked to move this frame.
+	"""
+
+	PHASE = 10
+
+	def accepts(self, componentType):
+		return issubclass(componentType, Motion)
+
+	def run(self, batches):
+		for componentType, components in batches:
+			componentType._moveBatch(components)
+
+		for bullet in globalSystem._bullets.values():
+			if bullet._move_requested:
+				bullet._commitMove()
+
+
+class AutoSystem(ComponentSystem):
+
+	"""
+	Updates every automatic component.
+	"""
+
+	PHASE = 20
+
+	def accepts(self, componentType):
+		return componentType.AUTOMATIC
+
+	def run(self, batches):
+		for componentType, components in batches:
+			componentType._autoBatch(components)
+
+
+class RenderSystem(ComponentSystem):
+
+	"""
+	Renders every bullet that asked to be rendered this frame.
+	"""
+
+	PHASE = 30
+
+	def accepts(self, componentType):
+		return issubclass(componentType, Render)
+
+	def run(self, batches):
+		for componentType, components in batches:
+			componentType._renderBatch(components)
+
+
+globalSystem.addComponentSystem(MotionSystem())
+globalSystem.addComponentSystem(AutoSystem())
+globalSystem.addComponentSystem(RenderSystem())
@@ -24,6 +24,10 @@ class Timeline(object):
                 "Cannot add timestamp while timeline is active.")
         self._timestamps.append(timestamp)
 
+    def isEmpty(self):
+        """Return True if there are no timestamps left to perform."""
+        return not self._timestamps and self._next is None
+
     def begin(self):
         """Begin running the timeline."""
         self._timestamps.sort(key=lambda x: x.time)
@@ -42,6 +46,8 @@ class Timestamp(object):
     A single action to perform, stored by the timeline.
     """
 
+    __slots__ = ("time", "performAction")
+
     def __init__(self, time, action):
         self.time = time
         self.performAction = action
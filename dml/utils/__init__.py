@@ -1,4 +1,5 @@
+from .cache      import *
 from .classutils import *
 from .dictutils  import *
 from .colour     import *
-from .singleton  import *
+from .singleton  import *
\ No newline at end of file
@@ -0,0 +1,50 @@
+from collections import OrderedDict
+
+class LRUCache(object):
+	"""
+	A dictionary-like cache holding at most ``capacity`` entries. When full,
+	the least recently used entry is evicted.
+	"""
+
+	def __init__(self, capacity=128):
+		self.capacity = capacity
+		self._entries = OrderedDict()
+
+	def __len__(self):
+		return len(self._entries)
+
+	def __contains__(self, key):
+		return key in self._entries
+
+	def get(self, key, default=None):
+		"""Return the entry for the given key, marking it as recently used."""
+		entries = self._entries
+		if key not in entries:
+			return default
+		entries.move_to_end(key)
+		return entries[key]
+
+	def put(self, key, value):
+		"""Store an entry, evicting the least recently used one if necessary."""
+		entries = self._entries
+		entries[key] = value
+		entries.move_to_end(key)
+		if len(entries) > self.capacity:
+			entries.popitem(last=False)
+
+	def getOrCreate(self, key, factory):
+		"""
+		Return the entry for the given key, creating it with ``factory()``
+		if it does not exist.
+		"""
+		entries = self._entries
+		if key in entries:
+			entries.move_to_end(key)
+			return entries[key]
+		value = factory()
+		self.put(key, value)
+		return value
+
+	def clear(self):
+		"""Remove every entry."""
+		self._entries.clear()
@@ -20,4 +20,40 @@ def getBasesLinear(cls, stop_at=object):
 		next_base = next_base.__bases__[0]
 		
 	bases.append(next_base)
-	return bases
\ No newline at end of file
+	return bases
+
+
+_SLOTS = {}
+
+def getSlots(cls):
+	"""Return the names of the slots declared by a class and all of its bases."""
+	slots = _SLOTS.get(cls)
+	if slots is None:
+		names = []
+		for base in reversed(cls.__mro__):
+			declared = base.__dict__.get("__slots__", ())
+			if isinstance(declared, str):
+				declared = (declared,)
+			names.extend(name for name in declared if name not in ("__dict__", "__weakref__"))
+		slots = _SLOTS[cls] = tuple(names)
+	return slots
+
+def getAttributes(instance):
+	"""
+	Return a dictionary of the attributes set on an instance, whether they
+	are stored in slots or in its ``__dict__``.
+	"""
+	attributes = {}
+	for name in getSlots(type(instance)):
+		try:
+			attributes[name] = getattr(instance, name)
+		except AttributeError:
+			# The slot is empty.
+			pass
+	attributes.update(getattr(instance, "__dict__", ()))
+	return attributes
+
+def copyAttributes(source, target):
+	"""Copy every attribute set on an instance to another of the same class."""
+	for name, value in getAttributes(source).items():
+		setattr(target, name, value)
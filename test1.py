@@ -39,8 +39,7 @@ class Generator1(dml.Bullet):
 
 	def update(self):
 		if self.AtIntervals(0.02):
-			for i in range(3):
-				self.shooter.fire()
+			self.shooter.fireVolley([self.shooter.direction]*3)
 			self.shooter.rotate(0.1*math.sin(self.local_time/2))
 
 Generator1((300, 400), direction=(0, 1))